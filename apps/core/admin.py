@@ -0,0 +1,70 @@
+from django.contrib import admin
+
+from apps.core.models import OutboxMessage
+from apps.core.search import is_postgresql
+
+__all__ = (
+    'UserTrigramSearchAdminMixin',
+    'OutboxMessageAdmin',
+)
+
+
+class UserTrigramSearchAdminMixin:
+    """Add users found by trigram similarity to admin search results.
+
+    ``user_search_relations`` are lookups to users primary keys, like
+    ``('created_by',)``; use ``('pk',)`` for users admin itself.
+    """
+
+    user_search_relations = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        """Extend default search results with similar users` objects."""
+        results, use_distinct = super().get_search_results(
+            request, queryset, search_term
+        )
+        if not search_term or not is_postgresql(queryset.db):
+            return results, use_distinct
+
+        from apps.users.models import User
+
+        users = User.objects.all().trigram_search(search_term).values('pk')
+        for relation in self.user_search_relations:
+            results |= queryset.filter(**{f'{relation}__in': users})
+        return results, use_distinct
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """Outbox message admin.
+
+    Shows messages waiting for dispatch and failed ones.
+    """
+
+    search_fields = (
+        'name',
+    )
+    list_display = (
+        'id',
+        'kind',
+        'name',
+        'attempts',
+        'locked_until',
+        'created_at',
+    )
+    list_filter = (
+        'kind',
+        'attempts',
+    )
+    readonly_fields = (
+        'created_at',
+    )
+    actions = (
+        'retry',
+    )
+
+    def retry(self, request, queryset):
+        """Reset attempts of messages to dispatch them again."""
+        queryset.update(attempts=0, last_error='', locked_until=None)
+
+    retry.short_description = 'Retry dispatch'
@@ -0,0 +1,352 @@
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+__all__ = (
+    'bump_generation',
+    'connected_models',
+    'connect_generations',
+    'get_cache_stats',
+    'get_cached',
+    'get_generations',
+    'make_cache_key',
+    'set_cached',
+)
+
+GENERATION_KEY = 'generation:{}'
+STATS_KEY = 'cache_stats:{}:{}'
+STATS_NAMES_KEY = 'cache_stats:names'
+
+# labels of models with connected generations
+connected_models = set()
+# two-tier caches of objects by labels of their models
+_objects_caches = {}
+
+
+def _label(model) -> str:
+    """Return label of model class or label as is."""
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def _generation_key(model, pk=None) -> str:
+    label = _label(model)
+    return GENERATION_KEY.format(label if pk is None else f'{label}:{pk}')
+
+
+def get_generations(*targets) -> list:
+    """Return generations of models or ``(model, pk)`` objects.
+
+    Missing generations start from current time in milliseconds, so they
+    never return to values used before the counter was evicted.
+    """
+    keys = [
+        _generation_key(*target) if isinstance(target, tuple)
+        else _generation_key(target)
+        for target in targets
+    ]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, int(time.time() * 1000), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generation(model, *pks, using='default'):
+    """Change generation of model and its objects.
+
+    Generations are bumped at once and after commit of current transaction,
+    so pages read before commit are not cached with the new generation.
+    """
+    keys = [_generation_key(model)]
+    keys.extend(_generation_key(model, pk) for pk in pks)
+
+    def bump():
+        for key in keys:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.add(key, int(time.time() * 1000), timeout=None)
+
+    bump()
+    if connections[using].in_atomic_block:
+        transaction.on_commit(bump, using=using)
+
+
+def connect_generations(model, parents=(), m2m=(), ignore_fields=()):
+    """Bump generations of model and its objects when they are changed.
+
+    Generations of objects referenced by ``parents`` foreign keys are
+    bumped too: they are rendered with the changed ones. Changes of
+    ``m2m`` fields bump generations of both sides. Saves of
+    ``ignore_fields`` only are skipped.
+    """
+    uid = f'cache_generation_{model._meta.label_lower}'
+    connected_models.add(model._meta.label_lower)
+
+    def object_changed(sender, instance, using, update_fields=None,
+                       **kwargs):
+        if update_fields and set(update_fields) <= set(ignore_fields):
+            return
+        bump_generation(model, instance.pk, using=using)
+        for parent in parents:
+            field = model._meta.get_field(parent)
+            parent_id = getattr(instance, field.attname)
+            if parent_id is not None:
+                bump_generation(field.related_model, parent_id, using=using)
+
+    def relations_changed(sender, instance, action, reverse, model: type,
+                          pk_set, using, **kwargs):
+        if not action.startswith('post_'):
+            return
+        bump_generation(type(instance), instance.pk, using=using)
+        bump_generation(model, *(pk_set or ()), using=using)
+
+    post_save.connect(
+        object_changed, sender=model, weak=False, dispatch_uid=uid
+    )
+    post_delete.connect(
+        object_changed, sender=model, weak=False, dispatch_uid=uid
+    )
+    for field_name in m2m:
+        m2m_changed.connect(
+            relations_changed,
+            sender=getattr(model, field_name).through,
+            weak=False,
+            dispatch_uid=uid,
+        )
+
+
+def make_cache_key(name: str, *parts) -> str:
+    """Return cache key of name and hash of parts."""
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    return f'{name}:{digest}'
+
+
+def get_cached(name: str, key: str):
+    """Return cached value and count hit or miss of name."""
+    value = cache.get(key)
+    _count(name, 'hits' if value is not None else 'misses')
+    return value
+
+
+def set_cached(key: str, value):
+    """Cache value for ``PAGE_CACHE_TIMEOUT`` seconds."""
+    cache.set(key, value, settings.PAGE_CACHE_TIMEOUT)
+
+
+def get_cache_stats() -> dict:
+    """Return hits, misses and hit ratio of every cached name."""
+    stats = {}
+    for name in sorted(cache.get(STATS_NAMES_KEY) or ()):
+        counts = cache.get_many([
+            STATS_KEY.format(name, 'hits'), STATS_KEY.format(name, 'misses'),
+        ])
+        hits = counts.get(STATS_KEY.format(name, 'hits'), 0)
+        misses = counts.get(STATS_KEY.format(name, 'misses'), 0)
+        stats[name] = {
+            'hits': hits,
+            'misses': misses,
+            'ratio': hits / (hits + misses) if hits + misses else 0,
+        }
+    return stats
+
+
+def _count(name: str, kind: str, count: int = 1):
+    """Increment counter of hits or misses of name."""
+    if not count:
+        return
+    key = STATS_KEY.format(name, kind)
+    try:
+        cache.incr(key, count)
+        return
+    except ValueError:
+        cache.add(key, count, timeout=None)
+    # counter is created, name is remembered once
+    names = cache.get(STATS_NAMES_KEY) or set()
+    if name not in names:
+        cache.set(STATS_NAMES_KEY, names | {name}, timeout=None)
+
+
+class LocalCache:
+    """Bounded cache of the current process.
+
+    The least recently used items are evicted when cache is full. Cache
+    is shared by threads of the process.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys) -> dict:
+        """Return found items and mark them as recently used."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._items:
+                    self._items.move_to_end(key)
+                    found[key] = self._items[key]
+        return found
+
+    def set_many(self, items: dict):
+        """Add items evicting the least recently used ones."""
+        with self._lock:
+            for key, value in items.items():
+                self._items[key] = value
+                self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """Remove all items."""
+        with self._lock:
+            self._items.clear()
+
+
+class TieredCache:
+    """Cache of values of objects in process memory in front of the cache.
+
+    Keys contain generations of objects, so bumped generation invalidates
+    values in every process without messages between them. Values are
+    kept pickled and every lookup returns new copies, so they can not be
+    changed by callers. Missing values are taken from ``loader`` getting
+    list of pks and returning ``{pk: value}``.
+    """
+
+    def __init__(self, name: str, model, loader, max_size: int = None):
+        self.name = name
+        self.label = _label(model)
+        self.loader = loader
+        self.local = LocalCache(max_size or settings.LOCAL_CACHE_SIZE)
+
+    def make_key(self, pk, generation) -> str:
+        """Return key of value of object of generation."""
+        return f'tiered:{self.name}:{pk}:{generation}'
+
+    def get_keys(self, pks) -> dict:
+        """Return keys of objects, unknown generations have no keys."""
+        generations = get_generations(*((self.label, pk) for pk in pks))
+        return {
+            pk: self.make_key(pk, generation)
+            for pk, generation in zip(pks, generations)
+            if generation is not None
+        }
+
+    def get_many(self, pks) -> dict:
+        """Return values of objects, missing objects are skipped."""
+        pks = list(dict.fromkeys(pks))
+        if not pks:
+            return {}
+        keys = self.get_keys(pks)
+        found = self.local.get_many(keys.values())
+        shared = cache.get_many([
+            key for key in keys.values() if key not in found
+        ])
+        self.local.set_many(shared)
+        found.update(shared)
+
+        values = {
+            pk: pickle.loads(found[key])
+            for pk, key in keys.items() if key in found
+        }
+        missing = [pk for pk in pks if pk not in values]
+        _count(self.name, 'hits', len(values))
+        _count(self.name, 'misses', len(missing))
+        if missing:
+            loaded = self.loader(missing)
+            self.set_many(loaded, keys)
+            values.update(loaded)
+        return values
+
+    def set_many(self, values: dict, keys: dict = None):
+        """Cache values of objects of their current generations."""
+        if keys is None:
+            keys = self.get_keys(list(values))
+        items = {
+            keys[pk]: pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            for pk, value in values.items() if pk in keys
+        }
+        cache.set_many(items, settings.PAGE_CACHE_TIMEOUT)
+        self.local.set_many(items)
+
+
+def get_objects_cache(model) -> TieredCache:
+    """Return two-tier cache of model objects by their pks."""
+    label = _label(model)
+    if label not in _objects_caches:
+        _objects_caches[label] = TieredCache(
+            label, model, model._default_manager.in_bulk
+        )
+    return _objects_caches[label]
+
+
+def _get_relations_cache(model, field) -> TieredCache:
+    """Return two-tier cache of pks of related objects."""
+    name = f'{_label(model)}.{field.name}'
+    if name not in _objects_caches:
+        related_manager = field.related_model._default_manager
+        query_name = field.related_query_name()
+        related_cache = get_objects_cache(field.related_model)
+
+        def load(pks):
+            """Load pks of related objects and cache the objects."""
+            related_pks = {pk: [] for pk in pks}
+            related = {}
+            for obj in related_manager.filter(**{
+                f'{query_name}__in': pks,
+            }).annotate(related_to=F(query_name)):
+                related_pks[obj.__dict__.pop('related_to')].append(obj.pk)
+                related[obj.pk] = obj
+            related_cache.set_many(related)
+            return related_pks
+
+        _objects_caches[name] = TieredCache(name, model, load)
+    return _objects_caches[name]
+
+
+def attach_cached_relations(objects, *fields):
+    """Set related objects of objects from two-tier caches.
+
+    Foreign keys are set as loaded objects and many to many fields are set
+    as prefetched, so related objects are not queried on access.
+    """
+    if not objects:
+        return
+    model = type(objects[0])
+    for field in map(model._meta.get_field, fields):
+        if field.many_to_many:
+            relations = _get_relations_cache(model, field).get_many(
+                [obj.pk for obj in objects]
+            )
+            related = get_objects_cache(field.related_model).get_many([
+                pk for pks in relations.values() for pk in pks
+            ])
+            for obj in objects:
+                queryset = getattr(obj, field.name).all()
+                queryset._result_cache = [
+                    related[pk] for pk in relations.get(obj.pk, ())
+                    if pk in related
+                ]
+                queryset._prefetch_done = True
+                obj.__dict__.setdefault(
+                    '_prefetched_objects_cache', {}
+                )[field.name] = queryset
+        else:
+            related = get_objects_cache(field.related_model).get_many([
+                getattr(obj, field.attname) for obj in objects
+                if getattr(obj, field.attname) is not None
+            ])
+            for obj in objects:
+                related_obj = related.get(getattr(obj, field.attname))
+                if related_obj is not None:
+                    setattr(obj, field.name, related_obj)
@@ -0,0 +1,49 @@
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.db.models.functions import GeoFunc
+from django.contrib.gis.geos import Point
+from django.db import connections
+from django.db.models import FloatField, Value
+
+__all__ = (
+    'KNNDistance',
+    'is_postgis',
+    'make_point',
+)
+
+
+class KNNDistance(GeoFunc):
+    """Distance by PostGIS ``<->`` operator.
+
+    Ordering by it is KNN search by spatial (GiST) index of the field.
+    For geography fields distance is in meters.
+    """
+
+    function = ''
+    arity = 2
+    arg_joiner = ' <-> '
+    template = '(%(expressions)s)'
+    geom_param_pos = (0, 1)
+    output_field = FloatField()
+
+    def __init__(self, field, point: Point, **extra):
+        super().__init__(
+            field,
+            Value(point, output_field=PointField(geography=True)),
+            **extra,
+        )
+
+
+def make_point(latitude, longitude):
+    """Return geographic point or None if coordinates are not valid."""
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return Point(longitude, latitude, srid=4326)
+
+
+def is_postgis(using='default'):
+    """Return True if database supports spatial queries by PostGIS."""
+    return bool(getattr(connections[using].ops, 'postgis', False))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.cache import get_cache_stats
+
+
+class Command(BaseCommand):
+    """Print hits and misses of cached pages and fragments."""
+
+    help = 'Print hit ratio of cached pages and fragments.'
+
+    def handle(self, *args, **options):
+        """Print stats of every cached name."""
+        stats = get_cache_stats()
+        if not stats:
+            self.stdout.write('Nothing is cached yet.')
+        for name, counts in stats.items():
+            self.stdout.write(
+                f'{name}: {counts["hits"]} hit(s), '
+                f'{counts["misses"]} miss(es), '
+                f'ratio {counts["ratio"]:.1%}'
+            )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.sessions import copy_db_sessions
+
+
+class Command(BaseCommand):
+    """Copy sessions from the database to redis.
+
+    Run it once after ``SESSION_ENGINE`` is switched to redis, so users are
+    not logged out.
+    """
+
+    help = 'Copy not expired database sessions to the sessions cache.'
+
+    def add_arguments(self, parser):
+        """Add batch size option."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Count of sessions read from the database at once.',
+        )
+
+    def handle(self, *args, batch_size=1000, **options):
+        """Copy sessions and print their count."""
+        count = copy_db_sessions(batch_size=batch_size)
+        self.stdout.write(f'Copied {count} session(s).')
@@ -0,0 +1,65 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.synthetic import SyntheticData, generate_data
+
+
+class Command(BaseCommand):
+    """Fill the database with deterministic synthetic data.
+
+    Users, tags, orders with offers and masterpieces are written by
+    ``COPY`` in parallel processes, rows per second are printed for every
+    table. The same seed gives the same data on the same database.
+    """
+
+    help = 'Generate synthetic users, orders, offers and masterpieces.'
+
+    def add_arguments(self, parser):
+        """Add counts of objects and generation options."""
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--orders', type=int, default=2000)
+        parser.add_argument('--offers', type=int, default=5000)
+        parser.add_argument('--tags', type=int, default=100)
+        parser.add_argument(
+            '--tags-skew',
+            type=float,
+            default=1.1,
+            help='Exponent of Zipf distribution of tags of orders.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Count of users or orders written by a process at once.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count(),
+            help='Count of processes writing data.',
+        )
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """Generate data and print rows per second of every table."""
+        try:
+            dataset = SyntheticData(
+                seed=options['seed'],
+                users=options['users'],
+                orders=options['orders'],
+                offers=options['offers'],
+                tags=options['tags'],
+                tags_skew=options['tags_skew'],
+                batch_size=options['batch_size'],
+                using=options['database'],
+            )
+        except ValueError as error:
+            raise CommandError(error)
+
+        def report(table: str, rows: int, rate: float):
+            self.stdout.write(f'{table}: {rows} row(s), {rate:.0f} rows/s')
+
+        generate_data(dataset, workers=options['workers'], report=report)
+        self.stdout.write(self.style.SUCCESS('Synthetic data generated.'))
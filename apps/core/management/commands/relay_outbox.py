@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.outbox import relay_outbox
+
+
+class Command(BaseCommand):
+    """Dispatch outbox messages in a loop.
+
+    Used as a dedicated relay worker when dispatching every minute by the
+    periodic task is too slow.
+    """
+
+    help = 'Dispatch messages saved in the outbox.'
+
+    def add_arguments(self, parser):
+        """Add relay options."""
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Dispatch pending messages and exit.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1,
+            help='Seconds to wait when there are no messages.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Count of messages locked and dispatched at once.',
+        )
+
+    def handle(self, *args, once=False, interval=1, batch_size=None,
+               **options):
+        """Dispatch messages until interrupted."""
+        while True:
+            counts = relay_outbox(batch_size=batch_size)
+            if counts['dispatched'] or counts['failed']:
+                self.stdout.write(
+                    f'Dispatched {counts["dispatched"]}, '
+                    f'failed {counts["failed"]} message(s).'
+                )
+            if once:
+                return
+            time.sleep(interval)
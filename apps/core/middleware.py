@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.contrib.sessions.middleware import (
+    SessionMiddleware as DjangoSessionMiddleware,
+)
+
+__all__ = (
+    'SessionMiddleware',
+)
+
+
+class SessionMiddleware(DjangoSessionMiddleware):
+    """Session middleware skipping writes of not changed sessions.
+
+    Session is marked as modified by every assignment, even of the same
+    value. Sessions supporting ``has_changed`` are saved only if their
+    data or key were really changed.
+    """
+
+    def process_response(self, request, response):
+        """Skip saving of not changed session."""
+        session = request.session
+        has_changed = getattr(session, 'has_changed', None)
+        if (session.modified and has_changed is not None and
+                not settings.SESSION_SAVE_EVERY_REQUEST and
+                not has_changed()):
+            session.modified = False
+        return super().process_response(request, response)
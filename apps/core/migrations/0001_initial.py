@@ -0,0 +1,32 @@
+# Generated by Django 3.0.8 on 2020-09-08 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('TASK', 'Celery task'), ('CALL', 'Handler call')], max_length=4, verbose_name='Kind')),
+                ('name', models.CharField(max_length=255, verbose_name='Name')),
+                ('payload', models.TextField(verbose_name='Payload')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+            ],
+            options={
+                'verbose_name': 'Outbox message',
+                'verbose_name_plural': 'Outbox messages',
+                'db_table': 'outbox_messages',
+                'ordering': ('id',),
+            },
+        ),
+    ]
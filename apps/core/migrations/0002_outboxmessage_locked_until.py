@@ -0,0 +1,18 @@
+# Generated by Django 3.0.8 on 2020-09-25 11:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Locked until'),
+        ),
+    ]
@@ -0,0 +1,164 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import DEFERRED
+from django.utils.translation import ugettext_lazy as _
+
+from apps.core.querysets import OutboxMessageQuerySet
+
+__all__ = (
+    'DirtyFieldsMixin',
+    'OutboxMessage',
+)
+
+
+class DirtyFieldsMixin:
+    """Track changes of model fields in memory.
+
+    Values of fields are remembered when object is loaded from the database
+    and after every save. Saving of loaded object writes only changed fields
+    (and ``auto_now`` fields) unless ``update_fields`` is passed explicitly,
+    saving of object without changes makes no queries.
+    Values changed in place (e.g. mutated lists) are not tracked.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember values loaded from the database."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            attname: value for attname, value in zip(field_names, values)
+            if value is not DEFERRED
+        }
+        return instance
+
+    def _remember_values(self, fields=None):
+        """Remember current values of all or given fields."""
+        loaded_values = self.__dict__.setdefault('_loaded_values', {})
+        for field in self._meta.concrete_fields:
+            if (fields is not None and field.name not in fields and
+                    field.attname not in fields):
+                continue
+            if field.attname in self.__dict__:
+                loaded_values[field.attname] = self.__dict__[field.attname]
+
+    def get_loaded_value(self, field_name: str):
+        """Return value of the field loaded from the database."""
+        attname = self._meta.get_field(field_name).attname
+        return getattr(self, '_loaded_values', {}).get(attname)
+
+    @property
+    def changed_fields(self) -> list:
+        """Return names of fields changed since loading or saving.
+
+        All loaded fields are changed for objects not saved yet.
+        """
+        loaded_values = getattr(self, '_loaded_values', None)
+        changed = []
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue
+            if (self._state.adding or loaded_values is None or
+                    field.attname not in loaded_values or
+                    loaded_values[field.attname] !=
+                    self.__dict__[field.attname]):
+                changed.append(field.name)
+        return changed
+
+    def save(self, *args, **kwargs):
+        """Save only changed fields of loaded object."""
+        if (not self._state.adding and not args and
+                kwargs.get('update_fields') is None and
+                not kwargs.get('force_insert') and
+                getattr(self, '_loaded_values', None) is not None):
+            changed_fields = self.changed_fields
+            if changed_fields:
+                changed_fields += [
+                    field.name for field in self._meta.concrete_fields
+                    if getattr(field, 'auto_now', False) and
+                    field.name not in changed_fields
+                ]
+            kwargs['update_fields'] = changed_fields
+        super().save(*args, **kwargs)
+        self._remember_values(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None):
+        """Remember values reloaded from the database."""
+        super().refresh_from_db(using=using, fields=fields)
+        self._remember_values(fields)
+
+
+class OutboxMessage(models.Model):
+    """Side effect saved in the same transaction as the change causing it.
+
+    Messages are dispatched by the outbox relay after commit, so rolled back
+    changes cause no side effects and requests do not wait for the broker.
+
+    Attributes:
+        kind (str): Dispatch to Celery task or direct call of handler.
+        name (str): Name of Celery task or dotted path of handler.
+        payload (str): JSON with positional and keyword arguments.
+        attempts (int): Count of failed dispatches.
+        last_error (str): Error of the last failed dispatch.
+        locked_until (datetime): End of lease of the relay dispatching the
+            message, the message is dispatched again after it.
+        created_at (datetime): Date when message was enqueued.
+    """
+
+    class Kind(models.TextChoices):
+        TASK = 'TASK', _('Celery task')
+        CALL = 'CALL', _('Handler call')
+
+    kind = models.CharField(
+        max_length=4,
+        choices=Kind.choices,
+        verbose_name=_('Kind'),
+    )
+    name = models.CharField(
+        max_length=255,
+        verbose_name=_('Name'),
+    )
+    payload = models.TextField(
+        verbose_name=_('Payload'),
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_('Attempts'),
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name=_('Last error'),
+    )
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Locked until'),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Created at'),
+    )
+
+    objects = OutboxMessageQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'outbox_messages'
+        ordering = ('id',)
+        verbose_name = _('Outbox message')
+        verbose_name_plural = _('Outbox messages')
+
+    def __str__(self):
+        return f'{self.kind}: {self.name}'
+
+    @staticmethod
+    def dump_payload(args=(), kwargs=None) -> str:
+        """Return JSON payload of dispatch arguments."""
+        return json.dumps(
+            {'args': list(args), 'kwargs': kwargs or {}}, cls=DjangoJSONEncoder
+        )
+
+    def get_arguments(self):
+        """Return positional and keyword arguments of dispatch."""
+        payload = json.loads(self.payload)
+        return payload['args'], payload['kwargs']
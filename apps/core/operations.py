@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from apps.core.search import is_postgresql
+
+__all__ = (
+    'PostgreSQLRunSQL',
+)
+
+
+class PostgreSQLRunSQL(migrations.RunSQL):
+    """Run SQL only on PostgreSQL, skip it on other databases."""
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        """Run forward SQL on PostgreSQL only."""
+        if is_postgresql(schema_editor.connection.alias):
+            super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        """Run reverse SQL on PostgreSQL only."""
+        if is_postgresql(schema_editor.connection.alias):
+            super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
@@ -0,0 +1,185 @@
+import logging
+from datetime import timedelta
+
+from celery import current_app
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.core.models import OutboxMessage
+
+__all__ = (
+    'coalesce',
+    'enqueue_call',
+    'enqueue_task',
+    'enqueue_tasks',
+    'relay_outbox',
+)
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_task(name: str, *args, **kwargs) -> OutboxMessage:
+    """Send Celery task after commit of current transaction."""
+    return OutboxMessage.objects.enqueue(
+        OutboxMessage.Kind.TASK, name, args, kwargs
+    )
+
+
+def enqueue_tasks(name: str, args_list) -> list:
+    """Send Celery task with every positional arguments from the list."""
+    return OutboxMessage.objects.enqueue_many(
+        OutboxMessage.Kind.TASK, name, ((args, None) for args in args_list)
+    )
+
+
+def enqueue_call(path: str, *args, **kwargs) -> OutboxMessage:
+    """Call handler by its dotted path after commit in the relay."""
+    return OutboxMessage.objects.enqueue(
+        OutboxMessage.Kind.CALL, path, args, kwargs
+    )
+
+
+def coalesce(handler):
+    """Mark handler of one list of ids as coalesced.
+
+    Pending calls of coalesced handler are dispatched by the relay as one
+    call with merged ids, so bursts of changes cause one run of it.
+    """
+    handler.coalesce = True
+    return handler
+
+
+def _is_coalesced(message: OutboxMessage) -> bool:
+    """Return True if message is a call of coalesced handler."""
+    if message.kind != OutboxMessage.Kind.CALL:
+        return False
+    try:
+        return getattr(import_string(message.name), 'coalesce', False)
+    except ImportError:
+        return False
+
+
+def dispatch(message: OutboxMessage, send_task=None):
+    """Send message to the broker or call its handler."""
+    args, kwargs = message.get_arguments()
+    if message.kind == OutboxMessage.Kind.TASK:
+        send_task = send_task or current_app.send_task
+        send_task(message.name, args=args, kwargs=kwargs)
+    else:
+        import_string(message.name)(*args, **kwargs)
+
+
+def _claim(messages) -> list:
+    """Lease messages of queryset to this relay.
+
+    Messages locked by another relay are skipped. Lease is committed before
+    dispatching, so handlers do not run while the rows are locked.
+    """
+    with transaction.atomic():
+        messages = list(messages.select_for_update(skip_locked=True))
+        OutboxMessage.objects.filter(
+            pk__in=[message.pk for message in messages]
+        ).update(locked_until=timezone.now() + timedelta(
+            seconds=settings.OUTBOX_LEASE_SECONDS
+        ))
+    return messages
+
+
+def _group(messages, max_attempts) -> list:
+    """Split leased messages into groups dispatched at once.
+
+    Calls of coalesced handler are grouped with all other pending calls of
+    it, which are leased too. Other messages are dispatched one by one.
+    """
+    groups, coalesced = [], {}
+    for message in messages:
+        if message.name in coalesced:
+            coalesced[message.name].append(message)
+        elif _is_coalesced(message):
+            coalesced[message.name] = [message]
+            groups.append(coalesced[message.name])
+        else:
+            groups.append([message])
+    for name, group in coalesced.items():
+        group.extend(_claim(OutboxMessage.objects.pending(
+            max_attempts
+        ).filter(kind=OutboxMessage.Kind.CALL, name=name).exclude(
+            pk__in=[message.pk for message in messages]
+        )))
+    return groups
+
+
+def _dispatch_group(group, send_task) -> bool:
+    """Dispatch leased messages in their own transaction.
+
+    Group of coalesced calls is dispatched as one call with merged ids.
+    Dispatched messages are deleted in the same transaction, failed ones
+    are released with error for the next run. Return True if they were
+    dispatched.
+    """
+    pks = [message.pk for message in group]
+    try:
+        with transaction.atomic():
+            if len(group) == 1:
+                dispatch(group[0], send_task)
+            else:
+                import_string(group[0].name)(sorted({
+                    pk for message in group
+                    for pk in message.get_arguments()[0][0]
+                }))
+            OutboxMessage.objects.filter(pk__in=pks).delete()
+    except Exception as error:
+        logger.exception('Outbox messages %s failed', pks)
+        OutboxMessage.objects.filter(pk__in=pks).update(
+            attempts=F('attempts') + 1,
+            last_error=repr(error),
+            locked_until=None,
+        )
+        return False
+    return True
+
+
+def _relay_batch(last_id, batch_size, max_attempts, send_task):
+    """Dispatch the next batch of messages.
+
+    Return count of dispatched and failed messages and id of the last
+    message of the batch, ``None`` if there is nothing to dispatch.
+    """
+    messages = _claim(OutboxMessage.objects.pending(max_attempts).filter(
+        pk__gt=last_id
+    )[:batch_size])
+    if not messages:
+        return None
+    dispatched = failed = 0
+    for group in _group(messages, max_attempts):
+        if _dispatch_group(group, send_task):
+            dispatched += len(group)
+        else:
+            failed += len(group)
+    return dispatched, failed, messages[-1].pk
+
+
+def relay_outbox(batch_size: int = None, send_task=None) -> dict:
+    """Dispatch all pending outbox messages in batches.
+
+    Messages are delivered at least once: message dispatched before crash
+    of the relay is dispatched again when its lease expires. ``send_task``
+    replaces sending of Celery tasks, it has signature of
+    ``Celery.send_task``.
+    Return counts of dispatched and failed messages.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    counts = {'dispatched': 0, 'failed': 0}
+    last_id = 0
+    while True:
+        result = _relay_batch(
+            last_id, batch_size, settings.OUTBOX_MAX_ATTEMPTS, send_task
+        )
+        if result is None:
+            return counts
+        dispatched, failed, last_id = result
+        counts['dispatched'] += dispatched
+        counts['failed'] += failed
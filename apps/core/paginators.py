@@ -0,0 +1,202 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from django.utils.functional import cached_property
+
+__all__ = (
+    'InvalidCursor',
+    'CursorPaginator',
+    'CursorPage',
+)
+
+
+class InvalidCursor(Exception):
+    """Cursor can not be decoded or does not match the ordering."""
+
+
+class CursorPaginator:
+    """Keyset paginator.
+
+    Instead of ``OFFSET`` every page is filtered by values of the last
+    (or the first) object of the previous page, so the database reads only
+    ``per_page`` rows no matter how deep the page is.
+
+    ``ordering`` is a sequence of field names like ``('-created_at', '-id')``
+    and has to end with a unique field. Annotations can be used too.
+    Null values go first for descending and last for ascending fields,
+    like PostgreSQL does by default.
+    With ``with_count=False`` the total ``COUNT(*)`` query is not made.
+    """
+
+    def __init__(self, object_list, per_page, ordering, with_count=True):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.with_count = with_count
+        opts = object_list.model._meta
+        self.fields = []
+        # model fields of ordering values, they convert values of cursors
+        self.output_fields = []
+        for name in ordering:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            if name in object_list.query.annotations:
+                self.fields.append((name, descending, False))
+                self.output_fields.append(
+                    object_list.query.annotations[name].output_field
+                )
+                continue
+            try:
+                field = opts.pk if name == 'pk' else opts.get_field(name)
+            except FieldDoesNotExist:
+                raise ValueError(f'Unknown ordering field {name}.')
+            self.fields.append((field.attname, descending, field.null))
+            self.output_fields.append(field)
+
+    @cached_property
+    def count(self):
+        """Return total count of objects or None if count is disabled."""
+        if not self.with_count:
+            return None
+        return self.object_list.count()
+
+    def page(self, cursor=None):
+        """Return a page which follows the cursor or the first page."""
+        backwards = False
+        queryset = self.object_list
+        if cursor:
+            values, backwards = self.decode_cursor(cursor)
+            condition = self._after(values, backwards)
+            if condition is None:
+                queryset = queryset.none()
+            else:
+                queryset = queryset.filter(condition)
+
+        queryset = queryset.order_by(*self._order_by(backwards))
+        objects = list(queryset[:self.per_page + 1])
+        has_more = len(objects) > self.per_page
+        objects = objects[:self.per_page]
+
+        if backwards:
+            objects.reverse()
+            return CursorPage(objects, self, True, has_more)
+        return CursorPage(objects, self, has_more, bool(cursor))
+
+    def encode_cursor(self, obj, backwards=False):
+        """Return opaque cursor pointing to the object."""
+        values = [getattr(obj, name) for name, _, _ in self.fields]
+        data = json.dumps({'v': values, 'b': backwards}, default=str)
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        """Return ordering values and direction stored in the cursor.
+
+        Values are converted by fields of ordering, so values of wrong
+        types are invalid cursors too.
+        """
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            values, backwards = data['v'], bool(data['b'])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise InvalidCursor(cursor)
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor(cursor)
+        try:
+            values = [
+                None if value is None
+                else field.get_prep_value(field.to_python(value))
+                for field, value in zip(self.output_fields, values)
+            ]
+        except (ValidationError, ValueError, TypeError):
+            raise InvalidCursor(cursor)
+        return values, backwards
+
+    def _order_by(self, backwards):
+        """Return order_by expressions for the given direction."""
+        expressions = []
+        for name, descending, _ in self.fields:
+            descending = descending != backwards
+            if descending:
+                expressions.append(F(name).desc(nulls_first=True))
+            else:
+                expressions.append(F(name).asc(nulls_last=True))
+        return expressions
+
+    def _after(self, values, backwards):
+        """Return condition for objects placed after the values.
+
+        Return None if no object can be placed after the values.
+        """
+        condition = None
+        equal = Q()
+        for (name, descending, null), value in zip(self.fields, values):
+            descending = descending != backwards
+            if value is None:
+                # nulls are first for descending and last for ascending
+                following = None
+                if descending:
+                    following = Q(**{f'{name}__isnull': False})
+                same = Q(**{f'{name}__isnull': True})
+            else:
+                lookup = 'lt' if descending else 'gt'
+                following = Q(**{f'{name}__{lookup}': value})
+                if null and not descending:
+                    following |= Q(**{f'{name}__isnull': True})
+                same = Q(**{name: value})
+
+            if following is not None:
+                term = equal & following
+                condition = term if condition is None else condition | term
+            equal &= same
+        return condition
+
+
+class CursorPage(Sequence):
+    """Page of cursor paginator."""
+
+    is_cursor_page = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next and bool(object_list)
+        self._has_previous = has_previous and bool(object_list)
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        """Return True if there is a page after this one."""
+        return self._has_next
+
+    def has_previous(self):
+        """Return True if there is a page before this one."""
+        return self._has_previous
+
+    def has_other_pages(self):
+        """Return True if there are pages before or after this one."""
+        return self.has_next() or self.has_previous()
+
+    @cached_property
+    def next_cursor(self):
+        """Return cursor of the next page."""
+        if self.has_next():
+            return self.paginator.encode_cursor(self.object_list[-1])
+
+    @cached_property
+    def previous_cursor(self):
+        """Return cursor of the previous page."""
+        if self.has_previous():
+            return self.paginator.encode_cursor(
+                self.object_list[0], backwards=True
+            )
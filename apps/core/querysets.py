@@ -1,3 +1,10 @@
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import F, Q, QuerySet
+from django.db.models.query import ModelIterable
+from django.utils import timezone
+
+from apps.core.cache import attach_cached_relations
+from apps.core.search import SEARCH_CONFIG, is_postgresql, search_rank
 from apps.users.strings import ARTIST_ROLE
 
 
@@ -9,3 +16,99 @@ class UserRoleRelatedQuerySetMixin:
         if user.role == ARTIST_ROLE:
             return self.all_visible_for_artist(user)
         return self.all_visible_for_customer(user)
+
+
+class CachedRelationsQuerySetMixin:
+    """Take related objects of fetched objects from two-tier caches.
+
+    Used instead of ``select_related`` and ``prefetch_related`` for rarely
+    changed objects, they are not queried if they are cached.
+    """
+
+    _cached_relations = ()
+
+    def with_cached_relations(self, *fields):
+        """Return queryset setting related objects of fields from cache."""
+        clone = self._chain()
+        clone._cached_relations = (*self._cached_relations, *fields)
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._cached_relations = self._cached_relations
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is not None
+        super()._fetch_all()
+        if (not fetched and self._cached_relations and
+                issubclass(self._iterable_class, ModelIterable)):
+            attach_cached_relations(
+                self._result_cache, *self._cached_relations
+            )
+
+
+class FullTextSearchQuerySetMixin:
+    """Provide full text search by stored search vector.
+
+    Queryset has to implement ``search_by_text_lookups`` used on databases
+    without full text search support.
+    """
+
+    search_vector_field = 'search_vector'
+
+    def search_by(self, value: str):
+        """Return found objects ordered by rank if possible."""
+        if not is_postgresql(self.db):
+            return self.search_by_text_lookups(value)
+        return self.full_text_search(value)
+
+    def full_text_search(self, value: str, extra_condition=None):
+        """Return objects matching search query annotated by search_rank.
+
+        Objects matching ``extra_condition`` are found too.
+        """
+        query = SearchQuery(value, config=SEARCH_CONFIG)
+        vector = F(self.search_vector_field)
+        condition = Q(**{self.search_vector_field: query})
+        if extra_condition is not None:
+            condition |= extra_condition
+
+        ordering = self.query.order_by or self.model._meta.ordering
+        return self.annotate(
+            search_rank=search_rank(vector, query)
+        ).filter(condition).order_by('-search_rank', *ordering)
+
+
+class OutboxMessageQuerySet(QuerySet):
+    """Queryset of outbox messages."""
+
+    def enqueue(self, kind: str, name: str, args=(), kwargs=None):
+        """Save message to be dispatched after commit."""
+        return self.create(
+            kind=kind,
+            name=name,
+            payload=self.model.dump_payload(args, kwargs),
+        )
+
+    def enqueue_many(self, kind: str, name: str, arguments):
+        """Save messages for every ``(args, kwargs)`` pair in one query."""
+        return self.bulk_create([
+            self.model(
+                kind=kind,
+                name=name,
+                payload=self.model.dump_payload(args, kwargs),
+            )
+            for args, kwargs in arguments
+        ])
+
+    def pending(self, max_attempts: int):
+        """Return messages which were not failed too many times.
+
+        Messages leased by a relay are skipped till the lease expires.
+        """
+        return self.filter(
+            Q(locked_until__isnull=True) |
+            Q(locked_until__lt=timezone.now()),
+            attempts__lt=max_attempts,
+        )
@@ -0,0 +1,132 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchRank, SearchVector
+from django.db import connections
+from django.db.models import DecimalField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.signals import m2m_changed, post_save
+
+__all__ = (
+    'SEARCH_CONFIG',
+    'is_postgresql',
+    'exact_rank',
+    'search_rank',
+    'update_search_vector',
+    'connect_search_vector',
+)
+
+SEARCH_CONFIG = 'english'
+SEARCH_VECTOR_SOURCE_FIELDS = ('title', 'description')
+
+
+def is_postgresql(using='default'):
+    """Return True if database supports full text search."""
+    return connections[using].vendor == 'postgresql'
+
+
+def exact_rank(expression):
+    """Cast float rank expression to numeric.
+
+    Numeric rank can be used in keyset pagination without float
+    precision loss.
+    """
+    return Cast(
+        expression,
+        output_field=DecimalField(max_digits=12, decimal_places=6),
+    )
+
+
+def search_rank(vector, query):
+    """Return full text search rank expression."""
+    return exact_rank(SearchRank(vector, query))
+
+
+def update_search_vector(queryset, tag_model=None):
+    """Update stored search vector of every object in queryset.
+
+    Weights: title (A) > tags (B) > description (C).
+    Vectors are built by the database with one ``UPDATE`` statement.
+    """
+    if tag_model is None:
+        from apps.tags.models import Tag as tag_model
+
+    model = queryset.model
+    tags_relation = model._meta.get_field('tags').related_query_name()
+    tags = tag_model.objects.filter(
+        **{tags_relation: OuterRef('pk')}
+    ).order_by().values(tags_relation).annotate(
+        titles=StringAgg('title', ' ')
+    ).values('titles')
+
+    return queryset.update(search_vector=(
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector(
+            Coalesce(Subquery(tags), Value('')),
+            weight='B',
+            config=SEARCH_CONFIG,
+        )
+        + SearchVector(
+            Coalesce('description', Value('')),
+            weight='C',
+            config=SEARCH_CONFIG,
+        )
+    ))
+
+
+def connect_search_vector(model):
+    """Keep ``search_vector`` of model up to date.
+
+    Vector is rebuilt after saving of the object, changing of its tags and
+    renaming of tag. Does nothing on not PostgreSQL databases.
+    """
+    from apps.tags.models import Tag
+
+    def object_saved(sender, instance, using, update_fields, **kwargs):
+        if not is_postgresql(using):
+            return
+        if (update_fields is not None and
+                not set(update_fields) & set(SEARCH_VECTOR_SOURCE_FIELDS)):
+            return
+        update_search_vector(sender.objects.using(using).filter(
+            pk=instance.pk
+        ))
+
+    def tags_changed(sender, instance, action, reverse, pk_set, using,
+                     **kwargs):
+        if not is_postgresql(using):
+            return
+        if reverse and action == 'pre_clear':
+            # tag is cleared from objects, remember them before removal
+            instance._search_vector_pks = set(model.objects.using(
+                using
+            ).filter(tags=instance).values_list('pk', flat=True))
+            return
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        if reverse:
+            if action == 'post_clear':
+                pk_set = instance.__dict__.pop('_search_vector_pks', set())
+            queryset = model.objects.filter(pk__in=pk_set)
+        else:
+            queryset = model.objects.filter(pk=instance.pk)
+        update_search_vector(queryset.using(using))
+
+    def tag_saved(sender, instance, using, created, **kwargs):
+        if created or not is_postgresql(using):
+            return
+        update_search_vector(model.objects.using(using).filter(
+            tags=instance
+        ))
+
+    uid = f'search_vector_{model._meta.label_lower}'
+    post_save.connect(
+        object_saved, sender=model, weak=False, dispatch_uid=uid
+    )
+    m2m_changed.connect(
+        tags_changed,
+        sender=model.tags.through,
+        weak=False,
+        dispatch_uid=uid,
+    )
+    post_save.connect(
+        tag_saved, sender=Tag, weak=False, dispatch_uid=uid
+    )
@@ -0,0 +1,66 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.sessions.backends.cache import (
+    SessionStore as CacheSessionStore,
+)
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.utils import timezone
+
+__all__ = (
+    'SessionStore',
+    'copy_db_sessions',
+)
+
+
+class SessionStore(CacheSessionStore):
+    """Session kept in the ``SESSION_CACHE_ALIAS`` cache (redis).
+
+    Digest of loaded data is remembered, so ``has_changed`` tells if the
+    session has to be written back.
+    """
+
+    loaded_key = None
+    loaded_digest = None
+
+    def load(self):
+        """Load session data and remember its digest."""
+        data = super().load()
+        self.loaded_key = self.session_key
+        self.loaded_digest = self.get_digest(data)
+        return data
+
+    def get_digest(self, data: dict) -> str:
+        """Return digest of serialized session data."""
+        return hashlib.sha1(self.serializer().dumps(data)).hexdigest()
+
+    def has_changed(self) -> bool:
+        """Return True if session key or data differ from the loaded ones."""
+        if not hasattr(self, '_session_cache'):
+            return False
+        return (
+            self.session_key != self.loaded_key or
+            self.get_digest(self._session_cache) != self.loaded_digest
+        )
+
+
+def copy_db_sessions(batch_size: int = 1000) -> int:
+    """Copy not expired sessions from the database to the sessions cache.
+
+    Sessions keep their keys and expiration dates, so users stay logged in
+    after ``SESSION_ENGINE`` is switched. Return count of copied sessions.
+    """
+    sessions_cache = caches[settings.SESSION_CACHE_ALIAS]
+    now = timezone.now()
+    count = 0
+    for session in Session.objects.filter(expire_date__gt=now).iterator(
+        chunk_size=batch_size
+    ):
+        sessions_cache.set(
+            SessionStore(session.session_key).cache_key,
+            session.get_decoded(),
+            int((session.expire_date - now).total_seconds()),
+        )
+        count += 1
+    return count
@@ -0,0 +1,499 @@
+import csv
+import io
+import itertools
+import multiprocessing
+import random
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.core.cache import bump_generation
+from apps.core.search import is_postgresql, update_search_vector
+from apps.users.strings import ARTIST_ROLE, CUSTOMER_ROLE
+
+__all__ = (
+    'SyntheticData',
+    'copy_rows',
+    'generate_data',
+)
+
+EMAIL_DOMAIN = 'synthetic.test'
+# generated objects are created during a year from this date
+START_DATE = datetime(2020, 1, 1, tzinfo=timezone.utc)
+PERIOD_DAYS = 365
+
+ARTISTS_SHARE = 0.2
+ACCEPTED_SHARE = 0.6
+DECLINED_SHARE = 0.1
+MASTERPIECE_SHARE = 0.7
+RATED_SHARE = 0.6
+REWORK_SHARE = 0.1
+VISIBLE_SHARE = 0.8
+MAX_TAGS = 5
+MAX_VIEWS = 1_000_000
+
+WORDS = (
+    'portrait', 'landscape', 'logo', 'poster', 'dragon', 'castle', 'forest',
+    'city', 'sea', 'mountain', 'cat', 'dog', 'flower', 'abstract', 'comic',
+    'watercolor', 'oil', 'pencil', 'digital', 'sketch', 'vintage', 'neon',
+    'minimal', 'fantasy', 'family', 'wedding', 'birthday', 'cover', 'album',
+    'game', 'character', 'icon', 'banner', 'sticker', 'tattoo', 'mural',
+)
+# counters of artist stats in order of their values in lists of counters
+STATS_COUNTERS = (
+    'rating_sum',
+    'rating_count',
+    'completed_orders',
+    'active_orders',
+    'accepted_offers',
+    'fee_sum',
+)
+
+
+def copy_rows(model, fields, rows, using='default') -> int:
+    """Insert rows of values of model fields and return their count.
+
+    PostgreSQL reads rows by ``COPY FROM STDIN`` in CSV format, other
+    databases insert them by one ``executemany``. Values are written as
+    they are: defaults, ``auto_now`` dates and signals are skipped.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    fields = [model._meta.get_field(name) for name in fields]
+    table = quote_name(model._meta.db_table)
+    columns = ', '.join(quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        if is_postgresql(using):
+            data = io.StringIO()
+            csv.writer(data).writerows(rows)
+            data.seek(0)
+            cursor.copy_expert(
+                f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)', data
+            )
+        else:
+            placeholders = ', '.join(['%s'] * len(fields))
+            cursor.executemany(
+                f'INSERT INTO {table} ({columns}) VALUES ({placeholders})',
+                [
+                    [
+                        field.get_db_prep_save(value, connection)
+                        for field, value in zip(fields, row)
+                    ]
+                    for row in rows
+                ],
+            )
+    return len(rows)
+
+
+class SyntheticData:
+    """Deterministic synthetic dataset for load testing.
+
+    Rows are generated by chunks of ``batch_size`` users or orders. Every
+    chunk has its own random generator seeded by ``seed`` and its number,
+    primary keys are allocated above the existing ones, so chunks are
+    written by parallel processes in any order and the same seed gives the
+    same data on the same database.
+
+    Orders are created by customers, offers and masterpieces by artists.
+    An order has offers of different artists, accepted offer is set to the
+    order and other offers are declined. Masterpieces are created by
+    artists of accepted offers, statuses of orders and artist stats match
+    offers and masterpieces.
+
+    Attributes:
+        seed (int): Seed of random generators.
+        users (int): Count of users, ``ARTISTS_SHARE`` of them are artists.
+        orders (int): Count of orders.
+        offers (int): Count of offers spread over orders evenly.
+        tags (int): Count of tags.
+        tags_skew (float): Exponent of Zipf distribution of tags.
+        batch_size (int): Count of users or orders in a chunk.
+        using (str): Alias of database.
+    """
+
+    def __init__(self, seed: int = 0, users: int = 1000, orders: int = 2000,
+                 offers: int = 5000, tags: int = 100,
+                 tags_skew: float = 1.1, batch_size: int = 10000,
+                 using: str = 'default'):
+        self.seed = seed
+        self.users = users
+        self.orders = orders
+        self.offers = offers
+        self.tags = tags
+        self.tags_skew = tags_skew
+        self.batch_size = batch_size
+        self.using = using
+        self.artists = max(1, round(users * ARTISTS_SHARE)) if users else 0
+        self.customers = users - self.artists
+        self.offers_per_order, self.extra_offers = divmod(
+            offers, orders
+        ) if orders else (0, 0)
+        if orders and not self.customers:
+            raise ValueError('Orders require customers.')
+        if self.offers_per_order + bool(self.extra_offers) > self.artists:
+            raise ValueError('Every offer of order requires another artist.')
+        self.first_ids = {}
+        self.counters = {}
+        self._tags_weights = None
+
+    def allocate_ids(self):
+        """Remember first free primary keys of generated tables."""
+        for label in ('tags.Tag', 'users.User', 'orders.Order',
+                      'offers.Offer', 'masterpieces.Masterpiece'):
+            last_id = apps.get_model(label).objects.using(
+                self.using
+            ).aggregate(last_id=Max('pk'))['last_id']
+            self.first_ids[label] = (last_id or 0) + 1
+
+    def get_chunks(self) -> dict:
+        """Return counts of chunks of users and orders."""
+        return {
+            'users': -(-self.users // self.batch_size),
+            'orders': -(-self.orders // self.batch_size),
+        }
+
+    def get_random(self, name: str, index: int) -> random.Random:
+        """Return random generator of chunk."""
+        return random.Random(f'{self.seed}:{name}:{index}')
+
+    def get_date(self, rand: random.Random) -> datetime:
+        """Return random date of the generated period."""
+        return START_DATE + timedelta(seconds=rand.uniform(
+            0, PERIOD_DAYS * 24 * 3600
+        ))
+
+    def get_text(self, rand: random.Random, words: int) -> str:
+        """Return random text of words."""
+        return ' '.join(rand.choices(WORDS, k=words)).capitalize()
+
+    def get_tags(self, rand: random.Random) -> set:
+        """Return pks of random tags, the first tags are the most popular."""
+        if not self.tags:
+            return set()
+        if self._tags_weights is None:
+            self._tags_weights = list(itertools.accumulate(
+                1 / rank ** self.tags_skew for rank in range(1, self.tags + 1)
+            ))
+        total = self._tags_weights[-1]
+        first_id = self.first_ids['tags.Tag']
+        return {
+            first_id + bisect_left(self._tags_weights, rand.random() * total)
+            for _ in range(rand.randint(0, MAX_TAGS))
+        }
+
+    def get_offers_range(self, number: int) -> range:
+        """Return pks of offers of order by its number."""
+        start = (
+            self.first_ids['offers.Offer'] +
+            number * self.offers_per_order + min(number, self.extra_offers)
+        )
+        count = self.offers_per_order + (number < self.extra_offers)
+        return range(start, start + count)
+
+    def add_tags(self, index: int = 0) -> dict:
+        """Write tags and return count and time of written rows."""
+        started_at = time.monotonic()
+        first_id = self.first_ids['tags.Tag']
+        count = copy_rows(apps.get_model('tags.Tag'), ('id', 'title'), (
+            (first_id + number, f'synthetic tag {first_id + number}')
+            for number in range(self.tags)
+        ), self.using)
+        return {'tags': (count, time.monotonic() - started_at)}
+
+    def add_users(self, index: int) -> dict:
+        """Write chunk of users and return counts and time of rows."""
+        started_at = time.monotonic()
+        rand = self.get_random('users', index)
+        first_number = index * self.batch_size
+        numbers = range(
+            first_number, min(first_number + self.batch_size, self.users)
+        )
+        rows = []
+        for number in numbers:
+            pk = self.first_ids['users.User'] + number
+            role = ARTIST_ROLE if number < self.artists else CUSTOMER_ROLE
+            rows.append((
+                pk, '!', None, False, role.capitalize(), str(pk),
+                f'{role.lower()}{pk}@{EMAIL_DOMAIN}', True, False,
+                self.get_date(rand), role, None,
+            ))
+        count = copy_rows(apps.get_model('users.User'), (
+            'id', 'password', 'last_login', 'is_superuser', 'first_name',
+            'last_name', 'email', 'is_active', 'is_staff', 'date_joined',
+            'role', 'phone_number',
+        ), rows, self.using)
+        return {'users': (count, time.monotonic() - started_at)}
+
+    def add_orders(self, index: int) -> tuple:
+        """Write chunk of orders with their offers, masterpieces and tags.
+
+        Return counts and time of written rows and counters of artists
+        stats ``{artist_id: [counters]}``.
+        """
+        rand = self.get_random('orders', index)
+        first_number = index * self.batch_size
+        numbers = range(
+            first_number, min(first_number + self.batch_size, self.orders)
+        )
+        first_user_id = self.first_ids['users.User']
+        orders, offers, masterpieces = [], [], []
+        orders_tags, masterpieces_tags = [], []
+        counters = defaultdict(lambda: [0] * len(STATS_COUNTERS))
+
+        for number in numbers:
+            order_id = self.first_ids['orders.Order'] + number
+            customer_id = first_user_id + self.artists + rand.randrange(
+                self.customers
+            )
+            created_at = self.get_date(rand)
+            complete_to = created_at + timedelta(days=rand.randint(1, 30))
+            tags = self.get_tags(rand)
+            orders_tags.extend((order_id, tag_id) for tag_id in tags)
+
+            offers_ids = self.get_offers_range(number)
+            first_artist = rand.randrange(self.artists)
+            accepted = bool(offers_ids) and rand.random() < ACCEPTED_SHARE
+            accepted_offer = accepted_at = accepted_artist = None
+            completed_at = None
+            status = 'IN_PROGRESS' if accepted else 'OPEN'
+            for position, offer_id in enumerate(offers_ids):
+                artist_id = first_user_id + (
+                    (first_artist + position) % self.artists
+                )
+                offer_created_at = created_at + timedelta(
+                    hours=rand.uniform(1, 72)
+                )
+                fee = rand.randint(100, 999999)
+                offer_accepted_at = declined_at = None
+                if accepted and position == 0:
+                    accepted_offer, accepted_artist = offer_id, artist_id
+                    accepted_at = offer_accepted_at = (
+                        offer_created_at + timedelta(hours=rand.uniform(1, 72))
+                    )
+                    counters[artist_id][4] += 1
+                    counters[artist_id][5] += fee
+                elif accepted:
+                    declined_at = accepted_at
+                elif rand.random() < DECLINED_SHARE:
+                    declined_at = offer_created_at + timedelta(hours=1)
+                offers.append((
+                    offer_id, order_id, artist_id, fee, offer_created_at,
+                    declined_at or offer_accepted_at or offer_created_at,
+                    declined_at, offer_accepted_at, False,
+                ))
+
+            if accepted and rand.random() < MASTERPIECE_SHARE:
+                masterpiece_id = (
+                    self.first_ids['masterpieces.Masterpiece'] + number
+                )
+                masterpiece_created_at = accepted_at + timedelta(
+                    days=rand.uniform(1, 14)
+                )
+                rate = decline_message = None
+                status = 'READY'
+                if rand.random() < RATED_SHARE:
+                    rate = rand.randint(1, 5)
+                    completed_at = masterpiece_created_at + timedelta(
+                        days=rand.uniform(0, 3)
+                    )
+                    status = 'FINISHED'
+                    counters[accepted_artist][0] += rate
+                    counters[accepted_artist][1] += 1
+                elif rand.random() < REWORK_SHARE:
+                    decline_message = self.get_text(rand, 8)
+                    status = 'ON_REWORK'
+                counters[accepted_artist][2] += 1
+                masterpieces.append((
+                    masterpiece_id, accepted_artist, self.get_text(rand, 4),
+                    self.get_text(rand, 20), masterpiece_created_at,
+                    completed_at or masterpiece_created_at, rate,
+                    decline_message, rand.random() < VISIBLE_SHARE, order_id,
+                ))
+                masterpieces_tags.extend(
+                    (masterpiece_id, tag_id) for tag_id in tags
+                )
+            if accepted and completed_at is None:
+                counters[accepted_artist][3] += 1
+
+            orders.append((
+                order_id, customer_id, self.get_text(rand, 4),
+                self.get_text(rand, 30), complete_to, created_at,
+                completed_at or accepted_at or created_at, completed_at,
+                min(int(rand.paretovariate(1.2)) - 1, MAX_VIEWS), status,
+                accepted_offer,
+            ))
+
+        written = {}
+        order_model = apps.get_model('orders.Order')
+        masterpiece_model = apps.get_model('masterpieces.Masterpiece')
+        with transaction.atomic(using=self.using):
+            # constraints of accepted offers of orders are deferred
+            self.write(written, 'orders', order_model, (
+                'id', 'created_by', 'title', 'description', 'complete_to',
+                'created_at', 'updated_at', 'completed_at', 'views',
+                'status', 'offer',
+            ), orders)
+            self.write(written, 'offers', apps.get_model('offers.Offer'), (
+                'id', 'order', 'artist', 'fee', 'created_at', 'updated_at',
+                'declined_at', 'accepted_at', 'changes_requested',
+            ), offers)
+            self.write(written, 'masterpieces', masterpiece_model, (
+                'id', 'artist', 'title', 'description', 'created_at',
+                'updated_at', 'customer_rate', 'decline_message', 'visible',
+                'order',
+            ), masterpieces)
+            self.write(
+                written, 'orders_tags', order_model.tags.through,
+                ('order', 'tag'), orders_tags,
+            )
+            self.write(
+                written, 'masterpieces_tags', masterpiece_model.tags.through,
+                ('masterpiece', 'tag'), masterpieces_tags,
+            )
+            if is_postgresql(self.using):
+                self.update_search_vectors(
+                    written, 'orders', order_model, orders
+                )
+                self.update_search_vectors(
+                    written, 'masterpieces', masterpiece_model, masterpieces
+                )
+        return written, dict(counters)
+
+    def add_stats(self, index: int = 0) -> dict:
+        """Write stats of all artists by counters of written orders."""
+        started_at = time.monotonic()
+        first_id = self.first_ids['users.User']
+        empty = [0] * len(STATS_COUNTERS)
+        rows = []
+        for artist_id in range(first_id, first_id + self.artists):
+            artist_counters = self.counters.get(artist_id, empty)
+            rating_sum, rating_count = artist_counters[:2]
+            rating = Decimal(0)
+            if rating_count:
+                rating = (Decimal(rating_sum) / rating_count).quantize(
+                    Decimal('0.01'), rounding=ROUND_HALF_UP
+                )
+            rows.append((artist_id, *artist_counters, rating))
+        count = 0
+        for start in range(0, len(rows), self.batch_size):
+            count += copy_rows(
+                apps.get_model('users.ArtistStats'),
+                ('artist', *STATS_COUNTERS, 'rating'),
+                rows[start:start + self.batch_size],
+                self.using,
+            )
+        return {'artist_stats': (count, time.monotonic() - started_at)}
+
+    def write(self, written: dict, name: str, model, fields, rows):
+        """Write rows and add their count and time to written."""
+        started_at = time.monotonic()
+        count = copy_rows(model, fields, rows, self.using)
+        written[name] = (count, time.monotonic() - started_at)
+
+    def update_search_vectors(self, written: dict, name: str, model, rows):
+        """Build search vectors of written objects by their pks."""
+        if not rows:
+            return
+        started_at = time.monotonic()
+        count = update_search_vector(model.objects.using(self.using).filter(
+            pk__range=(rows[0][0], rows[-1][0])
+        ))
+        written[f'{name}_search_vectors'] = (
+            count, time.monotonic() - started_at
+        )
+
+    def finish(self):
+        """Reset sequences, bump cache generations and collect statistics."""
+        models = [
+            apps.get_model(label) for label in (
+                'tags.Tag', 'users.User', 'orders.Order', 'offers.Offer',
+                'masterpieces.Masterpiece',
+            )
+        ]
+        connection = connections[self.using]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+            if is_postgresql(self.using):
+                for model in models:
+                    cursor.execute(f'ANALYZE {model._meta.db_table}')
+        for model in (*models, apps.get_model('users.ArtistStats')):
+            bump_generation(model, using=self.using)
+
+
+def _run_chunk(arguments):
+    dataset, method, index = arguments
+    return getattr(dataset, method)(index)
+
+
+def _iter_chunks(dataset: SyntheticData, method: str, count: int,
+                 workers: int):
+    """Yield results of chunks, by forked processes if there are workers."""
+    tasks = [(dataset, method, index) for index in range(count)]
+    if workers <= 1 or count <= 1:
+        yield from map(_run_chunk, tasks)
+        return
+    # forked processes open their own connections
+    connections.close_all()
+    context = multiprocessing.get_context('fork')
+    with context.Pool(min(workers, count)) as pool:
+        yield from pool.imap_unordered(_run_chunk, tasks)
+
+
+def generate_data(dataset: SyntheticData, workers: int = 1,
+                  report=None) -> dict:
+    """Write dataset by parallel processes and return rows per second.
+
+    Tags and users are written first, then orders with their offers,
+    masterpieces and tags, then artist stats. Time of a phase is split
+    between its tables by time spent on them. ``report`` is called with
+    table name, count of rows and rows per second as soon as the phase is
+    finished. Return ``{table: (rows, rows per second)}``.
+    """
+    dataset.allocate_ids()
+    chunks = dataset.get_chunks()
+    counters = {}
+    results = {}
+
+    def run_phase(method: str, count: int):
+        started_at = time.monotonic()
+        phase = defaultdict(lambda: [0, 0])
+        for written in _iter_chunks(dataset, method, count, workers):
+            if method == 'add_orders':
+                written, chunk_counters = written
+                for artist_id, values in chunk_counters.items():
+                    total = counters.setdefault(
+                        artist_id, [0] * len(STATS_COUNTERS)
+                    )
+                    for position, value in enumerate(values):
+                        total[position] += value
+            for name, (rows, seconds) in written.items():
+                phase[name][0] += rows
+                phase[name][1] += seconds
+        elapsed = time.monotonic() - started_at
+        busy = sum(seconds for _, seconds in phase.values())
+        for name, (rows, seconds) in phase.items():
+            table_elapsed = elapsed * seconds / busy if busy else 0
+            rate = rows / table_elapsed if table_elapsed else 0
+            results[name] = (rows, rate)
+            if report:
+                report(name, rows, rate)
+
+    run_phase('add_tags', 1)
+    run_phase('add_users', chunks['users'])
+    run_phase('add_orders', chunks['orders'])
+    dataset.counters = counters
+    run_phase('add_stats', 1)
+    dataset.finish()
+    return results
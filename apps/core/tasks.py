@@ -0,0 +1,10 @@
+from celery.decorators import periodic_task
+from celery.task.schedules import crontab
+
+from .outbox import relay_outbox
+
+
+@periodic_task(run_every=(crontab(minute='*')), name='relay_outbox')
+def relay_outbox_task():
+    """Dispatch messages saved in the outbox every minute."""
+    return relay_outbox()
@@ -0,0 +1,88 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from apps.core.cache import (
+    get_cached,
+    get_generations,
+    make_cache_key,
+    set_cached,
+)
+
+register = template.Library()
+
+
+class CacheFragmentNode(template.Node):
+    """Node rendering content once per generation of object."""
+
+    def __init__(self, nodelist, name, instance, vary_on, depends):
+        self.nodelist = nodelist
+        self.name = name
+        self.instance = instance
+        self.vary_on = vary_on
+        self.depends = depends
+
+    def render(self, context):
+        """Return cached content or render and cache it."""
+        name = self.name.resolve(context)
+        instance = self.instance.resolve(context)
+        targets = [(type(instance), instance.pk)]
+        for label, pk in self.depends:
+            if pk is None:
+                targets.append(label)
+                continue
+            pk = pk.resolve(context)
+            if pk not in (None, ''):
+                targets.append((label, pk))
+        key = make_cache_key(
+            name,
+            instance.pk,
+            [value.resolve(context) for value in self.vary_on],
+            get_generations(*targets),
+        )
+        content = get_cached(name, key)
+        if content is None:
+            content = self.nodelist.render(context)
+            set_cached(key, content)
+        return mark_safe(content)
+
+
+@register.tag
+def cachefragment(parser, token):
+    """Cache content rendered for an object.
+
+    Usage::
+
+        {% cachefragment 'order-card' order user.role depends='tags.tag' %}
+            ...
+        {% endcachefragment %}
+
+    Content is cached by name, object and the rest values like ``{% cache %}``
+    does. Key contains generation of the object and generations of models
+    labeled in ``depends``, so changes of them render content again. Label
+    with variable of primary key, like ``users.user:order.created_by_id``,
+    depends on generation of that object only, empty variable is skipped.
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires at least name and object."
+        )
+    depends = []
+    if bits[-1].startswith('depends='):
+        value = bits.pop()[len('depends='):]
+        if len(value) < 2 or value[0] != value[-1] or value[0] not in '\'"':
+            raise template.TemplateSyntaxError(
+                f"'{bits[0]}' tag requires quoted depends."
+            )
+        for target in value[1:-1].split():
+            label, _, pk = target.partition(':')
+            depends.append((label, parser.compile_filter(pk) if pk else None))
+    nodelist = parser.parse(('endcachefragment',))
+    parser.delete_first_token()
+    return CacheFragmentNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        parser.compile_filter(bits[2]),
+        [parser.compile_filter(bit) for bit in bits[3:]],
+        depends,
+    )
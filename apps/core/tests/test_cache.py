@@ -0,0 +1,326 @@
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import Client, TestCase, override_settings
+
+from apps.core.cache import (
+    LocalCache,
+    TieredCache,
+    bump_generation,
+    get_cache_stats,
+    get_generations,
+)
+from apps.masterpieces.factories import MasterpieceFactory
+from apps.orders.factories import OrderFactory
+from apps.orders.models import Order
+from apps.tags.factories import TagFactory
+from apps.users.factories import ArtistFactory, CustomerFactory
+from apps.users.models import ArtistStats, User
+
+LOCMEM_CACHES = {
+    **settings.CACHES,
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test_cache',
+    },
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ORDER_VIEWS_BUFFER_URL=None)
+class CacheTestCase(TestCase):
+    """Base test case with empty local memory cache."""
+
+    def setUp(self):
+        """Clear cache."""
+        cache.clear()
+        self.client = Client()
+
+
+class GenerationsTest(CacheTestCase):
+    """Tests for cache generations of models and objects."""
+
+    def test_bump(self):
+        """Bump should change generations of model and objects only."""
+        before = get_generations(Order, (Order, 1), (Order, 2))
+        bump_generation(Order, 1)
+        after = get_generations(Order, (Order, 1), (Order, 2))
+        self.assertNotEqual(before[0], after[0])
+        self.assertNotEqual(before[1], after[1])
+        self.assertEqual(before[2], after[2])
+
+    def test_signals(self):
+        """Saving and changing of tags should bump generation of object."""
+        order = OrderFactory()
+        generation = get_generations((Order, order.pk))
+        order.title = 'Renamed order'
+        order.save()
+        self.assertNotEqual(generation, get_generations((Order, order.pk)))
+
+        generation = get_generations((Order, order.pk))
+        order.tags.add(TagFactory())
+        self.assertNotEqual(generation, get_generations((Order, order.pk)))
+
+    def test_update_status(self):
+        """Updated statuses should bump generations of orders."""
+        order = OrderFactory()
+        generation = get_generations((Order, order.pk))
+        Order.objects.filter(pk=order.pk).update_status()
+        self.assertNotEqual(generation, get_generations((Order, order.pk)))
+
+    def test_stats_increment(self):
+        """Incremented stats should bump generation of artist stats."""
+        artist = ArtistFactory()
+        generation = get_generations(ArtistStats)
+        ArtistStats.objects.increment(artist.pk, completed_orders=1)
+        self.assertNotEqual(generation, get_generations(ArtistStats))
+
+
+class CachedListsTest(CacheTestCase):
+    """Tests for cached lists of objects."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create artists and orders."""
+        cls.artist = ArtistFactory()
+        cls.order = OrderFactory(title='First order')
+        return super().setUpTestData()
+
+    def test_hit(self):
+        """Second request should take list from cache."""
+        self.client.force_login(self.artist)
+        response = self.client.get('/orders/')
+        self.assertEqual(list(response.context['orders']), [self.order])
+
+        response = self.client.get('/orders/')
+        self.assertEqual(list(response.context['orders']), [])
+        self.assertContains(response, 'First order')
+        self.assertEqual(get_cache_stats()['OrderList']['hits'], 1)
+
+    def test_query_is_part_of_key(self):
+        """Lists of different search terms should be cached separately."""
+        self.client.force_login(self.artist)
+        self.client.get('/orders/')
+        response = self.client.get('/orders/', {'status': 'READY'})
+        self.assertNotContains(response, 'First order')
+
+    def test_invalidation_by_save(self):
+        """Changed order should be rendered again."""
+        self.client.force_login(self.artist)
+        self.client.get('/orders/')
+        self.order.title = 'Renamed order'
+        self.order.save()
+        response = self.client.get('/orders/')
+        self.assertContains(response, 'Renamed order')
+
+    def test_invalidation_by_tags(self):
+        """Added and renamed tags should be rendered in cached cards."""
+        self.client.force_login(self.artist)
+        self.client.get('/orders/')
+        tag = TagFactory(title='watercolor')
+        self.order.tags.add(tag)
+        self.assertContains(self.client.get('/orders/'), 'watercolor')
+
+        tag.title = 'gouache'
+        tag.save()
+        self.assertContains(self.client.get('/orders/'), 'gouache')
+
+    def test_shared_artist_masterpieces(self):
+        """Masterpieces of artist should be cached once for all users."""
+        masterpiece = MasterpieceFactory(visible=True)
+        url = f'/masterpieces/artist/{masterpiece.artist_id}/'
+        self.client.force_login(self.artist)
+        self.client.get(url)
+        self.client.force_login(CustomerFactory())
+        response = self.client.get(url)
+        self.assertContains(response, masterpiece.title)
+        self.assertEqual(get_cache_stats()['MasterpiecesList'], {
+            'hits': 1, 'misses': 1, 'ratio': 0.5,
+        })
+
+    def test_own_orders_are_not_shared(self):
+        """Customers should not see cached orders of each other."""
+        self.client.force_login(self.order.created_by)
+        self.assertContains(self.client.get('/orders/'), 'First order')
+        self.client.force_login(CustomerFactory())
+        self.assertNotContains(self.client.get('/orders/'), 'First order')
+
+    def test_users_not_in_key(self):
+        """Saves of users should not drop cached lists."""
+        self.client.force_login(self.artist)
+        self.client.get('/orders/')
+        CustomerFactory().save()
+        self.client.get('/orders/')
+        self.assertEqual(get_cache_stats()['OrderList']['hits'], 1)
+
+    def test_stats_command(self):
+        """Command should print hit ratio of cached lists."""
+        self.client.get('/users/artists/')
+        self.client.get('/users/artists/')
+        output = StringIO()
+        call_command('cache_stats', stdout=output)
+        self.assertIn(
+            'ArtistsList: 1 hit(s), 1 miss(es), ratio 50.0%',
+            output.getvalue(),
+        )
+
+
+class CacheFragmentTest(CacheTestCase):
+    """Tests for fragments cached by generations of objects."""
+
+    template = Template(
+        '{% load cache_fragments %}'
+        "{% cachefragment 'card' order depends='offers.offer:order.offer_id "
+        "users.user:order.created_by_id' %}"
+        '{{ order.created_by.email }}'
+        '{% endcachefragment %}'
+    )
+
+    def render(self, order):
+        """Return rendered fragment of order."""
+        return self.template.render(Context({'order': order}))
+
+    def test_object_generation(self):
+        """Fragment should be rendered again for changed user only."""
+        order = OrderFactory()
+        self.render(order)
+        CustomerFactory().save()
+        self.render(order)
+        self.assertEqual(get_cache_stats()['card']['hits'], 1)
+
+        order.created_by.email = 'changed@example.com'
+        order.created_by.save()
+        self.assertEqual(
+            self.render(Order.objects.get(pk=order.pk)), 'changed@example.com'
+        )
+        self.assertEqual(get_cache_stats()['card']['misses'], 2)
+
+    def test_not_quoted(self):
+        """Depends should be a quoted string."""
+        with self.assertRaises(TemplateSyntaxError):
+            Template(
+                '{% load cache_fragments %}'
+                "{% cachefragment 'card' order depends=labels %}"
+                '{% endcachefragment %}'
+            )
+
+
+class TieredCacheTest(CacheTestCase):
+    """Tests for two-tier cache of objects."""
+
+    def setUp(self):
+        """Create cache of users."""
+        super().setUp()
+        self.user = CustomerFactory()
+        self.users_cache = TieredCache(
+            'test_users', User, User.objects.in_bulk
+        )
+
+    def test_local_lru(self):
+        """The least recently used items should be evicted."""
+        local = LocalCache(max_size=2)
+        local.set_many({'a': 1, 'b': 2})
+        local.get_many(['a'])
+        local.set_many({'c': 3})
+        self.assertEqual(local.get_many(['a', 'b', 'c']), {'a': 1, 'c': 3})
+
+    def test_tiers(self):
+        """Cached users should be taken from process memory first."""
+        self.users_cache.get_many([self.user.pk])
+        cache.delete(self.users_cache.get_keys([self.user.pk])[self.user.pk])
+        with self.assertNumQueries(0):
+            users = self.users_cache.get_many([self.user.pk])
+        self.assertEqual(users, {self.user.pk: self.user})
+
+        self.users_cache.local.clear()
+        with self.assertNumQueries(1):
+            self.users_cache.get_many([self.user.pk])
+        with self.assertNumQueries(0):
+            self.users_cache.local.clear()
+            self.users_cache.get_many([self.user.pk])
+
+    def test_invalidation(self):
+        """Changed user should be loaded again in every process."""
+        self.users_cache.get_many([self.user.pk])
+        self.user.first_name = 'Changed'
+        self.user.save()
+        with self.assertNumQueries(1):
+            users = self.users_cache.get_many([self.user.pk])
+        self.assertEqual(users[self.user.pk].first_name, 'Changed')
+
+    def test_copies(self):
+        """Every lookup should return new objects."""
+        first = self.users_cache.get_many([self.user.pk])[self.user.pk]
+        first.first_name = 'Changed'
+        second = self.users_cache.get_many([self.user.pk])[self.user.pk]
+        self.assertNotEqual(second.first_name, 'Changed')
+
+
+class CachedRelationsTest(CacheTestCase):
+    """Tests for related objects taken from caches."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create orders with tags."""
+        cls.tag = TagFactory(title='watercolor')
+        cls.orders = OrderFactory.create_batch(3)
+        for order in cls.orders:
+            order.tags.add(cls.tag, TagFactory())
+        return super().setUpTestData()
+
+    def get_orders(self):
+        """Return orders with tags and creators from cache."""
+        return list(Order.objects.order_by('pk').with_cached_relations(
+            'tags', 'created_by'
+        ))
+
+    def test_cached(self):
+        """Tags and creators should not be queried for the second time."""
+        with self.assertNumQueries(3):
+            self.get_orders()
+        with self.assertNumQueries(1):
+            orders = self.get_orders()
+        expected = [
+            (list(order.tags.all()), order.created_by)
+            for order in self.orders
+        ]
+        with self.assertNumQueries(0):
+            self.assertEqual([
+                (list(order.tags.all()), order.created_by)
+                for order in orders
+            ], expected)
+
+    def test_invalidation(self):
+        """Renamed and removed tags should not be taken from cache."""
+        self.get_orders()
+        self.tag.title = 'gouache'
+        self.tag.save()
+        self.orders[0].tags.remove(self.tag)
+        orders = self.get_orders()
+        self.assertNotIn(self.tag, orders[0].tags.all())
+        self.assertIn('gouache', [tag.title for tag in orders[1].tags.all()])
+
+
+class CachedSessionUserTest(CacheTestCase):
+    """Tests for session users taken from cache."""
+
+    def test_no_queries(self):
+        """Logged in user should not be queried on warm cache."""
+        user = CustomerFactory()
+        self.client.force_login(user)
+        self.client.get('/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/')
+        self.assertEqual(response.context['user'], user)
+
+    def test_deactivated(self):
+        """Deactivated user should be logged out by the next request."""
+        user = CustomerFactory()
+        self.client.force_login(user)
+        self.client.get('/')
+        user.is_active = False
+        user.save()
+        response = self.client.get('/')
+        self.assertFalse(response.context['user'].is_authenticated)
@@ -0,0 +1,20 @@
+from django.test import SimpleTestCase
+
+from apps.core.geo import make_point
+
+
+class MakePointTest(SimpleTestCase):
+    """Tests for parsing of coordinates."""
+
+    def test_valid(self):
+        """Point should have longitude as x and latitude as y."""
+        point = make_point('55.75', 37.62)
+        self.assertEqual((point.x, point.y, point.srid), (37.62, 55.75, 4326))
+
+    def test_not_valid(self):
+        """Not valid coordinates should be ignored."""
+        for latitude, longitude in (
+            (None, '37'), ('abc', '37'), ('91', '37'), ('55', '-181'),
+            ('nan', '37'), ('55', 'inf'),
+        ):
+            self.assertIsNone(make_point(latitude, longitude))
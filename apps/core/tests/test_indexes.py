@@ -0,0 +1,205 @@
+import inspect
+import re
+from decimal import Decimal
+from unittest import skipUnless
+
+import factory
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.core.geo import is_postgis, make_point
+from apps.core.models import OutboxMessage
+from apps.core.querysets import OutboxMessageQuerySet
+from apps.core.search import is_postgresql
+from apps.files.querysets import FileQuerySet
+from apps.masterpieces.factories import MasterpieceFactory
+from apps.masterpieces.models import Masterpiece
+from apps.masterpieces.querysets import MasterpieceQuerySet
+from apps.offers.factories import OfferFactory
+from apps.offers.models import Offer
+from apps.offers.querysets import OfferQuerySet
+from apps.orders.factories import OrderFactory
+from apps.orders.models import Order
+from apps.orders.querysets import OrderQuerySet
+from apps.users.factories import ArtistFactory, CustomerFactory
+from apps.users.managers import UserQuerySet
+from apps.users.models import ArtistStats, User
+
+QUERYSET_CLASSES = (
+    FileQuerySet,
+    MasterpieceQuerySet,
+    OfferQuerySet,
+    OrderQuerySet,
+    OutboxMessageQuerySet,
+    UserQuerySet,
+)
+
+# queryset methods which are expected to be served by indexes, every
+# method is checked with queries built by views and tasks: method name,
+# function returning queryset by test case and names of expected indexes
+INDEXED_QUERIES = (
+    ('OrderQuerySet.all_available', lambda case: (
+        Order.objects.all_available().order_by('-completed_at', '-id')[:10]
+    ), ('orders_open_idx',)),
+    ('OrderQuerySet.all_available', lambda case: (
+        Order.objects.all_available().order_by('-views', '-id')[:10]
+    ), ('orders_open_views_idx',)),
+    ('OrderQuerySet.all_visible_for_customer', lambda case: (
+        Order.objects.all_visible_for_customer(case.customer).order_by(
+            '-completed_at', '-id'
+        )[:10]
+    ), ('orders_customer_idx',)),
+    ('OrderQuerySet.all_accepted_for_artist', lambda case: (
+        Order.objects.all_accepted_for_artist(case.artist)
+    ), ('offers_artist_accepted_idx',)),
+    ('OrderQuerySet.within', lambda case: (
+        Order.objects.within(case.point, 10)
+    ), ('users_location_id',)),
+    ('OfferQuerySet.all_available', lambda case: (
+        Offer.objects.all_available().order_by('-created_at', '-id')
+    ), ('offers_available_idx',)),
+    ('OfferQuerySet.all_visible_for_artist', lambda case: (
+        Offer.objects.all_visible_for_artist(case.artist).order_by(
+            '-created_at', '-id'
+        )
+    ), ('offers_artist_open_idx',)),
+    ('OfferQuerySet.all_visible_for_customer', lambda case: (
+        Offer.objects.all_visible_for_customer(case.customer)
+    ), ('orders_customer_idx',)),
+    ('MasterpieceQuerySet.all_visible', lambda case: (
+        Masterpiece.objects.filter(artist=case.artist).all_visible().order_by(
+            '-created_at', '-id'
+        )
+    ), ('masterpieces_visible_idx',)),
+    ('MasterpieceQuerySet.all_visible_for_artist', lambda case: (
+        Masterpiece.objects.all_visible_for_artist(case.artist).order_by()
+    ), ('masterpieces_visible_idx', 'masterpieces_artist_idx')),
+    ('UserQuerySet.get_artists', lambda case: (
+        User.objects.all().get_artists().order_by('email')
+    ), ('users_role_idx',)),
+    ('UserQuerySet.get_customers', lambda case: (
+        User.objects.all().get_customers().order_by('email')
+    ), ('users_role_idx',)),
+    ('UserQuerySet.with_rating', lambda case: (
+        User.objects.all().with_rating(Decimal(4)).order_by(
+            '-stats_rating', 'id'
+        )[:10]
+    ), ('artist_stats_rating_idx',)),
+    ('UserQuerySet.within', lambda case: (
+        User.objects.within(case.point, 10)
+    ), ('users_location_id',)),
+    ('UserQuerySet.nearest', lambda case: (
+        User.objects.nearest(case.point)[:10]
+    ), ('users_location_id',)),
+    ('OutboxMessageQuerySet.pending', lambda case: (
+        OutboxMessage.objects.pending(3).filter(pk__gt=0)[:100]
+    ), ('outbox_messages_pkey',)),
+)
+
+# methods which are not filters served by indexes with the reasons
+NOT_INDEXED_METHODS = {
+    'OrderQuerySet.all_visible_for_artist': (
+        'condition on joined offer is OR-ed with open orders'
+    ),
+    'MasterpieceQuerySet.all_visible_for_customer': (
+        'condition on joined order is OR-ed with visible masterpieces'
+    ),
+    'OrderQuerySet.search_by_text_lookups': 'substring search',
+    'OfferQuerySet.search_by_text_lookups': 'substring search',
+    'MasterpieceQuerySet.search_by_text_lookups': 'substring search',
+    'OfferQuerySet.full_text_search': 'uses search index of orders',
+    'UserQuerySet.search_by': 'uses trigram indexes',
+    'UserQuerySet.trigram_search': 'uses trigram indexes',
+    'OrderQuerySet.update_status': 'updates given orders',
+    'OrderQuerySet.with_offer_counts': 'annotation',
+    'UserQuerySet.with_artist_stats': 'join by primary key',
+    'UserQuerySet.with_tags': 'subquery per artist',
+    'OutboxMessageQuerySet.enqueue': 'insert',
+    'FileQuerySet.store': 'files are found by unique hash',
+    'FileQuerySet.store_many': 'files are found by unique hash',
+    'FileQuerySet.images': 'suffix search',
+    'FileQuerySet.without_thumbnails': 'used by maintenance commands',
+    'FileQuerySet.with_references': 'annotation',
+    'FileQuerySet.unreferenced': 'used by maintenance commands',
+    'FileQuerySet.visible_with': 'uses querysets of orders and masterpieces',
+    'FileQuerySet.all_visible_for_artist': (
+        'uses querysets of orders and masterpieces'
+    ),
+    'FileQuerySet.all_visible_for_customer': (
+        'uses querysets of orders and masterpieces'
+    ),
+    'OutboxMessageQuerySet.enqueue_many': 'insert',
+}
+
+spatial_indexes = ('users_location_id',)
+
+
+def get_queryset_methods() -> set:
+    """Return names of public methods declared by custom querysets."""
+    return {
+        f'{queryset_class.__name__}.{name}'
+        for queryset_class in QUERYSET_CLASSES
+        for name, value in vars(queryset_class).items()
+        if inspect.isfunction(value) and not name.startswith('_')
+    }
+
+
+def get_used_indexes(plan: str) -> set:
+    """Return names of indexes scanned by query plan."""
+    return set(re.findall(r'Index (?:Only )?Scan(?: Backward)? '
+                          r'(?:using|on) (\w+)', plan))
+
+
+@skipUnless(is_postgresql(), 'Query plans require PostgreSQL.')
+class IndexUsageTest(TestCase):
+    """Tests for indexes used by custom querysets.
+
+    Planner prefers sequential scans of small tables, so they are disabled
+    in the tests: a sequential scan in a plan means there is no index which
+    can serve the query.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create seeded dataset and collect its statistics."""
+        cls.point = make_point(55.75, 37.61)
+        location = cls.point if is_postgis() else None
+        cls.artist = ArtistFactory(location=location)
+        cls.customer = CustomerFactory(location=location)
+        customers = CustomerFactory.create_batch(5)
+        OrderFactory.create_batch(
+            30, created_by=factory.Iterator([cls.customer, *customers])
+        )
+        OfferFactory.create_batch(10, artist=cls.artist)
+        OfferFactory.create_batch(10, declined_at=timezone.now())
+        MasterpieceFactory.create_batch(20)
+        ArtistStats.objects.rebuild()
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        return super().setUpTestData()
+
+    def setUp(self):
+        """Disable sequential scans till the end of test."""
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def test_indexes(self):
+        """Queries of querysets methods should use expected indexes."""
+        for method, get_queryset, indexes in INDEXED_QUERIES:
+            with self.subTest(method, indexes=indexes):
+                if set(indexes) & set(spatial_indexes) and not is_postgis():
+                    self.skipTest('Spatial indexes require PostGIS.')
+                plan = get_queryset(self).explain()
+                self.assertNotIn('Seq Scan', plan)
+                self.assertLessEqual(
+                    set(indexes), get_used_indexes(plan), plan
+                )
+
+    def test_all_methods_checked(self):
+        """Every method of querysets should be checked or excluded."""
+        checked = {method for method, _, _ in INDEXED_QUERIES}
+        self.assertEqual(
+            get_queryset_methods() - checked - set(NOT_INDEXED_METHODS),
+            set(),
+        )
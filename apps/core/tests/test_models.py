@@ -0,0 +1,87 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.masterpieces.factories import MasterpieceFactory
+from apps.masterpieces.models import Masterpiece
+from apps.offers.factories import OfferFactory
+from apps.offers.models import Offer
+from apps.orders.factories import OrderFactory
+from apps.orders.models import Order
+from apps.users.factories import UserFactory
+from apps.users.models import User
+
+
+class DirtyFieldsMixinTest(TestCase):
+    """Tests for saving only changed fields."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create objects of every model with tracked fields."""
+        cls.user = UserFactory()
+        cls.order = OrderFactory()
+        cls.offer = OfferFactory(changes_requested=True)
+        cls.masterpiece = MasterpieceFactory()
+        return super().setUpTestData()
+
+    def test_changed_fields(self):
+        """Only assigned values which differ should be changed."""
+        order = Order.objects.get(pk=self.order.pk)
+        self.assertEqual(order.changed_fields, [])
+        order.title = order.title
+        order.description = 'New description'
+        self.assertEqual(order.changed_fields, ['description'])
+        order.save()
+        self.assertEqual(order.changed_fields, [])
+
+    def test_no_changes(self):
+        """Saving of not changed objects should make no queries."""
+        objects = (
+            User.objects.get(pk=self.user.pk),
+            Order.objects.get(pk=self.order.pk),
+            Offer.objects.get(pk=self.offer.pk),
+            Masterpiece.objects.get(pk=self.masterpiece.pk),
+        )
+        with self.assertNumQueries(0):
+            for obj in objects:
+                obj.save()
+
+    def test_user_save(self):
+        """User save should update one row without selects."""
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = 'Name'
+        with self.assertNumQueries(1):
+            user.save()
+        self.assertEqual(User.objects.get(pk=user.pk).first_name, 'Name')
+
+    def test_order_save(self):
+        """Order save should update changed fields only."""
+        order = Order.objects.get(pk=self.order.pk)
+        order.complete_to += timezone.timedelta(days=1)
+        Order.objects.filter(pk=order.pk).update(description='Changed')
+        with self.assertNumQueries(1):
+            order.save()
+        self.assertEqual(
+            Order.objects.get(pk=order.pk).complete_to, order.complete_to
+        )
+        self.assertEqual(Order.objects.get(pk=order.pk).description, 'Changed')
+
+    def test_offer_save(self):
+        """Changing of fee should reset changes request in one query."""
+        offer = Offer.objects.get(pk=self.offer.pk)
+        offer.fee = 500
+        with self.assertNumQueries(1):
+            offer.save()
+        offer = Offer.objects.get(pk=offer.pk)
+        self.assertEqual(offer.fee, 500)
+        self.assertFalse(offer.changes_requested)
+
+    def test_masterpiece_save(self):
+        """Masterpiece save should not select the stored masterpiece."""
+        masterpiece = Masterpiece.objects.get(pk=self.masterpiece.pk)
+        masterpiece.visible = not masterpiece.visible
+        with self.assertNumQueries(1):
+            masterpiece.save()
+        self.assertEqual(
+            Masterpiece.objects.get(pk=masterpiece.pk).visible,
+            masterpiece.visible,
+        )
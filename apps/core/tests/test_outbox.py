@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.core.models import OutboxMessage
+from apps.core.outbox import (
+    coalesce,
+    enqueue_call,
+    enqueue_task,
+    relay_outbox,
+)
+from apps.users.factories import ArtistFactory
+from apps.users.tasks import send_top_orders
+
+calls = []
+
+
+def handler(*args, **kwargs):
+    calls.append((args, kwargs))
+
+
+def failing_handler():
+    raise ValueError('Handler failed')
+
+
+def leased_handler(pk):
+    calls.append(OutboxMessage.objects.get(pk=pk).locked_until)
+
+
+@coalesce
+def coalesced_handler(ids):
+    calls.append(ids)
+
+
+class InMemoryBroker:
+    """Broker stand-in keeping sent tasks in memory."""
+
+    def __init__(self):
+        self.sent = []
+
+    def send_task(self, name, args=None, kwargs=None):
+        """Remember sent task."""
+        self.sent.append((name, args, kwargs))
+
+
+@override_settings(OUTBOX_BATCH_SIZE=2, OUTBOX_MAX_ATTEMPTS=2)
+class OutboxTest(TestCase):
+    """Tests for dispatching of outbox messages."""
+
+    def setUp(self):
+        """Create broker stand-in."""
+        self.broker = InMemoryBroker()
+        calls.clear()
+
+    def relay(self):
+        """Dispatch outbox messages to the broker stand-in."""
+        return relay_outbox(send_task=self.broker.send_task)
+
+    def test_dispatch(self):
+        """Tasks should be sent and handlers called once."""
+        for number in range(3):
+            enqueue_task('task', number, key='value')
+        enqueue_call(f'{__name__}.handler', 1, key='value')
+
+        self.assertEqual(self.relay(), {'dispatched': 4, 'failed': 0})
+
+        self.assertEqual(self.broker.sent, [
+            ('task', [number], {'key': 'value'}) for number in range(3)
+        ])
+        self.assertEqual(calls, [((1,), {'key': 'value'})])
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(self.relay(), {'dispatched': 0, 'failed': 0})
+
+    def test_rollback(self):
+        """Messages of rolled back transaction should not be dispatched."""
+        with self.assertRaises(ValueError), transaction.atomic():
+            enqueue_task('task')
+            raise ValueError
+        self.relay()
+        self.assertEqual(self.broker.sent, [])
+
+    def test_failed(self):
+        """Failed messages should be kept until max attempts."""
+        message = enqueue_call(f'{__name__}.failing_handler')
+        enqueue_task('task')
+
+        self.assertEqual(self.relay(), {'dispatched': 1, 'failed': 1})
+        message.refresh_from_db()
+        self.assertEqual(message.attempts, 1)
+        self.assertIn('Handler failed', message.last_error)
+
+        self.assertEqual(self.relay(), {'dispatched': 0, 'failed': 1})
+        self.assertEqual(self.relay(), {'dispatched': 0, 'failed': 0})
+        self.assertTrue(OutboxMessage.objects.filter(pk=message.pk).exists())
+
+    def test_coalesced(self):
+        """Pending calls of coalesced handler should be merged into one."""
+        enqueue_call(f'{__name__}.coalesced_handler', [3, 1])
+        enqueue_task('task')
+        enqueue_task('task')
+        enqueue_call(f'{__name__}.coalesced_handler', [2, 3])
+        enqueue_call(f'{__name__}.handler', 1)
+
+        self.assertEqual(self.relay(), {'dispatched': 5, 'failed': 0})
+        self.assertEqual(calls, [[1, 2, 3], ((1,), {})])
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_leased(self):
+        """Messages should be leased before dispatch and skipped till then."""
+        message = enqueue_task('task')
+        OutboxMessage.objects.filter(pk=message.pk).update(
+            locked_until=timezone.now() + timedelta(minutes=1)
+        )
+        self.assertEqual(self.relay(), {'dispatched': 0, 'failed': 0})
+
+        OutboxMessage.objects.filter(pk=message.pk).update(
+            locked_until=timezone.now() - timedelta(minutes=1)
+        )
+        call = enqueue_call(f'{__name__}.leased_handler', 0)
+        OutboxMessage.objects.filter(pk=call.pk).update(
+            payload=OutboxMessage.dump_payload((call.pk,))
+        )
+        self.assertEqual(self.relay(), {'dispatched': 2, 'failed': 0})
+        self.assertGreater(calls[0], timezone.now())
+
+    @override_settings(
+        ORDER_VIEWS_BUFFER_URL=None, TOP_ORDERS_DIGEST_CHUNK_SIZE=2
+    )
+    def test_digest_chunks(self):
+        """Digest chunks should be sent through the outbox."""
+        artists = ArtistFactory.create_batch(3)
+        self.assertEqual(send_top_orders(), 2)
+        self.assertEqual(self.broker.sent, [])
+
+        self.relay()
+        key = self.broker.sent[0][1][1]
+        self.assertEqual(self.broker.sent, [
+            ('send_top_orders_chunk',
+             [[artists[0].pk, artists[1].pk], key], {}),
+            ('send_top_orders_chunk', [[artists[2].pk], key], {}),
+        ])
@@ -0,0 +1,81 @@
+import base64
+import json
+
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.core.paginators import CursorPaginator, InvalidCursor
+from apps.orders.factories import OrderFactory
+from apps.orders.models import Order
+
+
+class CursorPaginatorTest(TestCase):
+    """Tests for keyset paginator."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create completed and open orders."""
+        OrderFactory.create_batch(5)
+        for order in OrderFactory.create_batch(6):
+            order.completed_at = timezone.now()
+            order.save()
+        return super().setUpTestData()
+
+    def setUp(self):
+        """Create paginator ordered with nulls first."""
+        self.paginator = CursorPaginator(
+            Order.objects.all(), 3, ('-completed_at', '-id')
+        )
+        self.expected = list(Order.objects.order_by(
+            F('completed_at').desc(nulls_first=True), '-id'
+        ))
+
+    def test_forward(self):
+        """Pages should follow each other without gaps and repeats."""
+        page = self.paginator.page()
+        self.assertFalse(page.has_previous())
+        objects = list(page)
+        while page.has_next():
+            page = self.paginator.page(page.next_cursor)
+            objects += list(page)
+
+        self.assertEqual(objects, self.expected)
+        self.assertEqual(self.paginator.count, 11)
+
+    def test_backward(self):
+        """Previous cursor should return the previous page."""
+        first = self.paginator.page()
+        second = self.paginator.page(first.next_cursor)
+        third = self.paginator.page(second.next_cursor)
+
+        self.assertEqual(
+            list(self.paginator.page(third.previous_cursor)), list(second)
+        )
+        previous = self.paginator.page(second.previous_cursor)
+        self.assertEqual(list(previous), list(first))
+        self.assertFalse(previous.has_previous())
+
+    def test_without_count(self):
+        """Total count should not be calculated."""
+        paginator = CursorPaginator(
+            Order.objects.all(), 3, ('-id',), with_count=False
+        )
+        with self.assertNumQueries(1):
+            paginator.page()
+            self.assertIsNone(paginator.count)
+
+    def test_invalid_cursor(self):
+        """Broken cursor should raise an error."""
+        with self.assertRaises(InvalidCursor):
+            self.paginator.page('broken')
+
+    def test_invalid_cursor_values(self):
+        """Cursor with values of wrong types should raise an error."""
+        for values in (['yesterday', 1], [None, 'first'], [None, [1]]):
+            cursor = base64.urlsafe_b64encode(json.dumps({
+                'v': values, 'b': False,
+            }).encode()).decode()
+            with self.subTest(values=values):
+                with self.assertRaises(InvalidCursor):
+                    self.paginator.page(cursor)
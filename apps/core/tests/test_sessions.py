@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase
+
+from apps.core.middleware import SessionMiddleware
+from apps.core.sessions import SessionStore, copy_db_sessions
+from apps.users.factories import CustomerFactory
+
+
+class SessionMiddlewareTest(TestCase):
+    """Tests for skipping writes of not changed sessions."""
+
+    def setUp(self):
+        """Create stored session."""
+        self.session = SessionStore()
+        self.session['theme'] = 'dark'
+        self.session.save()
+
+    def get_response(self, value):
+        """Return response of view assigning value to the session."""
+        def view(request):
+            request.session['theme'] = value
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        request.COOKIES['sessionid'] = self.session.session_key
+        with mock.patch.object(SessionStore, 'save') as save:
+            SessionMiddleware(view)(request)
+        return save
+
+    def test_not_changed(self):
+        """Session should not be saved if the same value is assigned."""
+        self.get_response('dark').assert_not_called()
+
+    def test_changed(self):
+        """Session should be saved if its data is changed."""
+        self.get_response('light').assert_called_once()
+
+    def test_login(self):
+        """Login should not write sessions to the database."""
+        client = Client()
+        client.force_login(CustomerFactory())
+        self.assertEqual(200, client.get('/').status_code)
+        self.assertFalse(Session.objects.exists())
+
+
+class CopyDBSessionsTest(TestCase):
+    """Tests for copying of database sessions to the cache."""
+
+    def test_copy(self):
+        """Not expired sessions should be copied with their keys."""
+        session = DBSessionStore()
+        session['user'] = 'artist'
+        session.save()
+        expired = DBSessionStore()
+        expired['user'] = 'customer'
+        expired.set_expiry(-1)
+        expired.save()
+
+        self.assertEqual(copy_db_sessions(batch_size=1), 1)
+        self.assertEqual(SessionStore(session.session_key)['user'], 'artist')
+        self.assertNotIn('user', SessionStore(expired.session_key))
@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase
+
+from apps.core.synthetic import SyntheticData, generate_data
+from apps.masterpieces.models import Masterpiece
+from apps.offers.models import Offer
+from apps.orders.models import Order
+from apps.tags.models import Tag
+from apps.users.models import ArtistStats, User
+
+
+class SyntheticDataTest(TestCase):
+    """Tests for generator of synthetic data."""
+
+    def generate(self, seed=0):
+        """Generate small dataset by chunks."""
+        return generate_data(SyntheticData(
+            seed=seed, users=40, orders=100, offers=250, tags=10,
+            batch_size=30,
+        ))
+
+    def get_rows(self):
+        """Return generated orders and offers."""
+        return (
+            list(Order.objects.order_by('pk').values_list(
+                'pk', 'created_by', 'title', 'created_at', 'status', 'offer',
+                'views',
+            )),
+            list(Offer.objects.order_by('pk').values_list(
+                'pk', 'order', 'artist', 'fee', 'accepted_at', 'declined_at',
+            )),
+            list(Order.tags.through.objects.order_by(
+                'order', 'tag'
+            ).values_list('order', 'tag')),
+        )
+
+    def test_counts(self):
+        """Every table should get requested count of rows."""
+        results = self.generate()
+        self.assertEqual(User.objects.count(), 40)
+        self.assertEqual(Order.objects.count(), 100)
+        self.assertEqual(Offer.objects.count(), 250)
+        self.assertEqual(Tag.objects.count(), 10)
+        self.assertEqual(results['offers'][0], 250)
+        self.assertEqual(
+            results['masterpieces'][0], Masterpiece.objects.count()
+        )
+        self.assertEqual(results['artist_stats'][0], 8)
+
+    def test_invariants(self):
+        """Roles, statuses and artist stats should match generated rows."""
+        self.generate()
+        self.assertFalse(Order.objects.exclude(
+            created_by__role=User.ROLES.CUSTOMER
+        ).exists())
+        self.assertFalse(Offer.objects.exclude(
+            artist__role=User.ROLES.ARTIST
+        ).exists())
+        self.assertFalse(Order.objects.exclude(offer=None).exclude(
+            offer__order=F('pk')
+        ).exists())
+        self.assertFalse(Masterpiece.objects.exclude(
+            artist=F('order__offer__artist')
+        ).exists())
+
+        statuses = dict(Order.objects.values_list('pk', 'status'))
+        Order.objects.update_status()
+        self.assertEqual(dict(Order.objects.values_list('pk', 'status')),
+                         statuses)
+        self.assertEqual(ArtistStats.objects.get_drift(), {})
+
+    def test_deterministic(self):
+        """The same seed should generate the same rows."""
+        self.generate()
+        rows = self.get_rows()
+        User.objects.all().delete()
+        Tag.objects.all().delete()
+        self.generate()
+        self.assertEqual(self.get_rows(), rows)
+
+        User.objects.all().delete()
+        Tag.objects.all().delete()
+        self.generate(seed=1)
+        self.assertNotEqual(self.get_rows(), rows)
+
+    def test_command(self):
+        """Command should print rows per second of tables."""
+        output = StringIO()
+        call_command(
+            'generate_data', users=10, orders=10, offers=20, tags=3,
+            workers=1, stdout=output,
+        )
+        self.assertIn('orders: 10 row(s)', output.getvalue())
+        self.assertEqual(User.objects.all().get_artists().count(), 2)
@@ -1,11 +1,26 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+from django.utils.translation import ugettext_lazy as _
 from django.views.generic import ListView, TemplateView
 from django.views.generic.base import View
 
+from apps.core.cache import (
+    get_cached,
+    get_generations,
+    make_cache_key,
+    set_cached,
+)
+from apps.core.geo import make_point
+from apps.core.paginators import CursorPaginator, InvalidCursor
+
 __all__ = (
     'HomeView',
     'ListSearchView',
     'BaseView',
+    'CachedListMixin',
+    'LocationFilterMixin',
 )
 
 
@@ -16,7 +31,16 @@ class HomeView(TemplateView):
 
 
 class ListSearchView(ListView):
-    """Base view for views with search functionality."""
+    """Base view for views with search functionality.
+
+    If ``cursor_ordering`` is set, pages are paginated by cursor instead of
+    page number. ``cursor_count`` disables counting of all found objects.
+    Ranked search results are ordered by rank first.
+    """
+
+    cursor_ordering = None
+    cursor_count = True
+    cursor_kwarg = 'cursor'
 
     def get_queryset(self):
         """Return filtered by search value queryset."""
@@ -28,6 +52,31 @@ class ListSearchView(ListView):
 
         return qs
 
+    def get_cursor_ordering(self):
+        """Return ordering of cursor pagination."""
+        return self.cursor_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        """Paginate queryset by cursor if cursor ordering is set."""
+        cursor_ordering = self.get_cursor_ordering()
+        if not cursor_ordering:
+            return super().paginate_queryset(queryset, page_size)
+
+        ordering = tuple(cursor_ordering)
+        if 'search_rank' in queryset.query.annotations:
+            ordering = ('-search_rank',) + ordering
+        paginator = CursorPaginator(
+            queryset,
+            page_size,
+            ordering,
+            with_count=self.cursor_count,
+        )
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404(_('Invalid cursor.'))
+        return paginator, page, page.object_list, page.has_other_pages()
+
 
 class BaseView(LoginRequiredMixin, View):
     """Override get_queryset to return only available for user objects."""
@@ -36,3 +85,103 @@ class BaseView(LoginRequiredMixin, View):
         """Return only available for user objects."""
         queryset = super().get_queryset()
         return queryset.available_for_user(self.request.user)
+
+
+class LocationFilterMixin:
+    """Filter objects located within ``?radius=`` km from a point.
+
+    Point is taken from ``?lat=`` and ``?lng=`` or from location of the
+    user. Queryset has to implement ``within(point, radius)``.
+    """
+
+    radius_choices = (5, 25, 100)
+
+    def get_point(self):
+        """Return requested point or users` location."""
+        point = make_point(
+            self.request.GET.get('lat'), self.request.GET.get('lng')
+        )
+        if point is None:
+            return getattr(self.request.user, 'location', None)
+        return point
+
+    def get_radius(self):
+        """Return radius in km or None if it is not valid."""
+        try:
+            radius = float(self.request.GET['radius'])
+        except (KeyError, ValueError):
+            return None
+        return radius if 0 < radius < float('inf') else None
+
+    def get_queryset(self):
+        """Filter objects by radius around the point."""
+        queryset = super().get_queryset()
+        point, radius = self.get_point(), self.get_radius()
+        if point is not None and radius is not None:
+            queryset = queryset.within(point, radius)
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        """Add the point and radius choices to context."""
+        context = super().get_context_data(**kwargs)
+        context['location_point'] = self.get_point()
+        context['radius'] = self.get_radius()
+        context['radius_choices'] = self.radius_choices
+        return context
+
+
+class CachedListMixin:
+    """Cache rendered list of objects with its pagination.
+
+    List is rendered by ``list_template_name`` to ``list_html`` of context.
+    Key depends on view, scope of users seeing the same list, URL kwargs,
+    query and generations of ``cache_models``, so changes of these models
+    make new keys. Objects are not queried if list is cached.
+    """
+
+    cache_models = ()
+    list_template_name = None
+    list_html = None
+
+    def get_cache_scope(self) -> tuple:
+        """Return values of users seeing the same list.
+
+        By default lists are cached for every user separately.
+        """
+        user = self.request.user
+        return getattr(user, 'role', None), user.pk
+
+    def get_cache_key(self) -> str:
+        """Return key of list of current request."""
+        return make_cache_key(
+            self.get_cache_name(),
+            self.get_cache_scope(),
+            sorted(self.kwargs.items()),
+            sorted(self.request.GET.lists()),
+            get_generations(*self.cache_models),
+        )
+
+    def get_cache_name(self) -> str:
+        """Return name of cached list used in keys and stats."""
+        return type(self).__name__
+
+    def get_paginate_by(self, queryset):
+        """Do not paginate objects if list is cached."""
+        if self.list_html is not None:
+            return None
+        return super().get_paginate_by(queryset)
+
+    def get_context_data(self, **kwargs):
+        """Add rendered list to context, it is taken from cache if any."""
+        key = self.get_cache_key()
+        self.list_html = get_cached(self.get_cache_name(), key)
+        if self.list_html is not None:
+            self.object_list = self.object_list.none()
+        context = super().get_context_data(**kwargs)
+        if self.list_html is None:
+            self.list_html = render_to_string(
+                self.list_template_name, context, self.request
+            )
+            set_cached(key, self.list_html)
+        context['list_html'] = mark_safe(self.list_html)
+        return context
@@ -1,12 +1,27 @@
 from django.contrib import admin
 
-from .models import File
+from .models import File, Thumbnail
 
 __all__ = (
     'FileAdmin',
 )
 
 
+class ThumbnailInline(admin.TabularInline):
+    """Thumbnails of file."""
+
+    model = Thumbnail
+    fields = readonly_fields = [
+        'size',
+        'format',
+        'link',
+        'width',
+        'height',
+    ]
+    extra = 0
+    can_delete = False
+
+
 @admin.register(File)
 class FileAdmin(admin.ModelAdmin):
     """File admin.
@@ -16,12 +31,28 @@ class FileAdmin(admin.ModelAdmin):
 
     list_display = [
         'id',
+        'name',
         'link',
+        'size',
+        'created_at',
     ]
     list_display_links = [
         'id',
         'link',
     ]
     search_fields = [
+        'name',
         'link',
+        'sha256',
+    ]
+    readonly_fields = [
+        'sha256',
+        'size',
+        'width',
+        'height',
+        'created_at',
+        'used_at',
+    ]
+    inlines = [
+        ThumbnailInline,
     ]
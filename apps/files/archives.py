@@ -0,0 +1,158 @@
+import logging
+import os
+import zipfile
+from datetime import datetime
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from apps.files.storage import CHUNK_SIZE
+
+__all__ = (
+    'ArchiveEntry',
+    'archive_response',
+    'iter_zip',
+)
+
+logger = logging.getLogger(__name__)
+
+# formats which are not compressed by deflate any more
+COMPRESSED_EXTENSIONS = (
+    '.7z', '.avif', '.gif', '.gz', '.heic', '.jpeg', '.jpg', '.mov', '.mp3',
+    '.mp4', '.png', '.rar', '.webm', '.webp', '.zip',
+)
+# the earliest date which can be stored in ZIP
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+class ArchiveEntry:
+    """File added to archive.
+
+    Attributes:
+        name (str): Name of file in archive.
+        path (str): Path of file to read.
+        size (int): Size of file in bytes.
+        modified_at (datetime): Date when file was changed.
+    """
+
+    def __init__(self, name: str, path: str, size: int = None,
+                 modified_at: datetime = None):
+        self.name = name
+        self.path = path
+        self.size = os.path.getsize(path) if size is None else size
+        self.modified_at = modified_at or datetime.fromtimestamp(
+            os.path.getmtime(path)
+        )
+
+    @classmethod
+    def from_file(cls, file):
+        """Return entry of stored ``File`` named by hash of content.
+
+        Original name is not used: it belongs to whoever uploaded this
+        content first.
+        """
+        name = os.path.basename(file.link.name)
+        if file.sha256:
+            name = file.sha256[:12] + os.path.splitext(name)[1]
+        return cls(
+            name=name,
+            path=file.link.path,
+            size=file.size,
+            modified_at=timezone.localtime(file.created_at),
+        )
+
+    def get_info(self, name: str) -> zipfile.ZipInfo:
+        """Return ZIP header of entry with compression by its format."""
+        date_time = max(self.modified_at.timetuple()[:6], ZIP_EPOCH)
+        info = zipfile.ZipInfo(name, date_time=date_time)
+        info.file_size = self.size
+        info.external_attr = 0o644 << 16
+        compressed = name.lower().endswith(COMPRESSED_EXTENSIONS)
+        info.compress_type = (
+            zipfile.ZIP_STORED if compressed else zipfile.ZIP_DEFLATED
+        )
+        return info
+
+
+class _Stream:
+    """Write only stream keeping bytes until they are taken."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        """Return written bytes and forget them."""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(entries, chunk_size: int = CHUNK_SIZE):
+    """Yield ZIP archive of entries by chunks.
+
+    Files are read by ``chunk_size`` bytes and written bytes are yielded
+    at once, so memory does not depend on size of archive. Sizes of
+    entries are written after their data, so archive is never seeked.
+    Equal names are numbered.
+    """
+    return filter(None, _iter_zip(entries, chunk_size))
+
+
+def _iter_zip(entries, chunk_size):
+    stream = _Stream()
+    names = set()
+    with zipfile.ZipFile(stream, 'w') as archive:
+        for entry in entries:
+            name = _unique_name(entry.name, names)
+            with open(entry.path, 'rb') as source:
+                with archive.open(entry.get_info(name), 'w') as target:
+                    chunk = source.read(chunk_size)
+                    while chunk:
+                        target.write(chunk)
+                        yield stream.take()
+                        chunk = source.read(chunk_size)
+            yield stream.take()
+    yield stream.take()
+
+
+def archive_response(files, filename: str):
+    """Return response streaming ZIP archive of ``File`` objects.
+
+    Files with missing blobs are skipped before streaming starts, so
+    archive is never truncated.
+    """
+    entries = []
+    for file in files:
+        if not file.link.storage.exists(file.link.name):
+            logger.warning('Blob of file %s is missing', file.pk)
+            continue
+        entries.append(ArchiveEntry.from_file(file))
+    response = StreamingHttpResponse(
+        iter_zip(entries),
+        content_type='application/zip',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _unique_name(name: str, names: set) -> str:
+    """Return name numbered if it is already in names and remember it."""
+    root, extension = os.path.splitext(name)
+    number = 1
+    while name in names:
+        number += 1
+        name = f'{root} ({number}){extension}'
+    names.add(name)
+    return name
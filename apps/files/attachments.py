@@ -0,0 +1,32 @@
+from django.db import transaction
+
+from apps.files.models import File
+
+__all__ = (
+    'attach_files',
+)
+
+
+def attach_files(instance, uploads, field_name: str = 'files') -> list:
+    """Store uploads and attach them to files field of instance atomically.
+
+    Whatever count of uploads is, files are selected and inserted by one
+    query each and links to instance are inserted by one more.
+    """
+    uploads = list(uploads)
+    if not uploads:
+        return []
+    field = instance._meta.get_field(field_name)
+    through = field.remote_field.through
+    source = through._meta.get_field(field.m2m_field_name()).attname
+    target = through._meta.get_field(field.m2m_reverse_field_name()).attname
+    with transaction.atomic():
+        files = File.objects.store_many(uploads)
+        through.objects.bulk_create(
+            [
+                through(**{source: instance.pk, target: file.pk})
+                for file in dict.fromkeys(files)
+            ],
+            ignore_conflicts=True,
+        )
+    return files
@@ -0,0 +1,79 @@
+import os
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.files.models import File, Thumbnail
+from apps.files.storage import BLOBS_DIR
+
+__all__ = (
+    'collect_files',
+)
+
+
+def collect_files(grace_period: timedelta, dry_run: bool = False) -> dict:
+    """Delete files not referenced by orders and masterpieces.
+
+    Thumbnails of deleted files are deleted with them as orphan blobs.
+    Files stored and blobs written within grace period are kept: they can
+    be just uploaded and not attached yet. Returns counts of deleted rows
+    and blobs.
+    """
+    cutoff = timezone.now() - grace_period
+    storage = File._meta.get_field('link').storage
+
+    files = File.objects.unreferenced().filter(used_at__lt=cutoff)
+    if dry_run:
+        deleted_files = files.count()
+    else:
+        deleted_files = sum(
+            _delete_unreferenced(pk, cutoff, storage)
+            for pk in list(files.values_list('pk', flat=True))
+        )
+
+    linked = set(File.objects.values_list('link', flat=True).iterator())
+    linked.update(Thumbnail.objects.values_list('link', flat=True).iterator())
+    deleted_blobs = 0
+    for name in _walk_blobs(storage):
+        if name in linked:
+            continue
+        modified_at = storage.get_modified_time(name)
+        if modified_at >= cutoff:
+            continue
+        if not dry_run:
+            storage.delete(name)
+        deleted_blobs += 1
+    return {'files': deleted_files, 'blobs': deleted_blobs}
+
+
+def _delete_unreferenced(pk: int, cutoff, storage) -> bool:
+    """Delete file and its blob if it is still not used.
+
+    Row is locked before references are checked again: file could be
+    stored or attached since it was selected.
+    """
+    with transaction.atomic():
+        file = File.objects.select_for_update().filter(
+            pk=pk, used_at__lt=cutoff
+        ).first()
+        if file is None or not File.objects.filter(
+            pk=pk
+        ).unreferenced().exists():
+            return False
+        name = file.link.name
+        file.delete()
+        # blob is deleted while row is locked, concurrent store of the
+        # same content waits for commit and writes the blob again
+        if name and storage.exists(name):
+            storage.delete(name)
+    return True
+
+
+def _walk_blobs(storage):
+    """Yield names of all blobs in storage."""
+    root = storage.path(BLOBS_DIR)
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            yield os.path.relpath(path, storage.location).replace(os.sep, '/')
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.files.collection import collect_files
+
+
+class Command(BaseCommand):
+    """Delete files and blobs which are not used anymore."""
+
+    help = 'Delete files not used by orders and masterpieces.'
+
+    def add_arguments(self, parser):
+        """Add collection options."""
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count files which would be deleted.',
+        )
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=24,
+            help='Keep files stored less than this hours ago.',
+        )
+
+    def handle(self, *args, dry_run=False, grace_hours=24, **options):
+        """Delete unreferenced files and orphan blobs."""
+        counts = collect_files(
+            timedelta(hours=grace_hours), dry_run=dry_run
+        )
+        prefix = 'Would delete' if dry_run else 'Deleted'
+        self.stdout.write(
+            f'{prefix} {counts["files"]} file(s), '
+            f'{counts["blobs"]} orphan blob(s).'
+        )
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.files.models import File
+from apps.files.thumbnails import generate_thumbnails
+
+
+class Command(BaseCommand):
+    """Generate thumbnails of images which have no thumbnails yet."""
+
+    help = 'Generate thumbnails of uploaded images.'
+
+    def add_arguments(self, parser):
+        """Add generation options."""
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Generate thumbnails again for all images.',
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            help='Count of processes rendering images.',
+        )
+
+    def handle(self, *args, force=False, processes=None, **options):
+        """Generate thumbnails and print speed."""
+        started_at = time.monotonic()
+        counts = generate_thumbnails(
+            File.objects.all(), processes=processes, force=force
+        )
+        elapsed = time.monotonic() - started_at
+        self.stdout.write(
+            f'Generated thumbnails of {counts["generated"]} image(s), '
+            f'failed {counts["failed"]} in {elapsed:.1f}s.'
+        )
@@ -0,0 +1,77 @@
+# Generated by Django 3.0.8 on 2020-09-21 12:40
+
+import apps.files.storage
+from apps.files.storage import hash_content
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def hash_files(apps, schema_editor):
+    """Record hash of stored files and merge files with equal content."""
+    File = apps.get_model('files', 'File')
+    through_models = (
+        (apps.get_model('orders', 'Order').files.through, 'order_id'),
+        (apps.get_model('masterpieces', 'Masterpiece').files.through,
+         'masterpiece_id'),
+    )
+    stored = {}
+    for file in File.objects.order_by('pk').iterator():
+        name = file.link.name
+        if not name or not default_storage.exists(name):
+            continue
+        with default_storage.open(name) as content:
+            sha256, size = hash_content(content)
+        original = stored.get(sha256)
+        if original is None:
+            stored[sha256] = file.pk
+            File.objects.filter(pk=file.pk).update(
+                sha256=sha256, size=size, name=name.rsplit('/', 1)[-1],
+            )
+            continue
+        for through, owner in through_models:
+            owners = through.objects.filter(file_id=original).values(owner)
+            through.objects.filter(
+                file_id=file.pk, **{f'{owner}__in': owners}
+            ).delete()
+            through.objects.filter(file_id=file.pk).update(file_id=original)
+        File.objects.filter(pk=file.pk).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('files', '0001_initial'),
+        ('orders', '0006_order_recommendations'),
+        ('masterpieces', '0003_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='file',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now, verbose_name='Created at'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='file',
+            name='name',
+            field=models.CharField(blank=True, max_length=255, verbose_name='Name'),
+        ),
+        migrations.AddField(
+            model_name='file',
+            name='sha256',
+            field=models.CharField(editable=False, max_length=64, null=True, unique=True, verbose_name='SHA-256'),
+        ),
+        migrations.AddField(
+            model_name='file',
+            name='size',
+            field=models.BigIntegerField(editable=False, null=True, verbose_name='Size'),
+        ),
+        migrations.AlterField(
+            model_name='file',
+            name='link',
+            field=models.FileField(max_length=255, storage=apps.files.storage.ContentAddressedStorage(), upload_to=apps.files.storage.blob_path),
+        ),
+        migrations.RunPython(hash_files, migrations.RunPython.noop),
+    ]
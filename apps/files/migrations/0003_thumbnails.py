@@ -0,0 +1,47 @@
+# Generated by Django 3.0.8 on 2020-09-22 11:15
+
+import apps.files.storage
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('files', '0002_content_addressed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='file',
+            name='height',
+            field=models.PositiveIntegerField(editable=False, null=True, verbose_name='Height'),
+        ),
+        migrations.AddField(
+            model_name='file',
+            name='width',
+            field=models.PositiveIntegerField(editable=False, null=True, verbose_name='Width'),
+        ),
+        migrations.CreateModel(
+            name='Thumbnail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('size', models.CharField(max_length=20, verbose_name='Size')),
+                ('format', models.CharField(choices=[('webp', 'WebP'), ('jpeg', 'JPEG')], max_length=4, verbose_name='Format')),
+                ('link', models.FileField(max_length=255, storage=apps.files.storage.ContentAddressedStorage(), upload_to='')),
+                ('width', models.PositiveIntegerField(verbose_name='Width')),
+                ('height', models.PositiveIntegerField(verbose_name='Height')),
+                ('file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='thumbnails', to='files.File', verbose_name='File')),
+            ],
+            options={
+                'verbose_name': 'Thumbnail',
+                'verbose_name_plural': 'Thumbnails',
+                'db_table': 'file_thumbnails',
+                'ordering': ('file_id', 'width'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='thumbnail',
+            constraint=models.UniqueConstraint(fields=('file', 'size', 'format'), name='file_thumbnails_unique'),
+        ),
+    ]
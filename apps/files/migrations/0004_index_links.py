@@ -0,0 +1,24 @@
+# Generated by Django 3.0.8 on 2020-09-23 10:20
+
+import apps.files.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('files', '0003_thumbnails'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='file',
+            name='link',
+            field=models.FileField(db_index=True, max_length=255, storage=apps.files.storage.ContentAddressedStorage(), upload_to=apps.files.storage.blob_path),
+        ),
+        migrations.AlterField(
+            model_name='thumbnail',
+            name='link',
+            field=models.FileField(db_index=True, max_length=255, storage=apps.files.storage.ContentAddressedStorage(), upload_to=''),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.0.8 on 2020-09-26 10:15
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def fill_used_at(apps, schema_editor):
+    """Count usage of existing files from their upload."""
+    File = apps.get_model('files', 'File')
+    File.objects.using(schema_editor.connection.alias).update(
+        used_at=models.F('created_at')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('files', '0004_index_links'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='file',
+            name='used_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Used at'),
+        ),
+        migrations.RunPython(fill_used_at, migrations.RunPython.noop),
+    ]
@@ -1,26 +1,183 @@
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
+from apps.core.outbox import enqueue_task
+from apps.files.querysets import FileQuerySet
+from apps.files.storage import (
+    ContentAddressedStorage,
+    blob_path,
+    hash_content,
+    is_image,
+)
+
 __all__ = (
     'File',
+    'Thumbnail',
 )
 
 
 class File(models.Model):
     """File model.
 
+    Content is stored once: blob is named by SHA-256 of content, files with
+    equal content are the same object.
+
     Attributes:
         link (str): File link.
+        name (str): Name of the first uploaded file with this content.
+        sha256 (str): SHA-256 hex digest of content.
+        size (int): Size of content in bytes.
+        width (int): Width of image in pixels.
+        height (int): Height of image in pixels.
+        created_at (datetime): Date when file was uploaded.
+        used_at (datetime): Date when file was stored last time.
     """
 
     link = models.FileField(
-        upload_to='upload_files/'
+        upload_to=blob_path,
+        storage=ContentAddressedStorage(),
+        max_length=255,
+        db_index=True,
+    )
+    name = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('Name'),
+    )
+    sha256 = models.CharField(
+        max_length=64,
+        unique=True,
+        null=True,
+        editable=False,
+        verbose_name=_('SHA-256'),
+    )
+    size = models.BigIntegerField(
+        null=True,
+        editable=False,
+        verbose_name=_('Size'),
+    )
+    width = models.PositiveIntegerField(
+        null=True,
+        editable=False,
+        verbose_name=_('Width'),
+    )
+    height = models.PositiveIntegerField(
+        null=True,
+        editable=False,
+        verbose_name=_('Height'),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Created at'),
     )
+    used_at = models.DateTimeField(
+        default=timezone.now,
+        editable=False,
+        verbose_name=_('Used at'),
+    )
+    objects = FileQuerySet.as_manager()
 
     class Meta:
         db_table = 'files'
         verbose_name = _('File')
         verbose_name_plural = _('Files')
 
+    def __str__(self):
+        return self.name or str(self.link)
+
+    def hash_upload(self):
+        """Record hash, size and name of not saved uploaded content."""
+        if self.sha256 is None and self.link and not self.link._committed:
+            self.sha256, self.size = hash_content(self.link)
+            self.name = self.name or self.link.name
+
+    def clean(self):
+        """Check if the same content is not stored yet."""
+        self.hash_upload()
+        if File.objects.filter(sha256=self.sha256).exclude(
+            pk=self.pk
+        ).exists():
+            raise ValidationError(_('File with this content already exists.'))
+
+    def save(self, *args, **kwargs):
+        """Save file method.
+
+        Hash of uploaded content is recorded before saving of blob,
+        thumbnails of new images are generated in background.
+        """
+        adding = self._state.adding
+        self.hash_upload()
+        super().save(*args, **kwargs)
+        if adding and self.is_image:
+            enqueue_task('generate_thumbnails', [self.pk])
+
+    @property
+    def is_image(self):
+        """Return True if file is an image by its extension."""
+        return is_image(self.link.name)
+
+
+class Thumbnail(models.Model):
+    """Thumbnail of image file.
+
+    Attributes:
+        file (File): Original image.
+        size (str): Name of size from ``FILE_THUMBNAIL_SIZES`` setting.
+        format (str): Image format.
+        link (str): Thumbnail link, stored next to the original.
+        width (int): Width of thumbnail in pixels.
+        height (int): Height of thumbnail in pixels.
+    """
+
+    class Format(models.TextChoices):
+        WEBP = 'webp', _('WebP')
+        JPEG = 'jpeg', _('JPEG')
+
+    file = models.ForeignKey(
+        File,
+        on_delete=models.CASCADE,
+        related_name='thumbnails',
+        verbose_name=_('File'),
+    )
+    size = models.CharField(
+        max_length=20,
+        verbose_name=_('Size'),
+    )
+    format = models.CharField(
+        max_length=4,
+        choices=Format.choices,
+        verbose_name=_('Format'),
+    )
+    link = models.FileField(
+        storage=ContentAddressedStorage(),
+        max_length=255,
+        db_index=True,
+    )
+    width = models.PositiveIntegerField(
+        verbose_name=_('Width'),
+    )
+    height = models.PositiveIntegerField(
+        verbose_name=_('Height'),
+    )
+
+    class Meta:
+        db_table = 'file_thumbnails'
+        ordering = ('file_id', 'width')
+        verbose_name = _('Thumbnail')
+        verbose_name_plural = _('Thumbnails')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('file', 'size', 'format'),
+                name='file_thumbnails_unique',
+            ),
+        )
+
     def __str__(self):
         return str(self.link)
+
+    @property
+    def content_type(self):
+        """Return MIME type of thumbnail."""
+        return f'image/{self.format}'
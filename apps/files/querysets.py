@@ -0,0 +1,113 @@
+from functools import reduce
+from operator import or_
+
+from django.db import models
+from django.utils import timezone
+
+from apps.core.outbox import enqueue_task
+from apps.core.querysets import UserRoleRelatedQuerySetMixin
+from apps.files.storage import IMAGE_EXTENSIONS, hash_content, is_image
+
+__all__ = (
+    'FileQuerySet',
+)
+
+
+class FileQuerySet(UserRoleRelatedQuerySetMixin, models.QuerySet):
+    """Custom queryset of stored files."""
+
+    def store(self, upload):
+        """Return file with content of upload, save it if it is new."""
+        return self.store_many([upload])[0]
+
+    def store_many(self, uploads) -> list:
+        """Return files with content of uploads in the same order.
+
+        Content is hashed in chunks, blobs of already stored content are not
+        written again. New files are inserted by one query, thumbnails of
+        new images are generated in background.
+
+        Stored files are touched by update first, so their rows stay locked
+        until transaction of caller ends and files can't be collected
+        before they are attached.
+        """
+        uploads = list(uploads)
+        hashes = [hash_content(upload) for upload in uploads]
+        digests = {sha256 for sha256, _ in hashes}
+        self.filter(sha256__in=digests).update(used_at=timezone.now())
+        stored = {
+            file.sha256: file for file in self.filter(sha256__in=digests)
+        }
+
+        new_files = {}
+        for upload, (sha256, size) in zip(uploads, hashes):
+            if sha256 in stored or sha256 in new_files:
+                continue
+            file = self.model(sha256=sha256, size=size, name=upload.name)
+            file.link.save(upload.name, upload, save=False)
+            new_files[sha256] = file
+        if new_files:
+            # the same content can be stored concurrently, so primary keys
+            # of inserted rows are selected again
+            self.bulk_create(new_files.values(), ignore_conflicts=True)
+            stored.update(
+                (file.sha256, file)
+                for file in self.filter(sha256__in=new_files)
+            )
+            images_ids = [
+                stored[sha256].pk for sha256, file in new_files.items()
+                if is_image(file.link.name)
+            ]
+            if images_ids:
+                enqueue_task('generate_thumbnails', images_ids)
+        return [stored[sha256] for sha256, _ in hashes]
+
+    def images(self):
+        """Return files with extensions of images."""
+        return self.filter(reduce(or_, (
+            models.Q(link__iendswith=extension)
+            for extension in IMAGE_EXTENSIONS
+        )))
+
+    def without_thumbnails(self):
+        """Return files which have no thumbnails yet."""
+        return self.filter(thumbnails__isnull=True)
+
+    def all_visible_for_customer(self, customer):
+        """Return files of orders and masterpieces visible for customer."""
+        return self.visible_with('all_visible_for_customer', customer)
+
+    def all_visible_for_artist(self, artist):
+        """Return files of orders and masterpieces visible for artist."""
+        return self.visible_with('all_visible_for_artist', artist)
+
+    def visible_with(self, method: str, user):
+        """Return files of objects visible for user.
+
+        Orders and masterpieces are filtered by queryset ``method``, file is
+        visible if any of its objects is.
+        """
+        conditions = {}
+        for relation in ('orders', 'masterpieces'):
+            objects = self.model._meta.get_field(relation).related_model
+            conditions[f'visible_in_{relation}'] = models.Exists(
+                getattr(objects.objects, method)(user).filter(
+                    files=models.OuterRef('pk')
+                )
+            )
+        return self.annotate(**conditions).filter(reduce(or_, (
+            models.Q(**{name: True}) for name in conditions
+        )))
+
+    def with_references(self):
+        """Annotate count of orders and masterpieces using files."""
+        return self.annotate(
+            references=(
+                models.Count('orders', distinct=True) +
+                models.Count('masterpieces', distinct=True)
+            )
+        )
+
+    def unreferenced(self):
+        """Return files which are not used by any order or masterpiece."""
+        return self.with_references().filter(references=0)
@@ -0,0 +1,145 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from apps.files.storage import CHUNK_SIZE
+
+__all__ = (
+    'RangeNotSatisfiable',
+    'get_range',
+    'serve_file',
+)
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    """Requested range is out of file."""
+
+
+def serve_file(request, storage, name: str):
+    """Return response with stored file.
+
+    Transfer is passed to the front proxy by ``X-Accel-Redirect`` (nginx)
+    or ``X-Sendfile`` (apache) if ``MEDIA_SENDFILE_BACKEND`` is set, the
+    proxy handles ranges and conditional requests itself. Otherwise file is
+    sent by Django with support of them.
+    """
+    content_type = (
+        mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    )
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    if backend == 'nginx':
+        response = HttpResponse(content_type=content_type)
+        response['X-Accel-Redirect'] = (
+            f'{settings.MEDIA_ACCEL_REDIRECT_URL}{quote(name)}'
+        )
+    elif backend == 'apache':
+        response = HttpResponse(content_type=content_type)
+        response['X-Sendfile'] = storage.path(name)
+    else:
+        response = _file_response(request, storage.path(name), content_type)
+    # files are protected, so they are cached by browsers only
+    patch_cache_control(
+        response, private=True, max_age=settings.MEDIA_CACHE_MAX_AGE
+    )
+    return response
+
+
+def get_range(request, size: int, etag: str, last_modified: str):
+    """Return first and last byte of requested range.
+
+    None is returned if the whole file should be sent: range is not
+    requested, ``If-Range`` does not match or range is not a single one.
+    """
+    header = request.META.get('HTTP_RANGE')
+    if not header:
+        return None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range and if_range not in (etag, last_modified):
+        return None
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first:
+        # suffix range of the last bytes
+        if not last:
+            return None
+        if int(last) == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - int(last), 0), size - 1
+    first = int(first)
+    if last and int(last) < first:
+        return None
+    if first >= size:
+        raise RangeNotSatisfiable
+    return first, min(int(last), size - 1) if last else size - 1
+
+
+def _file_response(request, path: str, content_type: str):
+    """Return file response answering conditional and range requests."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404
+    etag = quote_etag(f'{int(stat.st_mtime):x}-{stat.st_size:x}')
+    last_modified = http_date(stat.st_mtime)
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is None:
+        try:
+            byte_range = get_range(request, stat.st_size, etag, last_modified)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+            return response
+        response = _range_response(
+            path, byte_range, stat.st_size, content_type
+        )
+    response['ETag'] = etag
+    response['Last-Modified'] = last_modified
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def _range_response(path: str, byte_range, size: int, content_type: str):
+    """Return response with the whole file or its range."""
+    file = open(path, 'rb')
+    if byte_range is None:
+        return FileResponse(file, content_type=content_type)
+    first, last = byte_range
+    file.seek(first)
+    response = StreamingHttpResponse(
+        _read(file, last - first + 1),
+        status=206,
+        content_type=content_type,
+    )
+    response['Content-Length'] = last - first + 1
+    response['Content-Range'] = f'bytes {first}-{last}/{size}'
+    return response
+
+
+def _read(file, length: int):
+    """Yield chunks of ``length`` bytes of file and close it."""
+    with file:
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+__all__ = (
+    'ContentAddressedStorage',
+    'blob_path',
+    'hash_content',
+    'is_image',
+    'thumbnail_path',
+)
+
+BLOBS_DIR = 'upload_files'
+CHUNK_SIZE = 64 * 1024
+IMAGE_EXTENSIONS = (
+    '.bmp', '.gif', '.jpeg', '.jpg', '.png', '.tif', '.tiff', '.webp',
+)
+
+
+def hash_content(content) -> tuple:
+    """Return SHA-256 hex digest and size of file read in chunks."""
+    hasher = hashlib.sha256()
+    size = 0
+    content.seek(0)
+    for chunk in content.chunks(CHUNK_SIZE):
+        hasher.update(chunk)
+        size += len(chunk)
+    content.seek(0)
+    return hasher.hexdigest(), size
+
+
+def blob_path(instance, filename: str) -> str:
+    """Return path of blob named by hash of content, extension is kept."""
+    extension = os.path.splitext(filename)[1].lower()
+    return os.path.join(
+        BLOBS_DIR, instance.sha256[:2], f'{instance.sha256}{extension}'
+    )
+
+
+def thumbnail_path(name: str, size: str, extension: str) -> str:
+    """Return path of thumbnail stored next to the original blob."""
+    return f'{os.path.splitext(name)[0]}_{size}.{extension}'
+
+
+def is_image(name: str) -> bool:
+    """Return True if file name has extension of image."""
+    return os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """File system storage of blobs named by hash of their content.
+
+    Names are never changed to available ones: saving under existing name
+    keeps stored blob without writing. New blob is written to a temporary
+    file and moved, so concurrent saves of the same content are safe.
+    Files named not by their content, such as thumbnails, are written by
+    ``replace``.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        """Return name as is, equal names have equal content."""
+        return name
+
+    def _save(self, name, content):
+        if self.exists(name):
+            return name
+        return self._write(name, content)
+
+    def replace(self, name: str, content) -> str:
+        """Write content under name even if the name exists.
+
+        Stored file is replaced at once, readers get old or new content.
+        """
+        return self._write(name, content)
+
+    def _write(self, name, content):
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        if self.directory_permissions_mode is not None:
+            old_umask = os.umask(0)
+            try:
+                os.makedirs(
+                    directory, self.directory_permissions_mode, exist_ok=True
+                )
+            finally:
+                os.umask(old_umask)
+        else:
+            os.makedirs(directory, exist_ok=True)
+
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=directory, suffix='.tmp'
+        )
+        try:
+            with os.fdopen(descriptor, 'wb') as temporary:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    temporary.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(temporary_path, self.file_permissions_mode)
+            os.replace(temporary_path, full_path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        return name
@@ -0,0 +1,10 @@
+from celery.decorators import task
+
+from .models import File
+from .thumbnails import generate_thumbnails
+
+
+@task(name='generate_thumbnails')
+def generate_thumbnails_task(files_ids):
+    """Generate thumbnails of uploaded images."""
+    return generate_thumbnails(File.objects.filter(pk__in=files_ids))
@@ -0,0 +1,38 @@
+from django import template
+from django.conf import settings
+
+register = template.Library()
+
+
+@register.inclusion_tag('components/thumbnail.html')
+def thumbnail(file, size='medium'):
+    """Render link to file with picture of its thumbnail.
+
+    Every format lists thumbnails of all sizes, so browser picks the one
+    sharp enough for ``size`` on its screen. Files without thumbnails are
+    rendered as plain links. Prefetch ``thumbnails`` of files to avoid a
+    query per file.
+    """
+    thumbnails = file.thumbnails.all()
+    sources = []
+    for image_format in settings.FILE_THUMBNAIL_FORMATS:
+        variants = [
+            thumbnail for thumbnail in thumbnails
+            if thumbnail.format == image_format
+        ]
+        if variants:
+            sources.append({
+                'type': variants[0].content_type,
+                'srcset': ', '.join(
+                    f'{variant.link.url} {variant.width}w'
+                    for variant in variants
+                ),
+            })
+    # the last format is the most supported one, it is used as fallback
+    image = next((
+        thumbnail
+        for image_format in reversed(settings.FILE_THUMBNAIL_FORMATS)
+        for thumbnail in thumbnails
+        if thumbnail.size == size and thumbnail.format == image_format
+    ), None)
+    return {'file': file, 'sources': sources, 'image': image}
@@ -0,0 +1,129 @@
+import io
+import os
+import zipfile
+
+from django.core.files.base import ContentFile
+from django.test import Client
+
+from apps.files.archives import ArchiveEntry, iter_zip
+from apps.files.models import File
+from apps.files.tests.test_models import StoredFileTestCase
+from apps.masterpieces.factories import MasterpieceFactory
+from apps.orders.factories import OrderFactory
+from apps.users.factories import CustomerFactory
+
+client = Client()
+
+
+class IterZipTest(StoredFileTestCase):
+    """Tests for streaming ZIP archives."""
+
+    def add_entry(self, name, content):
+        """Write file and return its entry."""
+        path = os.path.join(self.media_root, name)
+        with open(path, 'wb') as file:
+            file.write(content)
+        return ArchiveEntry(name, path)
+
+    def test_archive(self):
+        """Streamed archive should contain all files."""
+        entries = [
+            self.add_entry('photo.JPG', b'jpeg' * 100),
+            self.add_entry('sketch.psd', b'psd' * 100),
+        ]
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(iter_zip(entries))))
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.read('photo.JPG'), b'jpeg' * 100)
+        self.assertEqual(archive.read('sketch.psd'), b'psd' * 100)
+        self.assertEqual(
+            archive.getinfo('photo.JPG').compress_type, zipfile.ZIP_STORED
+        )
+        self.assertEqual(
+            archive.getinfo('sketch.psd').compress_type, zipfile.ZIP_DEFLATED
+        )
+
+    def test_chunks(self):
+        """Archive should be yielded by chunks not larger than read ones."""
+        entry = self.add_entry('photo.jpg', os.urandom(10 * 1024))
+        chunks = list(iter_zip([entry], chunk_size=1024))
+        self.assertGreaterEqual(len(chunks), 10)
+        self.assertLess(max(map(len, chunks)), 2 * 1024)
+
+    def test_equal_names(self):
+        """Files with equal names should be numbered."""
+        entry = self.add_entry('a.txt', b'a')
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(iter_zip([
+            entry, entry, entry,
+        ]))))
+        self.assertEqual(
+            archive.namelist(), ['a.txt', 'a (2).txt', 'a (3).txt']
+        )
+
+
+class FilesArchiveViewTest(StoredFileTestCase):
+    """Tests for downloading all files of order or masterpiece."""
+
+    def setUp(self):
+        """Create order and masterpiece with files."""
+        super().setUp()
+        self.files = File.objects.store_many([
+            ContentFile(b'a', name='a.txt'), ContentFile(b'b', name='b.txt'),
+        ])
+        self.order = OrderFactory()
+        self.order.files.add(*self.files)
+        self.masterpiece = MasterpieceFactory(
+            visible=False, order__created_by=self.order.created_by
+        )
+        self.masterpiece.files.add(self.files[0])
+
+    def name(self, file):
+        """Return name of file in archive."""
+        return f'{file.sha256[:12]}.txt'
+
+    def get_archive(self, url):
+        """Return response and names in downloaded archive."""
+        response = client.get(url)
+        if response.status_code != 200:
+            return response, None
+        archive = zipfile.ZipFile(
+            io.BytesIO(b''.join(response.streaming_content))
+        )
+        return response, archive.namelist()
+
+    def test_order_files(self):
+        """Customer should download all files of his order."""
+        client.force_login(self.order.created_by)
+        response, names = self.get_archive(
+            f'/orders/{self.order.pk}/files.zip'
+        )
+        self.assertEqual(names, [self.name(file) for file in self.files])
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertEqual(
+            response['Content-Disposition'],
+            f'attachment; filename="order-{self.order.pk}.zip"',
+        )
+
+    def test_masterpiece_files(self):
+        """Customer should download files of masterpiece for his order."""
+        client.force_login(self.order.created_by)
+        names = self.get_archive(
+            f'/masterpieces/{self.masterpiece.pk}/files.zip'
+        )[1]
+        self.assertEqual(names, [self.name(self.files[0])])
+
+    def test_missing_blob(self):
+        """Files with missing blobs should be skipped."""
+        os.remove(self.files[0].link.path)
+        client.force_login(self.order.created_by)
+        with self.assertLogs('apps.files.archives', 'WARNING'):
+            names = self.get_archive(f'/orders/{self.order.pk}/files.zip')[1]
+        self.assertEqual(names, [self.name(self.files[1])])
+
+    def test_not_available(self):
+        """Files of not available objects should not be downloaded."""
+        client.force_login(CustomerFactory())
+        for url in (
+            f'/orders/{self.order.pk}/files.zip',
+            f'/masterpieces/{self.masterpiece.pk}/files.zip',
+        ):
+            self.assertEqual(self.get_archive(url)[0].status_code, 404)
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.files.attachments import attach_files
+from apps.files.models import File
+from apps.files.tests.test_models import StoredFileTestCase
+from apps.masterpieces.factories import MasterpieceFactory
+from apps.orders.factories import OrderFactory
+from apps.orders.models import Order
+from apps.users.factories import CustomerFactory
+
+client = Client()
+
+
+def make_uploads(count, prefix=b''):
+    """Return uploads with different content."""
+    return [
+        ContentFile(prefix + str(number).encode(), name=f'{number}.png')
+        for number in range(count)
+    ]
+
+
+class AttachFilesTest(StoredFileTestCase):
+    """Tests for bulk attaching of uploaded files."""
+
+    def count_queries(self, instance, uploads):
+        """Return count of queries made to attach uploads."""
+        with CaptureQueriesContext(connection) as queries:
+            attach_files(instance, uploads)
+        return len(queries)
+
+    def test_attach(self):
+        """Uploads should be stored and attached in the given order."""
+        order = OrderFactory()
+        files = attach_files(order, make_uploads(3))
+        self.assertEqual([file.name for file in files], [
+            '0.png', '1.png', '2.png',
+        ])
+        self.assertEqual(set(order.files.all()), set(files))
+
+    def test_queries_not_depend_on_count(self):
+        """Count of queries should not depend on count of uploads."""
+        single = self.count_queries(OrderFactory(), make_uploads(1))
+        many = self.count_queries(MasterpieceFactory(), make_uploads(30, b'x'))
+        self.assertEqual(single, many)
+
+    def test_attach_stored_content(self):
+        """Stored and repeated content should be attached once."""
+        order = OrderFactory()
+        attach_files(order, make_uploads(2))
+        attach_files(order, make_uploads(3) + make_uploads(1))
+        self.assertEqual(File.objects.count(), 3)
+        self.assertEqual(order.files.count(), 3)
+
+    def test_create_order_with_files(self):
+        """Order should be created with uploaded files."""
+        client.force_login(CustomerFactory())
+        complete_to = timezone.now() + timedelta(days=7)
+        response = client.post('/orders/create/', {
+            'title': 'Portrait',
+            'description': 'Portrait of a cat',
+            'complete_to_year': complete_to.year,
+            'complete_to_month': complete_to.month,
+            'complete_to_day': complete_to.day,
+            'files': make_uploads(2),
+        })
+        order = Order.objects.get()
+        self.assertRedirects(
+            response, f'/orders/{order.pk}/', fetch_redirect_response=False
+        )
+        self.assertEqual(order.files.count(), 2)
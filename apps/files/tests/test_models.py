@@ -0,0 +1,180 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from apps.core.search import is_postgresql
+from apps.files.attachments import attach_files
+from apps.files.collection import collect_files
+from apps.files.models import File
+from apps.orders.factories import OrderFactory
+
+CONTENT = b'masterpiece sketch'
+
+
+class StoredFileTestCase(TestCase):
+    """Base test case with temporary media root."""
+
+    def setUp(self):
+        """Use temporary directory as media root."""
+        self.media_root = tempfile.mkdtemp()
+        settings = override_settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+    def blobs(self):
+        """Return paths of stored blobs."""
+        return [
+            os.path.join(directory, filename)
+            for directory, _, filenames in os.walk(self.media_root)
+            for filename in filenames
+        ]
+
+
+class FileStoreTest(StoredFileTestCase):
+    """Tests for storing files by content hash."""
+
+    def test_hash_recorded(self):
+        """Hash, size and original name should be recorded."""
+        file = File.objects.store(ContentFile(CONTENT, name='Sketch.PNG'))
+        self.assertEqual(len(file.sha256), 64)
+        self.assertEqual(file.size, len(CONTENT))
+        self.assertEqual(file.name, 'Sketch.PNG')
+        self.assertEqual(
+            file.link.name,
+            f'upload_files/{file.sha256[:2]}/{file.sha256}.png',
+        )
+        with file.link.open() as content:
+            self.assertEqual(content.read(), CONTENT)
+
+    def test_same_content_stored_once(self):
+        """Upload of the same content should return stored file."""
+        file = File.objects.store(ContentFile(CONTENT, name='a.png'))
+        with self.assertNumQueries(2):
+            duplicate = File.objects.store(ContentFile(CONTENT, name='b.png'))
+        self.assertEqual(duplicate, file)
+        self.assertEqual(File.objects.count(), 1)
+        self.assertEqual(len(self.blobs()), 1)
+
+    def test_different_content(self):
+        """Files with different content should be stored separately."""
+        File.objects.store(ContentFile(CONTENT, name='a.png'))
+        File.objects.store(ContentFile(CONTENT + b'!', name='a.png'))
+        self.assertEqual(File.objects.count(), 2)
+        self.assertEqual(len(self.blobs()), 2)
+
+    def test_create_hashes_upload(self):
+        """Creating file with uploaded link should record hash too."""
+        file = File.objects.create(link=ContentFile(CONTENT, name='a.txt'))
+        self.assertEqual(
+            file, File.objects.store(ContentFile(CONTENT, name='b.txt'))
+        )
+        self.assertEqual(file.size, len(CONTENT))
+
+
+class CollectFilesTest(StoredFileTestCase):
+    """Tests for deleting not used files."""
+
+    def setUp(self):
+        """Store used and not used files uploaded long ago."""
+        super().setUp()
+        self.used = File.objects.store(ContentFile(b'used', name='a.txt'))
+        self.unused = File.objects.store(ContentFile(b'unused', name='b.txt'))
+        OrderFactory().files.add(self.used)
+        old = timezone.now() - timedelta(days=2)
+        File.objects.update(created_at=old, used_at=old)
+
+    def test_delete_unreferenced(self):
+        """Not used file and its blob should be deleted."""
+        counts = collect_files(timedelta(hours=1))
+        self.assertEqual(counts, {'files': 1, 'blobs': 0})
+        self.assertQuerysetEqual(
+            File.objects.all(), [self.used.pk], transform=lambda f: f.pk
+        )
+        self.assertFalse(os.path.exists(self.unused.link.path))
+        self.assertTrue(os.path.exists(self.used.link.path))
+
+    def test_keep_recent(self):
+        """Recently uploaded files should not be deleted."""
+        counts = collect_files(timedelta(days=3))
+        self.assertEqual(counts, {'files': 0, 'blobs': 0})
+        self.assertEqual(File.objects.count(), 2)
+
+    def test_keep_stored_again(self):
+        """Old file stored again recently should not be deleted."""
+        File.objects.store(ContentFile(b'unused', name='c.txt'))
+        counts = collect_files(timedelta(hours=1))
+        self.assertEqual(counts, {'files': 0, 'blobs': 0})
+        self.assertTrue(os.path.exists(self.unused.link.path))
+
+    def test_dry_run(self):
+        """Dry run should only count files."""
+        counts = collect_files(timedelta(hours=1), dry_run=True)
+        self.assertEqual(counts, {'files': 1, 'blobs': 0})
+        self.assertEqual(File.objects.count(), 2)
+        self.assertTrue(os.path.exists(self.unused.link.path))
+
+    def test_delete_orphan_blobs(self):
+        """Old blobs without file rows should be deleted."""
+        path = self.unused.link.path
+        File.objects.filter(pk=self.unused.pk).delete()
+        counts = collect_files(timedelta(hours=1))
+        self.assertEqual(counts, {'files': 0, 'blobs': 0})
+        old = (timezone.now() - timedelta(days=2)).timestamp()
+        os.utime(path, (old, old))
+        counts = collect_files(timedelta(hours=1))
+        self.assertEqual(counts, {'files': 0, 'blobs': 1})
+        self.assertFalse(os.path.exists(path))
+        self.assertTrue(os.path.exists(self.used.link.path))
+
+
+@skipUnless(is_postgresql(), 'Row locks require PostgreSQL.')
+class CollectFilesLockTest(TransactionTestCase):
+    """Tests for collecting files attached concurrently."""
+
+    def setUp(self):
+        """Use temporary directory as media root."""
+        self.media_root = tempfile.mkdtemp()
+        settings = override_settings(MEDIA_ROOT=self.media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+    def test_keep_attached_concurrently(self):
+        """File attached in not committed transaction should be kept."""
+        file = File.objects.store(ContentFile(CONTENT, name='a.txt'))
+        old = timezone.now() - timedelta(days=2)
+        File.objects.update(created_at=old, used_at=old)
+        order = OrderFactory()
+        stored = threading.Event()
+
+        def attach():
+            try:
+                with transaction.atomic():
+                    attach_files(order, [ContentFile(CONTENT, name='b.txt')])
+                    stored.set()
+                    time.sleep(0.5)
+            finally:
+                connection.close()
+
+        worker = threading.Thread(target=attach)
+        worker.start()
+        stored.wait()
+        try:
+            counts = collect_files(timedelta(hours=1))
+        finally:
+            worker.join()
+        self.assertEqual(counts, {'files': 0, 'blobs': 0})
+        self.assertQuerysetEqual(
+            order.files.all(), [file.pk], transform=lambda f: f.pk
+        )
+        self.assertTrue(os.path.exists(file.link.path))
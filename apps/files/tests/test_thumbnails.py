@@ -0,0 +1,141 @@
+import os
+from datetime import timedelta
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.template import Context, Template
+from django.test import override_settings
+from PIL import Image
+
+from apps.core.models import OutboxMessage
+from apps.files.collection import collect_files
+from apps.files.models import File, Thumbnail
+from apps.files.tests.test_models import StoredFileTestCase
+from apps.files.thumbnails import generate_thumbnails, render_thumbnails
+from apps.orders.factories import OrderFactory
+
+
+def make_image(name='image.png', size=(64, 48), color='red'):
+    """Return upload of PNG image."""
+    content = BytesIO()
+    Image.new('RGB', size, color).save(content, 'PNG')
+    return ContentFile(content.getvalue(), name=name)
+
+
+@override_settings(
+    FILE_THUMBNAIL_SIZES={'small': 16, 'medium': 32, 'large': 128},
+    FILE_THUMBNAIL_FORMATS=('webp', 'jpeg'),
+)
+class ThumbnailsTest(StoredFileTestCase):
+    """Tests for generation of image thumbnails."""
+
+    def test_render(self):
+        """Thumbnails should keep proportions and never be upscaled."""
+        file = File.objects.store(make_image())
+        rendered = render_thumbnails(
+            file.link.path, {'small': 16, 'large': 128}, ('jpeg',), 80
+        )
+        self.assertEqual((rendered['width'], rendered['height']), (64, 48))
+        self.assertEqual(
+            [
+                (thumbnail['size'], thumbnail['width'], thumbnail['height'])
+                for thumbnail in rendered['thumbnails']
+            ],
+            [('large', 64, 48), ('small', 16, 12)],
+        )
+
+    def test_generate(self):
+        """Thumbnails of all sizes and formats should be stored."""
+        file = File.objects.store(make_image())
+        counts = generate_thumbnails(File.objects.all(), processes=1)
+        self.assertEqual(counts, {'generated': 1, 'failed': 0})
+        file.refresh_from_db()
+        self.assertEqual((file.width, file.height), (64, 48))
+        self.assertEqual(file.thumbnails.count(), 6)
+        thumbnail = file.thumbnails.get(size='medium', format='webp')
+        self.assertEqual(
+            thumbnail.link.name, file.link.name.replace('.png', '_medium.webp')
+        )
+        with Image.open(thumbnail.link.path) as image:
+            self.assertEqual(image.format, 'WEBP')
+            self.assertEqual(image.size, (32, 24))
+
+    def test_generate_in_pool(self):
+        """Thumbnails should be generated by pool of processes."""
+        File.objects.store_many([
+            make_image(f'{color}.png', color=color)
+            for color in ('red', 'green', 'blue')
+        ])
+        counts = generate_thumbnails(File.objects.all(), processes=2)
+        self.assertEqual(counts, {'generated': 3, 'failed': 0})
+        self.assertEqual(Thumbnail.objects.count(), 18)
+
+    def test_idempotent(self):
+        """Images with thumbnails should be skipped unless forced."""
+        File.objects.store(make_image())
+        generate_thumbnails(File.objects.all(), processes=1)
+        counts = generate_thumbnails(File.objects.all(), processes=1)
+        self.assertEqual(counts, {'generated': 0, 'failed': 0})
+        counts = generate_thumbnails(
+            File.objects.all(), processes=1, force=True
+        )
+        self.assertEqual(counts, {'generated': 1, 'failed': 0})
+        self.assertEqual(Thumbnail.objects.count(), 6)
+
+    def test_force_new_size(self):
+        """Forced generation should replace thumbnails of changed size."""
+        file = File.objects.store(make_image())
+        generate_thumbnails(File.objects.all(), processes=1)
+        with override_settings(FILE_THUMBNAIL_SIZES={'small': 8}):
+            generate_thumbnails(File.objects.all(), processes=1, force=True)
+
+        thumbnail = file.thumbnails.get(size='small', format='jpeg')
+        self.assertEqual((thumbnail.width, thumbnail.height), (8, 6))
+        with Image.open(thumbnail.link.path) as image:
+            self.assertEqual(image.size, (8, 6))
+
+    def test_skip_not_images(self):
+        """Not images should be skipped and broken images counted."""
+        File.objects.store(ContentFile(b'text', name='notes.txt'))
+        File.objects.store(ContentFile(b'broken', name='broken.png'))
+        counts = generate_thumbnails(File.objects.all(), processes=1)
+        self.assertEqual(counts, {'generated': 0, 'failed': 1})
+        self.assertFalse(Thumbnail.objects.exists())
+
+    def test_enqueue_new_images(self):
+        """Generation should be enqueued for new images only."""
+        files = File.objects.store_many([
+            make_image(), ContentFile(b'text', name='notes.txt'),
+        ])
+        File.objects.store(make_image())
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.name, 'generate_thumbnails')
+        self.assertEqual(message.get_arguments()[0], [[files[0].pk]])
+
+    def test_template_tag(self):
+        """Tag should render picture with thumbnails of all sizes."""
+        file = File.objects.store(make_image())
+        template = Template(
+            '{% load thumbnails %}{% thumbnail file "medium" %}'
+        )
+        self.assertNotIn('<picture>', template.render(Context({
+            'file': file,
+        })))
+
+        generate_thumbnails(File.objects.all(), processes=1)
+        file = File.objects.prefetch_related('thumbnails').get()
+        html = template.render(Context({'file': file}))
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn('_small.webp 16w', html)
+        self.assertIn('_large.webp 64w', html)
+        self.assertIn('_medium.jpeg" width="32" height="24"', html)
+
+    def test_collect_keeps_thumbnails(self):
+        """Thumbnails of used files should not be deleted as orphans."""
+        OrderFactory().files.add(File.objects.store(make_image()))
+        generate_thumbnails(File.objects.all(), processes=1)
+        for path in self.blobs():
+            os.utime(path, (0, 0))
+        counts = collect_files(timedelta(hours=1))
+        self.assertEqual(counts, {'files': 0, 'blobs': 0})
+        self.assertEqual(len(self.blobs()), 7)
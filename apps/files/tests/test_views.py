@@ -0,0 +1,135 @@
+from django.core.files.base import ContentFile
+from django.test import Client, override_settings
+
+from apps.files.models import File, Thumbnail
+from apps.files.tests.test_models import StoredFileTestCase
+from apps.masterpieces.factories import MasterpieceFactory
+from apps.orders.factories import OrderFactory
+from apps.users.factories import ArtistFactory, CustomerFactory
+
+CONTENT = b'0123456789'
+
+
+@override_settings(MEDIA_SENDFILE_BACKEND=None)
+class MediaViewTest(StoredFileTestCase):
+    """Tests for downloading of protected files."""
+
+    def setUp(self):
+        """Store file of customer order and log in as customer."""
+        super().setUp()
+        self.order = OrderFactory()
+        self.file = File.objects.store(ContentFile(CONTENT, name='a.txt'))
+        self.order.files.add(self.file)
+        self.url = self.file.link.url
+        self.client = Client()
+        self.client.force_login(self.order.created_by)
+
+    def get(self, **headers):
+        """Return response and its content."""
+        response = self.client.get(self.url, **headers)
+        content = b''.join(getattr(response, 'streaming_content', []))
+        return response, content
+
+    def test_download(self):
+        """Whole file should be sent with caching headers."""
+        response, content = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content, CONTENT)
+        self.assertEqual(response['Content-Length'], str(len(CONTENT)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('private', response['Cache-Control'])
+        self.assertTrue(response['ETag'])
+        self.assertTrue(response['Last-Modified'])
+
+    def test_visibility(self):
+        """File should be sent only to users who can see its objects."""
+        self.client.force_login(CustomerFactory())
+        self.assertEqual(self.get()[0].status_code, 404)
+        self.client.force_login(ArtistFactory())
+        self.assertEqual(self.get()[0].status_code, 200)
+
+        masterpiece = MasterpieceFactory(visible=False)
+        masterpiece.files.add(self.file)
+        self.order.files.remove(self.file)
+        self.assertEqual(self.get()[0].status_code, 404)
+        self.client.force_login(masterpiece.artist)
+        self.assertEqual(self.get()[0].status_code, 200)
+
+        self.client.logout()
+        self.assertEqual(self.get()[0].status_code, 302)
+
+    def test_not_found(self):
+        """Not stored files should not be found."""
+        self.url = '/media/upload_files/missing.txt'
+        self.assertEqual(self.get()[0].status_code, 404)
+
+    def test_thumbnail(self):
+        """Thumbnails should be sent with permissions of their file."""
+        storage = Thumbnail._meta.get_field('link').storage
+        name = storage.save('upload_files/a_small.jpeg', ContentFile(b'j'))
+        Thumbnail.objects.create(
+            file=self.file, size='small', format='jpeg', link=name,
+            width=1, height=1,
+        )
+        self.url = f'/media/{name}'
+        response, content = self.get()
+        self.assertEqual(content, b'j')
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.client.force_login(CustomerFactory())
+        self.assertEqual(self.get()[0].status_code, 404)
+
+    def test_not_modified(self):
+        """Conditional requests of not changed file should get 304."""
+        response = self.get()[0]
+        for headers in (
+            {'HTTP_IF_NONE_MATCH': response['ETag']},
+            {'HTTP_IF_MODIFIED_SINCE': response['Last-Modified']},
+        ):
+            not_modified = self.get(**headers)[0]
+            self.assertEqual(not_modified.status_code, 304)
+            self.assertEqual(not_modified['ETag'], response['ETag'])
+
+    def test_range(self):
+        """Requested ranges should be sent partially."""
+        for header, expected, content_range in (
+            ('bytes=2-5', b'2345', 'bytes 2-5/10'),
+            ('bytes=7-', b'789', 'bytes 7-9/10'),
+            ('bytes=-3', b'789', 'bytes 7-9/10'),
+            ('bytes=8-100', b'89', 'bytes 8-9/10'),
+        ):
+            response, content = self.get(HTTP_RANGE=header)
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(content, expected)
+            self.assertEqual(response['Content-Range'], content_range)
+            self.assertEqual(response['Content-Length'], str(len(expected)))
+
+    def test_range_ignored(self):
+        """Invalid, multiple and outdated ranges should get whole file."""
+        for headers in (
+            {'HTTP_RANGE': 'bytes=5-2'},
+            {'HTTP_RANGE': 'bytes=0-1,4-5'},
+            {'HTTP_RANGE': 'bytes=0-1', 'HTTP_IF_RANGE': '"outdated"'},
+        ):
+            response, content = self.get(**headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(content, CONTENT)
+
+    def test_range_not_satisfiable(self):
+        """Range out of file should get 416."""
+        response = self.get(HTTP_RANGE='bytes=10-')[0]
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    @override_settings(
+        MEDIA_SENDFILE_BACKEND='nginx',
+        MEDIA_ACCEL_REDIRECT_URL='/protected-media/',
+    )
+    def test_accel_redirect(self):
+        """Transfer should be passed to nginx."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['X-Accel-Redirect'],
+            f'/protected-media/{self.file.link.name}',
+        )
+        self.assertEqual(response.content, b'')
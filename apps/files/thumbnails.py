@@ -0,0 +1,152 @@
+import multiprocessing
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from apps.files.models import File, Thumbnail
+from apps.files.storage import thumbnail_path
+
+__all__ = (
+    'generate_thumbnails',
+    'render_thumbnails',
+)
+
+EXIF_ORIENTATION = 0x0112
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+PIL_FORMATS = {
+    'webp': 'WEBP',
+    'jpeg': 'JPEG',
+}
+
+
+def render_thumbnails(path: str, sizes: dict, formats, quality: int) -> dict:
+    """Return size of image and its encoded thumbnails.
+
+    Thumbnails are rendered from the largest to the smallest, every one is
+    downscaled from the previous. Images are never upscaled. Function is
+    called in worker processes, so it gets and returns plain data only.
+    """
+    with Image.open(path) as image:
+        width, height = image.size
+        if image.getexif().get(EXIF_ORIENTATION) in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+        largest = max(sizes.values())
+        # JPEG is decoded at reduced scale if it is much larger than needed
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert(
+                'RGBA' if 'transparency' in image.info else 'RGB'
+            )
+
+        thumbnails = []
+        for size, side in sorted(sizes.items(), key=lambda item: -item[1]):
+            image.thumbnail((side, side), Image.LANCZOS)
+            for image_format in formats:
+                frame = image
+                if image_format == Thumbnail.Format.JPEG:
+                    frame = image.convert('RGB')
+                content = BytesIO()
+                frame.save(
+                    content, PIL_FORMATS[image_format], quality=quality
+                )
+                thumbnails.append({
+                    'size': size,
+                    'format': image_format,
+                    'content': content.getvalue(),
+                    'width': image.width,
+                    'height': image.height,
+                })
+    return {'width': width, 'height': height, 'thumbnails': thumbnails}
+
+
+def generate_thumbnails(files, processes=None, force=False) -> dict:
+    """Generate thumbnails of images in pool of processes.
+
+    Images which already have thumbnails are skipped unless ``force`` is
+    passed, so generation can be re-run safely. Pool is not used in daemon
+    processes such as Celery workers. Returns counts of generated and
+    failed images.
+    """
+    files = files.images()
+    if not force:
+        files = files.without_thumbnails()
+    processes = (
+        processes or settings.FILE_THUMBNAIL_PROCESSES or os.cpu_count()
+    )
+    if multiprocessing.current_process().daemon:
+        processes = 1
+
+    counts = {'generated': 0, 'failed': 0}
+    for file, rendered in _render(files.iterator(), processes):
+        if rendered is None:
+            counts['failed'] += 1
+            continue
+        save_thumbnails(file, rendered)
+        counts['generated'] += 1
+    return counts
+
+
+def save_thumbnails(file: File, rendered: dict):
+    """Store rendered thumbnails of file and record their sizes.
+
+    Thumbnails are named by their original and size, so stored ones are
+    replaced by the new rendering.
+    """
+    storage = Thumbnail._meta.get_field('link').storage
+    thumbnails = []
+    for thumbnail in rendered['thumbnails']:
+        name = thumbnail_path(
+            file.link.name, thumbnail['size'], thumbnail['format']
+        )
+        storage.replace(name, ContentFile(thumbnail.pop('content')))
+        thumbnails.append(Thumbnail(file=file, link=name, **thumbnail))
+    with transaction.atomic():
+        File.objects.filter(pk=file.pk).update(
+            width=rendered['width'], height=rendered['height'],
+        )
+        file.thumbnails.all().delete()
+        Thumbnail.objects.bulk_create(thumbnails)
+
+
+def _render(files, processes):
+    """Yield files with rendered thumbnails or None if file is broken."""
+    options = (
+        settings.FILE_THUMBNAIL_SIZES,
+        settings.FILE_THUMBNAIL_FORMATS,
+        settings.FILE_THUMBNAIL_QUALITY,
+    )
+    if processes == 1:
+        for file in files:
+            yield file, _render_file(file.link.path, *options)
+        return
+
+    # count of submitted images is limited to keep memory bounded
+    with ProcessPoolExecutor(processes) as pool:
+        futures = {}
+        for file in files:
+            future = pool.submit(_render_file, file.link.path, *options)
+            futures[future] = file
+            if len(futures) >= processes * 2:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield futures.pop(future), future.result()
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def _render_file(path, *options):
+    try:
+        return render_thumbnails(path, *options)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
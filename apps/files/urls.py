@@ -0,0 +1,7 @@
+from django.urls import path
+
+from apps.files import views
+
+urlpatterns = (
+    path('<path:name>', views.MediaView.as_view(), name='media'),
+)
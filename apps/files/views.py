@@ -1,3 +1,59 @@
-from django.shortcuts import render
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404
+from django.views.generic.base import View
+from django.views.generic.detail import SingleObjectMixin
 
-# Create your views here.
+from apps.core.views import BaseView
+from apps.files.archives import archive_response
+from apps.files.models import File, Thumbnail
+from apps.files.serving import serve_file
+
+__all__ = (
+    'FilesArchiveView',
+    'MediaView',
+)
+
+
+class MediaView(LoginRequiredMixin, View):
+    """View to download uploaded files and their thumbnails.
+
+    File is sent only if user can see an order or a masterpiece it is
+    attached to, staff can download all files.
+    """
+
+    def get(self, request, name):
+        """Send file found by its stored name."""
+        file_id = File.objects.filter(link=name).values_list(
+            'pk', flat=True
+        ).first()
+        if file_id is None:
+            file_id = Thumbnail.objects.filter(link=name).values_list(
+                'file_id', flat=True
+            ).first()
+        if file_id is None:
+            raise Http404
+        files = File.objects.filter(pk=file_id)
+        if not request.user.is_staff:
+            files = files.available_for_user(request.user)
+        if not files.exists():
+            raise Http404
+        storage = File._meta.get_field('link').storage
+        return serve_file(request, storage, name)
+
+
+class FilesArchiveView(BaseView, SingleObjectMixin):
+    """Base view to download all files of available object as ZIP.
+
+    Archive is streamed while it is written, so memory does not depend on
+    its size.
+    """
+
+    archive_prefix = None
+
+    def get(self, request, *args, **kwargs):
+        """Stream archive of object files."""
+        self.object = self.get_object()
+        return archive_response(
+            self.object.files.order_by('pk'),
+            f'{self.archive_prefix}-{self.object.pk}.zip',
+        )
@@ -1,8 +1,18 @@
 from django.apps import AppConfig
 
+from apps.core.cache import connect_generations
+from apps.core.search import connect_search_vector
+
 
 class MasterpiecesConfig(AppConfig):
     """Configuration for Masterpiece app."""
 
     name = 'apps.masterpieces'
     verbose_name = 'Masterpieces'
+
+    def ready(self):
+        """Connect signals."""
+        connect_search_vector(self.get_model('Masterpiece'))
+        connect_generations(
+            self.get_model('Masterpiece'), parents=('order',), m2m=('tags',)
+        )
@@ -0,0 +1,37 @@
+# Generated by Django 3.0.8 on 2020-09-24 11:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('masterpieces', '0003_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='masterpiece',
+            index=models.Index(fields=['artist', '-created_at', '-id'], name='masterpieces_artist_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='masterpiece',
+            index=models.Index(condition=models.Q(visible=True), fields=['artist', '-created_at', '-id'], name='masterpieces_visible_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='masterpiece',
+            index=models.Index(condition=models.Q(customer_rate__isnull=False), fields=['artist', 'customer_rate'], name='masterpieces_rated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='masterpiece',
+            index=models.Index(fields=['-created_at'], name='masterpieces_created_idx'),
+        ),
+        migrations.AlterField(
+            model_name='masterpiece',
+            name='artist',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='masterpieces', to=settings.AUTH_USER_MODEL, verbose_name='Artist'),
+        ),
+    ]
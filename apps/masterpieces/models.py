@@ -1,9 +1,14 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
+from apps.core.models import DirtyFieldsMixin
 from apps.masterpieces.querysets import MasterpieceQuerySet
+from apps.orders.models import Order
+from apps.users.models import ArtistStats
 
 __all__ = (
     'Masterpiece',
@@ -12,7 +17,7 @@ __all__ = (
 from apps.users.strings import ARTIST_ROLE
 
 
-class Masterpiece(models.Model):
+class Masterpiece(DirtyFieldsMixin, models.Model):
     """Masterpiece model.
 
     Attributes:
@@ -25,6 +30,7 @@ class Masterpiece(models.Model):
         decline_message (str): Message with which masterpiece was declined.
         visible (bool): Is masterpiece visible to other users.
         order (Order): Order of masterpiece.
+        search_vector (str): Weighted title, tags and description lexemes.
     """
 
     RATES_CHOICES = (
@@ -34,11 +40,16 @@ class Masterpiece(models.Model):
         (4, 'Good'),
         (5, 'Very good')
     )
+    # artist stats and order status depend on these fields
+    STATE_FIELDS = ('artist', 'order', 'customer_rate', 'decline_message')
+
     artist = models.ForeignKey(
         'users.User',
         on_delete=models.CASCADE,
         related_name='masterpieces',
         verbose_name=_('Artist'),
+        # masterpieces_artist_idx starts with this field
+        db_index=False,
     )
     title = models.CharField(
         max_length=255,
@@ -92,6 +103,10 @@ class Masterpiece(models.Model):
         blank=True,
         related_name='masterpieces',
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
 
     objects = MasterpieceQuerySet.as_manager()
 
@@ -100,6 +115,28 @@ class Masterpiece(models.Model):
         ordering = ('-created_at',)
         verbose_name = _('Masterpiece')
         verbose_name_plural = _('Masterpieces')
+        indexes = (
+            GinIndex(
+                fields=('search_vector',), name='masterpieces_search_idx'
+            ),
+            models.Index(
+                fields=('artist', '-created_at', '-id'),
+                name='masterpieces_artist_idx',
+            ),
+            models.Index(
+                fields=('artist', '-created_at', '-id'),
+                name='masterpieces_visible_idx',
+                condition=models.Q(visible=True),
+            ),
+            models.Index(
+                fields=('artist', 'customer_rate'),
+                name='masterpieces_rated_idx',
+                condition=models.Q(customer_rate__isnull=False),
+            ),
+            models.Index(
+                fields=('-created_at',), name='masterpieces_created_idx'
+            ),
+        )
 
     def __str__(self):
         return self.title
@@ -109,19 +146,93 @@ class Masterpiece(models.Model):
 
         Set complete date to order if masterpiece was accepted.
         Remove decline_message if masterpiece was updated.
+        Update artist stats and orders statuses in the same transaction if
+        fields they depend on were changed.
         """
-        if not self.order:
-            return super().save(*args, **kwargs)
-        if self.customer_rate:
+        adding = self._state.adding
+        if self.order_id and self.customer_rate:
             self.decline_message = None
-            self.order.completed_at = timezone.now()
-            self.order.save()
-        else:
-            last_masterpiece = Masterpiece.objects.filter(pk=self.pk).first()
-            if (last_masterpiece and
-                    last_masterpiece.decline_message == self.decline_message):
-                self.decline_message = None
-        return super().save(*args, **kwargs)
+        elif (self.order_id and not adding and
+                'decline_message' not in self.changed_fields):
+            self.decline_message = None
+
+        changed_fields = set(self.changed_fields)
+        if not changed_fields & set(self.STATE_FIELDS):
+            return super().save(*args, **kwargs)
+
+        last_artist_id = self.get_loaded_value('artist')
+        last_order_id = self.get_loaded_value('order')
+        last_counters = None
+        if not adding:
+            last_counters = self._get_stats_counters(
+                self.get_loaded_value('customer_rate'), last_order_id
+            )
+        with transaction.atomic():
+            completes_order = False
+            if (self.order_id and self.customer_rate and
+                    'customer_rate' in changed_fields):
+                now = timezone.now()
+                completes_order = bool(Order.objects.filter(
+                    pk=self.order_id, completed_at__isnull=True
+                ).update(completed_at=now, updated_at=now))
+                if Masterpiece.order.is_cached(self) and self.order:
+                    self.order.completed_at = now
+            super().save(*args, **kwargs)
+            self._update_artist_stats(
+                last_artist_id, last_counters, completes_order
+            )
+            self._update_orders_status({self.order_id, last_order_id})
+
+    def delete(self, *args, **kwargs):
+        """Delete masterpiece and subtract it from artist stats."""
+        with transaction.atomic():
+            ArtistStats.objects.increment(self.artist_id, **{
+                field: -value
+                for field, value in self.get_stats_counters().items()
+            })
+            order_id = self.order_id
+            deleted = super().delete(*args, **kwargs)
+            self._update_orders_status({order_id})
+            return deleted
+
+    def _update_orders_status(self, orders_ids):
+        """Update stored status of masterpiece orders."""
+        orders_ids.discard(None)
+        if not orders_ids:
+            return
+        Order.objects.filter(pk__in=orders_ids).update_status()
+
+    @staticmethod
+    def _get_stats_counters(customer_rate, order_id):
+        """Return values which masterpiece adds to artist stats."""
+        return {
+            'rating_sum': customer_rate or 0,
+            'rating_count': int(customer_rate is not None),
+            'completed_orders': int(order_id is not None),
+        }
+
+    def get_stats_counters(self):
+        """Return values which masterpiece adds to artist stats."""
+        return self._get_stats_counters(self.customer_rate, self.order_id)
+
+    def _update_artist_stats(self, last_artist_id, last_counters,
+                             completes_order):
+        """Apply difference between saved and last masterpiece to stats."""
+        counters = self.get_stats_counters()
+        if last_counters:
+            if last_artist_id != self.artist_id:
+                ArtistStats.objects.increment(
+                    last_artist_id,
+                    **{field: -value for field, value in last_counters.items()}
+                )
+            else:
+                counters = {
+                    field: value - last_counters[field]
+                    for field, value in counters.items()
+                }
+        if completes_order:
+            counters['active_orders'] = -1
+        ArtistStats.objects.increment(self.artist_id, **counters)
 
     def clean(self):
         """Check if data is valid."""
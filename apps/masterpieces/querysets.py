@@ -1,17 +1,26 @@
 from django.db import models
 from django.db.models import Q
 
-from apps.core.querysets import UserRoleRelatedQuerySetMixin
+from apps.core.querysets import (
+    CachedRelationsQuerySetMixin,
+    FullTextSearchQuerySetMixin,
+    UserRoleRelatedQuerySetMixin
+)
 
 __all__ = (
     'MasterpieceQuerySet',
 )
 
 
-class MasterpieceQuerySet(UserRoleRelatedQuerySetMixin, models.QuerySet):
+class MasterpieceQuerySet(
+    CachedRelationsQuerySetMixin,
+    FullTextSearchQuerySetMixin,
+    UserRoleRelatedQuerySetMixin,
+    models.QuerySet
+):
     """Custom queryset with a custom filter."""
 
-    def search_by(self, value: str):
+    def search_by_text_lookups(self, value: str):
         """Filter masterpieces by search_value."""
         return self.filter(
             models.Q(title__icontains=value)
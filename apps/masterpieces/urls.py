@@ -8,6 +8,11 @@ urlpatterns = (
         views.MasterpieceDetailView.as_view(),
         name='masterpiece-detail'
     ),
+    path(
+        '<int:pk>/files.zip',
+        views.MasterpieceFilesView.as_view(),
+        name='masterpiece-files'
+    ),
     path('', views.MasterpiecesList.as_view(), name='masterpiece-list'),
     path(
         'artist/<int:artist_pk>/',
@@ -1,11 +1,14 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import DeleteView, DetailView, FormView, UpdateView
 
-from apps.core.views import BaseView, ListSearchView
-from apps.files.models import File
+from apps.core.views import BaseView, CachedListMixin, ListSearchView
+from apps.files.attachments import attach_files
+from apps.files.views import FilesArchiveView
 from apps.masterpieces.models import Masterpiece
+from apps.tags.models import Tag
 from apps.users.models import User
 
 from ..orders.models import Order
@@ -14,16 +17,23 @@ from .forms import MasterpieceForm
 __all__ = (
     'MasterpiecesList',
     'MasterpieceDetailView',
+    'MasterpieceFilesView',
 )
 
 
-class MasterpiecesList(LoginRequiredMixin, ListSearchView):
-    """View to see list of visible artists` masterpieces."""
+class MasterpiecesList(LoginRequiredMixin, CachedListMixin, ListSearchView):
+    """View to see list of visible artists` masterpieces.
+
+    Masterpieces of an artist are cached once for all users.
+    """
 
     template_name = 'masterpieces/list.html'
+    list_template_name = 'masterpieces/list_items.html'
+    cache_models = (Masterpiece, Tag)
     context_object_name = 'masterpieces'
-    queryset = Masterpiece.objects.prefetch_related('tags', )
+    queryset = Masterpiece.objects.with_cached_relations('tags')
     paginate_by = 10
+    cursor_ordering = ('-created_at', '-id')
 
     def get_queryset(self):
         """Return all available authors` masterpieces."""
@@ -36,6 +46,12 @@ class MasterpiecesList(LoginRequiredMixin, ListSearchView):
             return queryset.filter(artist=self.artist).all_visible()
         return queryset.filter(artist=user)
 
+    def get_cache_scope(self):
+        """Return nothing for artist`s masterpieces, they are public."""
+        if 'artist_pk' in self.kwargs:
+            return ()
+        return super().get_cache_scope()
+
     def get_context_data(self, **kwargs):
         """Add an artist to context."""
         context = super().get_context_data(**kwargs)
@@ -48,10 +64,19 @@ class MasterpieceDetailView(BaseView, DetailView):
     """View to see the full masterpiece information."""
 
     template_name = 'masterpieces/detail.html'
-    queryset = Masterpiece.objects.select_related('artist')
+    queryset = Masterpiece.objects.select_related('artist').prefetch_related(
+        'files__thumbnails',
+    ).with_cached_relations('tags')
     context_object_name = 'masterpiece'
 
 
+class MasterpieceFilesView(FilesArchiveView):
+    """View to download all files of masterpiece as ZIP."""
+
+    queryset = Masterpiece.objects.all()
+    archive_prefix = 'masterpiece'
+
+
 class MasterpieceCreationView(LoginRequiredMixin, FormView):
     """View for masterpiece creation."""
 
@@ -67,11 +92,9 @@ class MasterpieceCreationView(LoginRequiredMixin, FormView):
             form.instance.order = order
 
         if form.is_valid():
-            files = request.FILES.getlist('files')
-            masterpiece = form.save()
-            for file in files:
-                f = File.objects.create(link=file)
-                masterpiece.files.add(f)
+            with transaction.atomic():
+                masterpiece = form.save()
+                attach_files(masterpiece, request.FILES.getlist('files'))
             return redirect(f'/masterpieces/{masterpiece.id}')
         return render(request, self.template_name, {'form': form})
 
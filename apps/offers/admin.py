@@ -1,4 +1,5 @@
 from django.contrib import admin, messages
+from django.core.exceptions import ValidationError
 from django_object_actions import DjangoObjectActions
 
 from apps.offers.models import Offer
@@ -67,14 +68,22 @@ class OfferAdmin(DjangoObjectActions, admin.ModelAdmin):
         """Accept the offer."""
         if not self._check_change_ability(request, obj, 'accept'):
             return
-        obj.accept()
+        if not obj.accept():
+            messages.error(
+                request, 'Another offer is already accepted on this order.'
+            )
+            return
         messages.success(request, f'Offer from {obj.artist} accepted.')
 
     def decline(self, request, obj):
         """Decline the offer."""
         if not self._check_change_ability(request, obj, 'decline'):
             return
-        obj.decline()
+        try:
+            obj.decline()
+        except ValidationError as error:
+            messages.error(request, ' '.join(error.messages))
+            return
         messages.success(request, f'Offer from {obj.artist} declined.')
 
     def request_changes(self, request, obj):
@@ -1,8 +1,14 @@
 from django.apps import AppConfig
 
+from apps.core.cache import connect_generations
+
 
 class OffersConfig(AppConfig):
     """Configuration for offers app."""
 
     name = 'apps.offers'
     verbose_name = 'Offers'
+
+    def ready(self):
+        """Connect signals."""
+        connect_generations(self.get_model('Offer'), parents=('order',))
@@ -0,0 +1,31 @@
+# Generated by Django 3.0.8 on 2020-09-07 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('offers', '0002_auto_20200814_1007'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferNotification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='offer_notifications', to=settings.AUTH_USER_MODEL, verbose_name='Customer')),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='offers.Offer', verbose_name='Offer')),
+            ],
+            options={
+                'verbose_name': 'Offer notification',
+                'verbose_name_plural': 'Offer notifications',
+                'db_table': 'offer_notifications',
+                'ordering': ('customer', 'id'),
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.0.8 on 2020-09-24 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers', '0003_offer_notifications'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(condition=models.Q(('accepted_at__isnull', True), ('declined_at__isnull', True)), fields=['-created_at', '-id'], name='offers_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(condition=models.Q(accepted_at__isnull=True), fields=['artist', '-created_at', '-id'], name='offers_artist_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(condition=models.Q(accepted_at__isnull=False), fields=['artist'], name='offers_artist_accepted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['-created_at'], name='offers_created_idx'),
+        ),
+    ]
@@ -1,18 +1,22 @@
-from django.core.exceptions import ValidationError
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
+from apps.core.cache import bump_generation
+from apps.core.models import DirtyFieldsMixin
 from apps.offers.querysets import OfferQuerySet
-from apps.users.models import User
+from apps.orders.models import Order
+from apps.users.models import ArtistStats, User
 
 __all__ = (
     'Offer',
+    'OfferNotification',
 )
 
 
-class Offer(models.Model):
+class Offer(DirtyFieldsMixin, models.Model):
     """Offer model.
 
     Attributes:
@@ -75,6 +79,26 @@ class Offer(models.Model):
         verbose_name = _('Offer')
         verbose_name_plural = _('Offers')
         unique_together = ('order', 'artist')
+        indexes = (
+            models.Index(
+                fields=('-created_at', '-id'),
+                name='offers_available_idx',
+                condition=models.Q(
+                    declined_at__isnull=True, accepted_at__isnull=True
+                ),
+            ),
+            models.Index(
+                fields=('artist', '-created_at', '-id'),
+                name='offers_artist_open_idx',
+                condition=models.Q(accepted_at__isnull=True),
+            ),
+            models.Index(
+                fields=('artist',),
+                name='offers_artist_accepted_idx',
+                condition=models.Q(accepted_at__isnull=False),
+            ),
+            models.Index(fields=('-created_at',), name='offers_created_idx'),
+        )
 
     def __str__(self):
         return str(self.order)
@@ -83,14 +107,28 @@ class Offer(models.Model):
         """Save offer method.
 
         If offer fee was updated, field changes_requested changes to False.
+        Fee of accepted offer is updated in artist stats.
+        Customer notification is enqueued for new offer.
         """
-        original_offer = Offer.objects.filter(pk=self.pk).first()
-        if not original_offer:
+        if self._state.adding:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                OfferNotification.objects.create(
+                    customer_id=self.order.created_by_id, offer=self
+                )
+            return
+        if 'fee' not in self.changed_fields:
             return super().save(*args, **kwargs)
 
-        if original_offer.fee != self.fee:
-            self.changes_requested = False
-        return super().save(*args, **kwargs)
+        self.changes_requested = False
+        last_fee = self.get_loaded_value('fee')
+        if not self.is_accepted() or last_fee is None:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            ArtistStats.objects.increment(
+                self.artist_id, fee_sum=self.fee - last_fee
+            )
 
     def clean(self):
         """Check if data is valid."""
@@ -133,18 +171,122 @@ class Offer(models.Model):
         self.changes_requested = True
         self.save()
 
-    def accept(self):
-        """Set accepted_at date, set offer to an order and decline others."""
-        self.accepted_at = timezone.now()
-        self.request_changes = False
-        self.save()
-        self.order.offer = self
-        self.order.save()
-        self.order.offers.exclude(id=self.id).update(
-            declined_at=timezone.now()
-        )
+    def is_accepted(self):
+        """Return True if offer is accepted and not declined."""
+        return bool(self.accepted_at and not self.declined_at)
+
+    def accept(self) -> bool:
+        """Set accepted_at date, set offer to an order and decline others.
+
+        Order row is locked and offer is accepted only if it is still not
+        accepted or declined and order has no accepted offer, so concurrent
+        accepts of offers on the same order attach exactly one of them.
+        Accepted offer is added to artist stats.
+        Return True if offer was accepted by this call.
+        """
+        with transaction.atomic():
+            order = Order.objects.select_for_update().get(pk=self.order_id)
+            if order.offer_id is not None:
+                return False
+            now = timezone.now()
+            accepted = Offer.objects.filter(
+                pk=self.pk, accepted_at__isnull=True, declined_at__isnull=True
+            ).update(accepted_at=now, changes_requested=False, updated_at=now)
+            if not accepted:
+                return False
+
+            self.accepted_at = now
+            self.updated_at = now
+            self.changes_requested = False
+            self._remember_values(
+                ('accepted_at', 'updated_at', 'changes_requested')
+            )
+            order.offer = self
+            order.status = Order.Status.IN_PROGRESS
+            order.save(update_fields=('offer', 'status', 'updated_at'))
+            self.order = order
+            order.offers.exclude(id=self.id).filter(
+                declined_at__isnull=True
+            ).update(declined_at=now, updated_at=now)
+            bump_generation(Offer, self.pk)
+            ArtistStats.objects.increment(
+                self.artist_id,
+                accepted_offers=1,
+                active_orders=int(order.completed_at is None),
+                fee_sum=self.fee,
+            )
+        return True
 
     def decline(self):
-        """Set declined_at date."""
-        self.declined_at = timezone.now()
-        self.save()
+        """Set declined_at date.
+
+        Declined accepted offer is detached from its order, so the order is
+        open again, and is subtracted from artist stats. Accepted offer of
+        order with masterpiece can not be declined.
+        """
+        with transaction.atomic():
+            was_accepted = self.is_accepted()
+            if was_accepted:
+                order = Order.objects.select_for_update().get(
+                    pk=self.order_id
+                )
+                try:
+                    order.masterpiece
+                except ObjectDoesNotExist:
+                    pass
+                else:
+                    raise ValidationError(
+                        _('Offer of delivered order can not be declined.')
+                    )
+            self.declined_at = timezone.now()
+            self.save()
+            if was_accepted:
+                if order.offer_id == self.pk:
+                    order.offer = None
+                    order.save()
+                self.order = order
+                ArtistStats.objects.increment(
+                    self.artist_id,
+                    accepted_offers=-1,
+                    active_orders=-int(self.order.completed_at is None),
+                    fee_sum=-self.fee,
+                )
+
+
+class OfferNotification(models.Model):
+    """Pending notification of customer about new offer.
+
+    Rows are created in the same transaction as offers and are sent in
+    batches, one message per customer.
+
+    Attributes:
+        customer (User): Customer to notify.
+        offer (Offer): New offer on customers` order.
+        created_at (datetime): Date when notification was created.
+    """
+
+    customer = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='offer_notifications',
+        verbose_name=_('Customer'),
+    )
+    offer = models.ForeignKey(
+        'offers.Offer',
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name=_('Offer'),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Created at'),
+    )
+
+    class Meta:
+        db_table = 'offer_notifications'
+        ordering = ('customer', 'id')
+        verbose_name = _('Offer notification')
+        verbose_name_plural = _('Offer notifications')
+
+    def __str__(self):
+        return f'{self.customer_id}: {self.offer_id}'
@@ -0,0 +1,138 @@
+from collections import defaultdict
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from apps.core.search import is_postgresql
+from apps.offers.models import OfferNotification
+
+__all__ = (
+    'send_offer_notifications',
+)
+
+NOTIFICATION_TEMPLATE = 'offers/emails/new_offers.txt'
+# first key of advisory locks of customers claimed for notifying
+CUSTOMERS_LOCK_KEY = 1
+
+
+def _build_message(email, orders):
+    """Return one message about new offers on customers` orders."""
+    offers_count = sum(order['offers_count'] for order in orders.values())
+    for order_id, order in orders.items():
+        order['url'] = urljoin(
+            settings.DJANGO_SITE_BASE_HOST,
+            reverse('offers:order-offers-list', kwargs={'order_pk': order_id}),
+        )
+    return EmailMessage(
+        f'{offers_count} new offer(s) on your orders',
+        render_to_string(NOTIFICATION_TEMPLATE, {
+            'offers_count': offers_count, 'orders': orders.values(),
+        }),
+        settings.EMAIL_HOST_USER,
+        [email],
+    )
+
+
+def _lock_customers(customers_ids) -> list:
+    """Lock customers till the end of transaction, return locked ones.
+
+    Customers locked by another worker are skipped. Advisory locks are
+    taken instead of row locks of users, so inserts referencing customers
+    and updates of users do not wait for claiming.
+    """
+    if not is_postgresql():
+        return customers_ids
+    with transaction.get_connection().cursor() as cursor:
+        cursor.execute(
+            'SELECT id FROM unnest(%s) AS id '
+            'WHERE pg_try_advisory_xact_lock(%s, id) ORDER BY id',
+            [customers_ids, CUSTOMERS_LOCK_KEY],
+        )
+        return [customer_id for customer_id, in cursor.fetchall()]
+
+
+def _claim_batch(last_customer_id, batch_size):
+    """Delete and return notifications of the next batch of customers.
+
+    Customers are locked, so all notifications of a customer are claimed
+    by one worker, customers locked by another worker are skipped.
+    Return claimed notifications and id of the last customer of the batch,
+    ``None`` if there are no customers to notify left.
+    """
+    with transaction.atomic():
+        customers_ids = list(OfferNotification.objects.filter(
+            customer__gt=last_customer_id
+        ).order_by('customer_id').values_list(
+            'customer_id', flat=True
+        ).distinct()[:batch_size])
+        if not customers_ids:
+            return None
+
+        notifications = list(OfferNotification.objects.filter(
+            customer__in=_lock_customers(customers_ids)
+        ).values_list(
+            'pk', 'customer', 'offer', 'customer__email',
+            'offer__order', 'offer__order__title',
+        ))
+        OfferNotification.objects.filter(
+            pk__in=[pk for pk, *_ in notifications]
+        ).delete()
+    return notifications, customers_ids[-1]
+
+
+def _send_batch(connection, last_customer_id, batch_size):
+    """Send notifications of the next batch of customers.
+
+    Notifications are deleted before sending, so mail is sent out of the
+    transaction, and are restored if sending fails. Return count of sent
+    messages and id of the last customer, ``None`` if there is nothing to
+    send.
+    """
+    claimed = _claim_batch(last_customer_id, batch_size)
+    if claimed is None:
+        return None
+    notifications, last_customer_id = claimed
+    if not notifications:
+        return 0, last_customer_id
+
+    customers = defaultdict(dict)
+    for *_, email, order_id, title in notifications:
+        order = customers[email].setdefault(
+            order_id, {'title': title, 'offers_count': 0}
+        )
+        order['offers_count'] += 1
+    try:
+        sent = connection.send_messages([
+            _build_message(email, orders)
+            for email, orders in customers.items()
+        ]) or 0
+    except Exception:
+        OfferNotification.objects.bulk_create([
+            OfferNotification(pk=pk, customer_id=customer_id,
+                              offer_id=offer_id)
+            for pk, customer_id, offer_id, *_ in notifications
+        ], ignore_conflicts=True)
+        raise
+    return sent, last_customer_id
+
+
+def send_offer_notifications(batch_size: int = None) -> int:
+    """Send pending offer notifications, one message per customer.
+
+    All batches are sent over one connection. Return count of sent
+    messages.
+    """
+    batch_size = batch_size or settings.OFFER_NOTIFICATIONS_BATCH_SIZE
+    sent = 0
+    last_customer_id = 0
+    with get_connection() as connection:
+        while True:
+            result = _send_batch(connection, last_customer_id, batch_size)
+            if result is None:
+                return sent
+            batch_sent, last_customer_id = result
+            sent += batch_sent
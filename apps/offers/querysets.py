@@ -1,16 +1,25 @@
 from django.db import models
 
-from apps.core.querysets import UserRoleRelatedQuerySetMixin
+from apps.core.querysets import (
+    FullTextSearchQuerySetMixin,
+    UserRoleRelatedQuerySetMixin
+)
 
 __all__ = (
     'OfferQuerySet',
 )
 
 
-class OfferQuerySet(UserRoleRelatedQuerySetMixin, models.QuerySet):
+class OfferQuerySet(
+    FullTextSearchQuerySetMixin,
+    UserRoleRelatedQuerySetMixin,
+    models.QuerySet
+):
     """Custom queryset with custom filters."""
 
-    def search_by(self, value: str):
+    search_vector_field = 'order__search_vector'
+
+    def search_by_text_lookups(self, value: str):
         """Return only offers with the found search_value."""
         return self.filter(
             models.Q(artist__email__icontains=value) |
@@ -18,6 +27,13 @@ class OfferQuerySet(UserRoleRelatedQuerySetMixin, models.QuerySet):
             models.Q(order__tags__title=value)
         ).distinct()
 
+    def full_text_search(self, value: str, extra_condition=None):
+        """Search by orders` search vector and artists` email."""
+        condition = models.Q(artist__email__icontains=value)
+        if extra_condition is not None:
+            condition |= extra_condition
+        return super().full_text_search(value, condition)
+
     def all_visible_for_artist(self, artist):
         """Return all created by artist and not accepted yet offers."""
         return self.filter(artist=artist, accepted_at__isnull=True)
@@ -1,15 +1,12 @@
-from celery.decorators import task
+from celery.decorators import periodic_task
+from celery.task.schedules import crontab
 
-from django.core.mail import send_mail
+from .notifications import send_offer_notifications
 
 
-@task(name='send_offer_task')
-def send_offer_task(customer_mail):
-    """Send an email to customer when he have new offer"""
-
-    return send_mail(
-            'New offer!',
-            f'Artist added new offer to your order. Check it.',
-            'art-orders@mail.ru',
-            [customer_mail],
-        )
+@periodic_task(
+    run_every=(crontab(minute='*')), name='send_offer_notifications'
+)
+def send_offer_notifications_task():
+    """Send customers messages about new offers on their orders."""
+    return send_offer_notifications()
@@ -1,8 +1,18 @@
-from django.test import TestCase
+import threading
+from unittest import skipUnless
 
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from apps.core.search import is_postgresql
 from apps.offers.factories import OfferFactory
+from apps.offers.models import Offer
 from apps.orders.factories import OrderFactory
+from apps.orders.models import Order
 from apps.users.factories import ArtistFactory, CustomerFactory
+from apps.users.models import ArtistStats
 
 
 class OfferModelTest(TestCase):
@@ -26,3 +36,81 @@ class OfferModelTest(TestCase):
     def test_has(self):
         """Offer should have order information."""
         self.assertEqual(self.offer.order, self.order)
+
+
+class OfferAcceptTest(TestCase):
+    """Tests for offer accepting."""
+
+    def setUp(self):
+        """Create order with offers."""
+        self.order = OrderFactory()
+        self.offers = OfferFactory.create_batch(3, order=self.order)
+
+    def test_accept(self):
+        """Offer should be accepted once and others should be declined."""
+        offer = self.offers[0]
+        with self.assertNumQueries(8):
+            self.assertTrue(offer.accept())
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.offer, offer)
+        self.assertEqual(self.order.status, Order.Status.IN_PROGRESS)
+        self.assertEqual(
+            Offer.objects.filter(declined_at__isnull=False).count(), 2
+        )
+        self.assertFalse(offer.accept())
+        self.assertFalse(Offer.objects.get(pk=self.offers[1].pk).accept())
+
+    def test_accept_declined(self):
+        """Declined offer should not be accepted."""
+        offer = self.offers[0]
+        Offer.objects.filter(pk=offer.pk).update(declined_at=timezone.now())
+        self.assertFalse(offer.accept())
+        self.order.refresh_from_db()
+        self.assertIsNone(self.order.offer)
+
+
+@skipUnless(is_postgresql(), 'Row locks require PostgreSQL.')
+class OfferAcceptConcurrencyTest(TransactionTestCase):
+    """Tests for concurrent offers accepting."""
+
+    threads_count = 8
+
+    def test_accepted_once(self):
+        """Only one of concurrently accepted offers should win."""
+        order = OrderFactory()
+        offers = OfferFactory.create_batch(self.threads_count, order=order)
+        barrier = threading.Barrier(self.threads_count)
+        results = []
+
+        def accept(offer_id):
+            try:
+                offer = Offer.objects.get(pk=offer_id)
+                barrier.wait()
+                results.append(offer.accept())
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=accept, args=(offer.pk,))
+            for offer in offers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(len(results), self.threads_count)
+        accepted = Offer.objects.get(accepted_at__isnull=False)
+        order.refresh_from_db()
+        self.assertEqual(order.offer, accepted)
+        self.assertEqual(
+            Offer.objects.filter(declined_at__isnull=False).count(),
+            self.threads_count - 1,
+        )
+        self.assertEqual(
+            ArtistStats.objects.aggregate(Sum('accepted_offers')), {
+                'accepted_offers__sum': 1
+            }
+        )
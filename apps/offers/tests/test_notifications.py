@@ -0,0 +1,109 @@
+import threading
+from unittest import mock, skipUnless
+
+from django.core import mail
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from apps.core.search import is_postgresql
+from apps.offers.factories import OfferFactory
+from apps.offers.models import OfferNotification
+from apps.offers.notifications import (
+    CUSTOMERS_LOCK_KEY,
+    send_offer_notifications,
+)
+from apps.orders.factories import OrderFactory
+from apps.users.factories import CustomerFactory
+
+
+class OfferNotificationsTest(TestCase):
+    """Tests for coalesced notifications about new offers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create customers with offers on their orders."""
+        cls.customer = CustomerFactory()
+        cls.other_customer = CustomerFactory()
+        for order in OrderFactory.create_batch(2, created_by=cls.customer):
+            OfferFactory.create_batch(2, order=order)
+        OfferFactory(order=OrderFactory(created_by=cls.other_customer))
+        return super().setUpTestData()
+
+    def test_enqueue(self):
+        """Notification should be enqueued only for new offers."""
+        self.assertEqual(
+            OfferNotification.objects.filter(customer=self.customer).count(),
+            4,
+        )
+        offer = OfferNotification.objects.first().offer
+        offer.fee += 1
+        offer.save()
+        self.assertEqual(OfferNotification.objects.count(), 5)
+
+    def test_send(self):
+        """Customer should get one message about all new offers."""
+        self.assertEqual(send_offer_notifications(batch_size=1), 2)
+
+        self.assertEqual(len(mail.outbox), 2)
+        message = next(
+            message for message in mail.outbox
+            if message.to == [self.customer.email]
+        )
+        self.assertEqual(message.subject, '4 new offer(s) on your orders')
+        self.assertFalse(OfferNotification.objects.exists())
+
+    def test_send_nothing(self):
+        """Nothing should be sent without pending notifications."""
+        OfferNotification.objects.all().delete()
+        with self.assertNumQueries(3):
+            self.assertEqual(send_offer_notifications(), 0)
+        self.assertEqual(mail.outbox, [])
+
+    def test_send_failed(self):
+        """Notifications should be kept if sending fails."""
+        with mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=ConnectionError,
+        ), self.assertRaises(ConnectionError):
+            send_offer_notifications()
+        self.assertEqual(OfferNotification.objects.count(), 5)
+
+
+@skipUnless(is_postgresql(), 'Row locks require PostgreSQL.')
+class OfferNotificationsLockTest(TransactionTestCase):
+    """Tests for notifications of customers locked by another worker."""
+
+    def test_locked_customer_skipped(self):
+        """Locked customer should be skipped and others should be sent."""
+        customer, other_customer = CustomerFactory.create_batch(2)
+        OfferFactory.create_batch(2, order=OrderFactory(created_by=customer))
+        OfferFactory(order=OrderFactory(created_by=other_customer))
+        locked, release = threading.Event(), threading.Event()
+
+        def lock_customer():
+            try:
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT pg_advisory_xact_lock(%s, %s)',
+                        [CUSTOMERS_LOCK_KEY, customer.pk],
+                    )
+                    locked.set()
+                    release.wait()
+            finally:
+                connection.close()
+
+        worker = threading.Thread(target=lock_customer)
+        worker.start()
+        locked.wait()
+        try:
+            self.assertEqual(send_offer_notifications(batch_size=1), 1)
+        finally:
+            release.set()
+            worker.join()
+
+        self.assertEqual([message.to for message in mail.outbox],
+                         [[other_customer.email]])
+        self.assertEqual(
+            OfferNotification.objects.filter(customer=customer).count(), 2
+        )
+        self.assertEqual(send_offer_notifications(), 1)
@@ -3,10 +3,9 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import DeleteView, DetailView, FormView, UpdateView
 
-from apps.core.views import BaseView, ListSearchView
+from apps.core.views import BaseView, CachedListMixin, ListSearchView
 from apps.offers.models import Offer
 from apps.orders.models import Order
-from . import tasks
 
 from .forms import OfferForm
 
@@ -21,12 +20,19 @@ __all__ = (
 )
 
 
-class OfferList(LoginRequiredMixin, ListSearchView):
-    """View for list all available offers."""
+class OfferList(LoginRequiredMixin, CachedListMixin, ListSearchView):
+    """View for list all available offers.
+
+    Users are not part of list keys: changed names and emails of artists
+    are rendered when cached list expires.
+    """
 
     paginate_by = 10
+    cursor_ordering = ('-created_at', '-id')
     queryset = Offer.objects
     template_name = 'offers/list.html'
+    list_template_name = 'offers/list_items.html'
+    cache_models = (Offer, Order)
     context_object_name = 'offers'
     order = None
 
@@ -156,8 +162,5 @@ class OfferSendingView(LoginRequiredMixin, FormView):
         form.instance.order = order
         if form.is_valid():
             form.save()
-            # tasks.send_offer_task.delay(order.created_by.email)
-            # todo
-            tasks.send_offer_task.delay('art-orders@mail.ru')
             return redirect('orders:order-list')
         return render(request, self.template_name, {'form': form})
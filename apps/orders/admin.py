@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from apps.core.admin import UserTrigramSearchAdminMixin
 from apps.orders.models import Order
 
 __all__ = (
@@ -8,12 +9,13 @@ __all__ = (
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(UserTrigramSearchAdminMixin, admin.ModelAdmin):
     """Order admin.
 
     Admin class definitions for ``Order`` model.
     """
 
+    user_search_relations = ('created_by',)
     search_fields = (
         'created_by__email',
         'created_by__first_name',
@@ -1,8 +1,19 @@
 from django.apps import AppConfig
 
+from apps.core.cache import connect_generations
+from apps.core.search import connect_search_vector
+
 
 class OrdersConfig(AppConfig):
     """Configuration for Order app."""
 
     name = 'apps.orders'
     verbose_name = 'Orders'
+
+    def ready(self):
+        """Connect signals."""
+        from apps.orders.matching import connect_order_recommendations
+
+        connect_search_vector(self.get_model('Order'))
+        connect_generations(self.get_model('Order'), m2m=('tags',))
+        connect_order_recommendations()
@@ -0,0 +1,106 @@
+import threading
+from collections import Counter
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+__all__ = (
+    'LocMemViewsBuffer',
+    'RedisViewsBuffer',
+    'get_views_buffer',
+    'flush_order_views',
+)
+
+
+class LocMemViewsBuffer:
+    """Keep not flushed order views in the process memory.
+
+    Every process has its own buffer, so it suits only for tests and
+    single process development servers.
+    """
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def incr(self, order_id: int, amount: int = 1):
+        """Add views to the order."""
+        with self._lock:
+            self._counts[order_id] += amount
+
+    def get(self, order_id: int) -> int:
+        """Return not flushed views count of the order."""
+        with self._lock:
+            return self._counts[order_id]
+
+    def drain(self) -> dict:
+        """Return all not flushed views and clear the buffer."""
+        with self._lock:
+            counts, self._counts = dict(self._counts), Counter()
+        return counts
+
+
+class RedisViewsBuffer:
+    """Keep not flushed order views in a redis hash shared by all workers."""
+
+    key = 'orders:views'
+
+    def __init__(self, url: str):
+        self._redis = redis.Redis.from_url(url)
+
+    def incr(self, order_id: int, amount: int = 1):
+        """Add views to the order."""
+        self._redis.hincrby(self.key, order_id, amount)
+
+    def get(self, order_id: int) -> int:
+        """Return not flushed views count of the order."""
+        return int(self._redis.hget(self.key, order_id) or 0)
+
+    def drain(self) -> dict:
+        """Return all not flushed views and clear the buffer atomically."""
+        pipe = self._redis.pipeline()
+        pipe.hgetall(self.key)
+        pipe.delete(self.key)
+        counts, _ = pipe.execute()
+        return {int(pk): int(count) for pk, count in counts.items()}
+
+
+_buffers = {}
+
+
+def get_views_buffer():
+    """Return views buffer configured by ``ORDER_VIEWS_BUFFER_URL`` setting.
+
+    Use redis if url is set, otherwise keep views in process memory.
+    """
+    url = getattr(settings, 'ORDER_VIEWS_BUFFER_URL', None)
+    if url not in _buffers:
+        _buffers[url] = RedisViewsBuffer(url) if url else LocMemViewsBuffer()
+    return _buffers[url]
+
+
+def flush_order_views() -> int:
+    """Move buffered views to the database.
+
+    Every order gets a single ``UPDATE ... SET views = views + n``, so
+    ``updated_at`` is not touched and concurrent flushes do not lose views.
+    If the database fails, drained views are put back to the buffer.
+    Return count of updated orders.
+    """
+    from apps.orders.models import Order
+
+    views_buffer = get_views_buffer()
+    counts = views_buffer.drain()
+    try:
+        with transaction.atomic():
+            for order_id, count in sorted(counts.items()):
+                Order.objects.filter(pk=order_id).update(
+                    views=F('views') + count
+                )
+    except Exception:
+        for order_id, count in counts.items():
+            views_buffer.incr(order_id, count)
+        raise
+    return len(counts)
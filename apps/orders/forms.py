@@ -14,16 +14,19 @@ class OrderForm(forms.ModelForm):
                   'description',
                   'complete_to',
                   'tags',
-                  'files',
                   ]
         help_texts = {
             'complete_to': _('Date when order is to be done'),
             'tags': _(
                 'Add tags, it help you to find the most suitable artist'
             ),
-            'files': _('If you want add some expected examples'),
         }
         widgets = {
             'complete_to': SelectDateWidget(empty_label="Nothing"),
             'tags': forms.CheckboxSelectMultiple(),
         }
+
+    files = forms.FileField(
+        widget=forms.ClearableFileInput(attrs={'multiple': True}),
+        help_text=_('If you want add some expected examples'),
+        required=False)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.matching import rebuild_recommendations
+
+
+class Command(BaseCommand):
+    """Rebuild recommended orders of all artists."""
+
+    help = 'Match open orders with artists and store the best ones.'
+
+    def handle(self, *args, **options):
+        """Rebuild recommendations and print their count."""
+        count = rebuild_recommendations()
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored {count} recommendation(s).'
+        ))
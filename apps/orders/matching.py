@@ -0,0 +1,388 @@
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from apps.core.outbox import coalesce, enqueue_call
+from apps.masterpieces.models import Masterpiece
+from apps.orders.models import Order, OrderRecommendation
+
+__all__ = (
+    'OrderMatcher',
+    'OrderVectors',
+    'connect_order_recommendations',
+    'get_artists_vectors',
+    'get_recommendations',
+    'rebuild_recommendations',
+    'refresh_artists',
+    'refresh_orders',
+)
+
+MASTERPIECE_TAG_WEIGHT = 1.0
+ACCEPTED_ORDER_TAG_WEIGHT = 1.0
+# limit of artists x order tags cells scored at once, 80MB of floats
+MAX_SCORE_CELLS = 10_000_000
+REFRESH_ARTISTS = 'apps.orders.matching.refresh_artists'
+REFRESH_ORDERS = 'apps.orders.matching.refresh_orders'
+
+
+class OrderVectors:
+    """Binary tag vectors of open orders in CSR form.
+
+    Tags of order ``ids[i]`` are ``tags[starts[i]:starts[i + 1]]``, orders
+    without tags are skipped as they can not match anything. Tags are
+    dense column indexes of ids in ``tags_ids``, so width of vectors is
+    count of tags used by orders, not the largest tag id.
+    """
+
+    def __init__(self, orders_ids=None):
+        orders = Order.objects.all_available().order_by()
+        if orders_ids is not None:
+            orders = orders.filter(pk__in=orders_ids)
+        pairs = np.array(list(Order.tags.through.objects.filter(
+            order__in=orders.values('pk')
+        ).order_by('order_id', 'tag_id').values_list(
+            'order_id', 'tag_id'
+        )), dtype=np.int64).reshape(-1, 2)
+        self.ids, self.starts, sizes = np.unique(
+            pairs[:, 0], return_index=True, return_counts=True
+        )
+        self.tags_ids, self.tags = np.unique(
+            pairs[:, 1], return_inverse=True
+        )
+        self.sizes = sizes.astype(np.float64)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def get_artists_vectors(artists_ids=None) -> dict:
+    """Return weighted tag vectors of artists as ``{tag_id: weight}``.
+
+    Vectors are sums of tags of artists` masterpieces and orders of their
+    accepted offers.
+    """
+    masterpieces_tags = Masterpiece.tags.through.objects.values_list(
+        'masterpiece__artist', 'tag'
+    )
+    orders_tags = Order.tags.through.objects.filter(
+        order__offer__isnull=False
+    ).values_list('order__offer__artist', 'tag')
+    if artists_ids is not None:
+        masterpieces_tags = masterpieces_tags.filter(
+            masterpiece__artist__in=artists_ids
+        )
+        orders_tags = orders_tags.filter(
+            order__offer__artist__in=artists_ids
+        )
+
+    vectors = defaultdict(lambda: defaultdict(float))
+    for tags, weight in (
+        (masterpieces_tags, MASTERPIECE_TAG_WEIGHT),
+        (orders_tags, ACCEPTED_ORDER_TAG_WEIGHT),
+    ):
+        for artist_id, tag_id in tags.iterator():
+            vectors[artist_id][tag_id] += weight
+    return vectors
+
+
+def get_artists_with_tags(tags_ids) -> set:
+    """Return ids of artists whose vectors have any of tags."""
+    return set(Masterpiece.tags.through.objects.filter(
+        tag__in=tags_ids
+    ).values_list('masterpiece__artist', flat=True)) | set(
+        Order.tags.through.objects.filter(
+            tag__in=tags_ids, order__offer__isnull=False
+        ).values_list('order__offer__artist', flat=True)
+    )
+
+
+class OrderMatcher:
+    """Score open orders for artists by similarity of tag vectors.
+
+    ``cosine`` metric uses weights of artists` tags, ``jaccard`` compares
+    sets of tags. Artists are scored in chunks with NumPy, a chunk of
+    artists against all orders at once.
+    """
+
+    metrics = ('cosine', 'jaccard')
+
+    def __init__(self, orders_ids=None, metric: str = None):
+        self.metric = metric or settings.ORDER_MATCHING_METRIC
+        if self.metric not in self.metrics:
+            raise ValueError(f'Unknown matching metric {self.metric}.')
+        self.orders = OrderVectors(orders_ids)
+
+    def get_weights(self, vectors) -> np.ndarray:
+        """Return dense matrix of artists vectors by tags of orders.
+
+        Artists tags not used by orders are dropped, they add nothing to
+        dot products.
+        """
+        tags_ids = self.orders.tags_ids
+        weights = np.zeros((len(vectors), len(tags_ids)))
+        for row, tags in enumerate(vectors):
+            ids = np.fromiter(tags.keys(), dtype=np.int64, count=len(tags))
+            columns = np.searchsorted(tags_ids, ids)
+            used = columns < len(tags_ids)
+            used[used] = tags_ids[columns[used]] == ids[used]
+            weights[row, columns[used]] = np.fromiter(
+                tags.values(), dtype=np.float64, count=len(tags)
+            )[used]
+        if self.metric == 'jaccard':
+            weights = (weights > 0).astype(np.float64)
+        return weights
+
+    def get_norms(self, vectors) -> np.ndarray:
+        """Return norms of whole artists vectors, count of tags for sets."""
+        if self.metric == 'jaccard':
+            return np.array([len(tags) for tags in vectors], dtype=np.float64)
+        return np.sqrt(np.array([
+            sum(weight ** 2 for weight in tags.values()) for tags in vectors
+        ], dtype=np.float64))
+
+    def score(self, weights: np.ndarray, norms: np.ndarray) -> np.ndarray:
+        """Return scores of all orders for every row of artists weights."""
+        # sparse orders x dense artists product, order tags are segments
+        dot = np.add.reduceat(
+            weights[:, self.orders.tags], self.orders.starts, axis=1
+        )
+        norms = norms[:, np.newaxis]
+        if self.metric == 'jaccard':
+            return dot / np.maximum(norms + self.orders.sizes - dot, 1)
+        return dot / np.maximum(norms * np.sqrt(self.orders.sizes), 1e-12)
+
+    def top(self, vectors: dict, count: int) -> dict:
+        """Return ``count`` best ``(order_id, score)`` for every artist.
+
+        Only orders with positive score are returned, orders with equal
+        scores are ordered from the newest.
+        """
+        top = {}
+        if not len(self.orders) or not vectors:
+            return top
+        count = min(count, len(self.orders))
+        artists = list(vectors.items())
+        # rows of weights and of their columns gathered by orders tags
+        width = max(len(self.orders.tags_ids), len(self.orders.tags))
+        chunk_size = max(1, MAX_SCORE_CELLS // width)
+        for start in range(0, len(artists), chunk_size):
+            chunk = artists[start:start + chunk_size]
+            vectors = [tags for _, tags in chunk]
+            scores = self.score(
+                self.get_weights(vectors), self.get_norms(vectors)
+            )
+            best = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+            for row, (artist_id, _) in enumerate(chunk):
+                columns = best[row]
+                best_scores = scores[row, columns]
+                columns = columns[np.lexsort(
+                    (-self.orders.ids[columns], -best_scores)
+                )]
+                top[artist_id] = [
+                    (int(self.orders.ids[column]), float(scores[row, column]))
+                    for column in columns if scores[row, column] > 0
+                ]
+        return top
+
+
+def _build_rows(top: dict) -> list:
+    return [
+        OrderRecommendation(artist_id=artist_id, order_id=order_id,
+                            score=score)
+        for artist_id, orders in top.items()
+        for order_id, score in orders
+    ]
+
+
+def rebuild_recommendations() -> int:
+    """Replace recommendations of all artists, return count of rows."""
+    top = OrderMatcher().top(
+        get_artists_vectors(), settings.ORDER_RECOMMENDATIONS_COUNT
+    )
+    rows = _build_rows(top)
+    with transaction.atomic():
+        OrderRecommendation.objects.all().delete()
+        OrderRecommendation.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+@coalesce
+def refresh_artists(artists_ids):
+    """Recalculate recommendations of artists whose tags changed.
+
+    Pending refreshes are merged by the outbox relay into one call.
+    """
+    top = dict.fromkeys(artists_ids, ())
+    top.update(OrderMatcher().top(
+        get_artists_vectors(artists_ids), settings.ORDER_RECOMMENDATIONS_COUNT
+    ))
+    with transaction.atomic():
+        OrderRecommendation.objects.filter(artist__in=artists_ids).delete()
+        OrderRecommendation.objects.bulk_create(
+            _build_rows(top), batch_size=1000
+        )
+
+
+@coalesce
+def refresh_orders(orders_ids):
+    """Update recommendations of orders whose tags or status changed.
+
+    Pending refreshes are merged by the outbox relay into one call. Open
+    orders are scored only for artists sharing their tags and merged
+    into stored top orders of these artists. Artists who lost closed orders
+    or got new accepted orders are recalculated completely.
+    """
+    count = settings.ORDER_RECOMMENDATIONS_COUNT
+    matcher = OrderMatcher(orders_ids)
+    candidates = {}
+    if len(matcher.orders):
+        artists_ids = get_artists_with_tags(matcher.orders.tags_ids.tolist())
+        candidates = {
+            artist_id: orders for artist_id, orders in matcher.top(
+                get_artists_vectors(artists_ids), count
+            ).items() if orders
+        }
+    accepted = set(Order.objects.filter(
+        pk__in=orders_ids, offer__isnull=False
+    ).values_list('offer__artist', flat=True))
+
+    with transaction.atomic():
+        recommendations = OrderRecommendation.objects.filter(
+            order__in=orders_ids
+        )
+        lost = set(recommendations.values_list('artist', flat=True))
+        recommendations.delete()
+
+        stored = defaultdict(list)
+        for artist_id, order_id, score in OrderRecommendation.objects.filter(
+            artist__in=candidates
+        ).values_list('artist', 'order', 'score'):
+            stored[artist_id].append((order_id, score))
+        added, outdated = {}, Q()
+        for artist_id, orders in candidates.items():
+            kept = {order_id for order_id, _ in sorted(
+                stored[artist_id] + orders,
+                key=lambda order: (-order[1], -order[0]),
+            )[:count]}
+            added[artist_id] = [order for order in orders if order[0] in kept]
+            for order_id, _ in stored[artist_id]:
+                if order_id not in kept:
+                    outdated |= Q(artist=artist_id, order=order_id)
+        if outdated:
+            OrderRecommendation.objects.filter(outdated).delete()
+        OrderRecommendation.objects.bulk_create(
+            _build_rows(added), batch_size=1000
+        )
+
+    refreshed = accepted | (lost - set(candidates))
+    if refreshed:
+        refresh_artists(refreshed)
+
+
+def get_recommendations(artists_ids, count: int = None) -> dict:
+    """Return ids of recommended open orders for every artist."""
+    recommendations = OrderRecommendation.objects.filter(
+        artist__in=artists_ids,
+        order__status=Order.Status.OPEN,
+    ).values_list('artist', 'order')
+    orders = defaultdict(list)
+    for artist_id, order_id in recommendations:
+        if count is None or len(orders[artist_id]) < count:
+            orders[artist_id].append(order_id)
+    return orders
+
+
+def connect_order_recommendations():
+    """Refresh recommendations through the outbox when tags change.
+
+    Orders are refreshed after change of their tags or opening and closing,
+    artists after change of their masterpieces tags.
+    """
+    def order_saved(sender, instance, created, update_fields, **kwargs):
+        if created or (
+            update_fields is not None and 'status' not in update_fields
+        ):
+            return
+        status = instance.get_loaded_value('status')
+        if status is not None and (
+            status == instance.status or
+            Order.Status.OPEN not in (status, instance.status)
+        ):
+            return
+        enqueue_call(REFRESH_ORDERS, [instance.pk])
+
+    def order_tags_changed(sender, instance, action, reverse, pk_set,
+                           **kwargs):
+        if reverse and action == 'pre_clear':
+            instance._recommended_orders_pks = list(
+                instance.orders.values_list('pk', flat=True)
+            )
+            return
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        if not reverse:
+            pk_set = [instance.pk]
+        elif action == 'post_clear':
+            pk_set = instance.__dict__.pop('_recommended_orders_pks', ())
+        if pk_set:
+            enqueue_call(REFRESH_ORDERS, list(pk_set))
+
+    def masterpiece_tags_changed(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+        if reverse and action == 'pre_clear':
+            instance._recommended_artists_pks = list(
+                instance.masterpieces.values_list('artist', flat=True)
+            )
+            return
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+        if not reverse:
+            artists_ids = [instance.artist_id]
+        elif action == 'post_clear':
+            artists_ids = instance.__dict__.pop(
+                '_recommended_artists_pks', ()
+            )
+        else:
+            artists_ids = Masterpiece.objects.filter(
+                pk__in=pk_set
+            ).values_list('artist', flat=True)
+        artists_ids = sorted(set(artists_ids))
+        if artists_ids:
+            enqueue_call(REFRESH_ARTISTS, artists_ids)
+
+    def masterpiece_saved(sender, instance, created, update_fields,
+                          **kwargs):
+        if created or update_fields is None or 'artist' not in update_fields:
+            return
+        artists_ids = {instance.artist_id, instance.get_loaded_value('artist')}
+        enqueue_call(REFRESH_ARTISTS, sorted(artists_ids - {None}))
+
+    def masterpiece_deleted(sender, instance, **kwargs):
+        enqueue_call(REFRESH_ARTISTS, [instance.artist_id])
+
+    uid = 'order_recommendations'
+    post_save.connect(
+        order_saved, sender=Order, weak=False, dispatch_uid=uid
+    )
+    m2m_changed.connect(
+        order_tags_changed,
+        sender=Order.tags.through,
+        weak=False,
+        dispatch_uid=uid,
+    )
+    m2m_changed.connect(
+        masterpiece_tags_changed,
+        sender=Masterpiece.tags.through,
+        weak=False,
+        dispatch_uid=uid,
+    )
+    post_save.connect(
+        masterpiece_saved, sender=Masterpiece, weak=False, dispatch_uid=uid
+    )
+    post_delete.connect(
+        masterpiece_deleted, sender=Masterpiece, weak=False, dispatch_uid=uid
+    )
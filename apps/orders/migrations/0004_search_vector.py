@@ -0,0 +1,39 @@
+# Generated by Django 3.0.8 on 2020-09-01 10:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+from apps.core.search import is_postgresql, update_search_vector
+
+
+def fill_search_vector(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    if not is_postgresql(db_alias):
+        return
+    Order = apps.get_model('orders', 'Order')
+    Tag = apps.get_model('tags', 'Tag')
+    update_search_vector(Order.objects.using(db_alias), tag_model=Tag)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tags', '0001_initial'),
+        ('orders', '0003_order_views'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='orders_search_idx'),
+        ),
+        migrations.RunPython(
+            fill_search_vector, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.0.8 on 2020-09-03 15:40
+
+from django.db import migrations, models
+
+
+def fill_status(apps, schema_editor):
+    """Set status of existing orders with one ``UPDATE``."""
+    Order = apps.get_model('orders', 'Order')
+    Masterpiece = apps.get_model('masterpieces', 'Masterpiece')
+    alias = schema_editor.connection.alias
+    masterpieces = Masterpiece.objects.using(alias).filter(
+        order=models.OuterRef('pk')
+    )
+    Order.objects.using(alias).update(status=models.Case(
+        models.When(
+            models.Exists(masterpieces.filter(customer_rate__isnull=False)),
+            then=models.Value('FINISHED'),
+        ),
+        models.When(
+            models.Exists(masterpieces.filter(
+                decline_message__isnull=False
+            ).exclude(decline_message='')),
+            then=models.Value('ON_REWORK'),
+        ),
+        models.When(
+            models.Exists(masterpieces), then=models.Value('READY')
+        ),
+        models.When(offer__isnull=False, then=models.Value('IN_PROGRESS')),
+        default=models.Value('OPEN'),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_search_vector'),
+        ('masterpieces', '0003_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='status',
+            field=models.CharField(choices=[('OPEN', 'Open'), ('IN_PROGRESS', 'In progress'), ('READY', 'Ready'), ('ON_REWORK', 'On rework'), ('FINISHED', 'Finished')], db_index=True, default='OPEN', editable=False, max_length=20, verbose_name='Status'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(status='OPEN'), fields=['-completed_at', '-id'], name='orders_open_idx'),
+        ),
+        migrations.RunPython(fill_status, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.0.8 on 2020-09-10 15:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('orders', '0005_order_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderRecommendation',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Score')),
+                ('artist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_recommendations', to=settings.AUTH_USER_MODEL, verbose_name='Artist')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='orders.Order', verbose_name='Order')),
+            ],
+            options={
+                'verbose_name': 'Order recommendation',
+                'verbose_name_plural': 'Order recommendations',
+                'db_table': 'order_recommendations',
+                'ordering': ('artist_id', '-score', '-order_id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='orderrecommendation',
+            index=models.Index(fields=['artist', '-score'], name='order_recommendations_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='orderrecommendation',
+            constraint=models.UniqueConstraint(fields=('artist', 'order'), name='order_recommendations_unique'),
+        ),
+    ]
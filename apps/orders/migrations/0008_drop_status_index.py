@@ -0,0 +1,18 @@
+# Generated by Django 3.0.8 on 2020-09-25 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='status',
+            field=models.CharField(choices=[('OPEN', 'Open'), ('IN_PROGRESS', 'In progress'), ('READY', 'Ready'), ('ON_REWORK', 'On rework'), ('FINISHED', 'Finished')], default='OPEN', editable=False, max_length=20, verbose_name='Status'),
+        ),
+    ]
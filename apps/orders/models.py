@@ -1,13 +1,18 @@
-from django.core.exceptions import ValidationError
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
+from apps.core.models import DirtyFieldsMixin
+from apps.orders.counters import get_views_buffer
 from apps.orders.querysets import OrderQuerySet
 from apps.users.models import User
 
 __all__ = (
     'Order',
+    'OrderRecommendation',
 )
 
 
@@ -15,7 +20,7 @@ def one_day_hence():
     return timezone.now() + timezone.timedelta(days=1)
 
 
-class Order(models.Model):
+class Order(DirtyFieldsMixin, models.Model):
     """Order model.
 
     Attributes:
@@ -27,13 +32,45 @@ class Order(models.Model):
         updated_at (datetime): Date when order was updated.
         completed_at (datetime): Date when order was completed.
         offer (Offer): Accepted offer on order.
+        views (int): Views count flushed to the database.
+        search_vector (str): Weighted title, tags and description lexemes.
+        status (str): Status of order derived from its offer and masterpiece.
     """
 
+    class Status(models.TextChoices):
+        """Order statuses."""
+
+        OPEN = 'OPEN', _('Open')
+        IN_PROGRESS = 'IN_PROGRESS', _('In progress')
+        READY = 'READY', _('Ready')
+        ON_REWORK = 'ON_REWORK', _('On rework')
+        FINISHED = 'FINISHED', _('Finished')
+
+    # statuses of order with accepted offer derived from its masterpiece,
+    # the first matching one wins, orders without accepted offer are open;
+    # filters are used by ``update_status`` and checks by ``get_status``
+    MASTERPIECE_STATUSES = (
+        (
+            Status.FINISHED,
+            models.Q(customer_rate__isnull=False),
+            lambda masterpiece: masterpiece.customer_rate is not None,
+        ),
+        (
+            Status.ON_REWORK,
+            models.Q(decline_message__isnull=False) &
+            ~models.Q(decline_message=''),
+            lambda masterpiece: bool(masterpiece.decline_message),
+        ),
+        (Status.READY, models.Q(), lambda masterpiece: True),
+    )
+
     created_by = models.ForeignKey(
         'users.User',
         on_delete=models.CASCADE,
         related_name='created_orders',
         verbose_name=_('Created by'),
+        # orders_customer_idx starts with this field
+        db_index=False,
     )
     title = models.CharField(
         max_length=255,
@@ -65,6 +102,18 @@ class Order(models.Model):
         default=0,
         verbose_name=_('Views count'),
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.OPEN,
+        editable=False,
+        verbose_name=_('Status'),
+        # orders_status_idx starts with this field
+    )
 
     offer = models.OneToOneField(
         'offers.Offer',
@@ -90,10 +139,66 @@ class Order(models.Model):
         ordering = ('-created_at',)
         verbose_name = _('Order')
         verbose_name_plural = _('Orders')
+        indexes = (
+            GinIndex(fields=('search_vector',), name='orders_search_idx'),
+            models.Index(
+                fields=('-completed_at', '-id'),
+                name='orders_open_idx',
+                condition=models.Q(status='OPEN'),
+            ),
+            models.Index(
+                fields=('-views', '-id'),
+                name='orders_open_views_idx',
+                condition=models.Q(status='OPEN'),
+            ),
+            models.Index(
+                fields=('status', '-completed_at', '-id'),
+                name='orders_status_idx',
+            ),
+            models.Index(
+                fields=('created_by', '-completed_at', '-id'),
+                name='orders_customer_idx',
+            ),
+            models.Index(fields=('-created_at',), name='orders_created_idx'),
+        )
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """Save order method.
+
+        Update status if accepted offer was changed, if only some fields are
+        saved the status is left to the caller.
+        """
+        if (kwargs.get('update_fields') is None and
+                'offer' in self.changed_fields):
+            self.status = self.get_status()
+        return super().save(*args, **kwargs)
+
+    def get_status(self):
+        """Return actual status of order."""
+        if not self.offer_id:
+            return self.Status.OPEN
+        try:
+            masterpiece = self.masterpiece if self.pk else None
+        except ObjectDoesNotExist:
+            masterpiece = None
+        if masterpiece is not None:
+            for status, condition, matches in self.MASTERPIECE_STATUSES:
+                if matches(masterpiece):
+                    return status
+        return self.Status.IN_PROGRESS
+
+    @property
+    def total_views(self):
+        """Return flushed views count with views still kept in buffer."""
+        return self.views + get_views_buffer().get(self.pk)
+
+    def add_view(self):
+        """Count order view without writing to the database."""
+        get_views_buffer().incr(self.pk)
+
     def clean(self):
         """Check if data is valid."""
         if not self.created_by or self.created_by.role != User.ROLES.CUSTOMER:
@@ -109,3 +214,52 @@ class Order(models.Model):
             raise ValidationError(
                 _('Order can not be completed before offer was accepted.')
             )
+
+
+class OrderRecommendation(models.Model):
+    """Open order recommended to artist by matching of tags.
+
+    Only top orders of every artist are kept, see ``apps.orders.matching``.
+
+    Attributes:
+        artist (User): Artist the order is recommended to.
+        order (Order): Recommended open order.
+        score (float): Similarity of order and artist tags.
+    """
+
+    artist = models.ForeignKey(
+        'users.User',
+        on_delete=models.CASCADE,
+        related_name='order_recommendations',
+        verbose_name=_('Artist'),
+    )
+    order = models.ForeignKey(
+        'orders.Order',
+        on_delete=models.CASCADE,
+        related_name='recommendations',
+        verbose_name=_('Order'),
+    )
+    score = models.FloatField(
+        verbose_name=_('Score'),
+    )
+
+    class Meta:
+        db_table = 'order_recommendations'
+        ordering = ('artist_id', '-score', '-order_id')
+        verbose_name = _('Order recommendation')
+        verbose_name_plural = _('Order recommendations')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('artist', 'order'),
+                name='order_recommendations_unique',
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('artist', '-score'),
+                name='order_recommendations_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.artist_id}: {self.order_id} ({self.score:.3f})'
@@ -1,16 +1,27 @@
+from django.contrib.gis.measure import D
 from django.db import models
 
-from apps.core.querysets import UserRoleRelatedQuerySetMixin
+from apps.core.cache import bump_generation
+from apps.core.querysets import (
+    CachedRelationsQuerySetMixin,
+    FullTextSearchQuerySetMixin,
+    UserRoleRelatedQuerySetMixin
+)
 
 __all__ = (
     'OrderQuerySet',
 )
 
 
-class OrderQuerySet(UserRoleRelatedQuerySetMixin, models.QuerySet):
+class OrderQuerySet(
+    CachedRelationsQuerySetMixin,
+    FullTextSearchQuerySetMixin,
+    UserRoleRelatedQuerySetMixin,
+    models.QuerySet
+):
     """Custom queryset with a custom filters."""
 
-    def search_by(self, value: str):
+    def search_by_text_lookups(self, value: str):
         """Return only order infos with the found search_value."""
         return self.filter(
             models.Q(title__icontains=value) |
@@ -20,7 +31,54 @@ class OrderQuerySet(UserRoleRelatedQuerySetMixin, models.QuerySet):
 
     def all_available(self):
         """Return all open orders."""
-        return self.filter(offer__isnull=True)
+        return self.filter(status=self.model.Status.OPEN)
+
+    def within(self, point, radius: float):
+        """Return orders of customers located within ``radius`` km."""
+        return self.filter(
+            created_by__location__dwithin=(point, D(km=radius))
+        )
+
+    def update_status(self):
+        """Update stored status of orders with one ``UPDATE``.
+
+        Status is derived by ``Order.MASTERPIECE_STATUSES`` rules shared
+        with ``Order.get_status``. Cache generations of updated orders are
+        bumped.
+        """
+        from apps.orders.models import Order
+        status = Order.Status
+        masterpieces = self.model._meta.apps.get_model(
+            'masterpieces', 'Masterpiece'
+        ).objects.filter(order=models.OuterRef('pk'))
+        bump_generation(
+            self.model._meta.label_lower,
+            *self.values_list('pk', flat=True),
+            using=self.db,
+        )
+        return self.update(status=models.Case(
+            models.When(offer__isnull=True, then=models.Value(status.OPEN)),
+            *(
+                models.When(
+                    models.Exists(masterpieces.filter(condition)),
+                    then=models.Value(masterpiece_status),
+                )
+                for masterpiece_status, condition, _
+                in Order.MASTERPIECE_STATUSES
+            ),
+            default=models.Value(status.IN_PROGRESS),
+        ))
+
+    def with_offer_counts(self):
+        """Annotate count of not declined and not accepted offers."""
+        return self.annotate(available_offers_count=models.Count(
+            'offers',
+            filter=models.Q(
+                offers__declined_at__isnull=True,
+                offers__accepted_at__isnull=True,
+            ),
+            distinct=True,
+        ))
 
     def all_visible_for_customer(self, customer):
         """Return all created by a customer orders."""
@@ -0,0 +1,24 @@
+from celery.decorators import periodic_task
+from celery.task.schedules import crontab
+
+from .counters import flush_order_views
+from .matching import rebuild_recommendations
+
+
+@periodic_task(run_every=(crontab(minute='*')), name='flush_order_views')
+def flush_order_views_task():
+    """Write buffered orders views to the database every minute."""
+    return flush_order_views()
+
+
+@periodic_task(
+    run_every=(crontab(minute=0, hour=4)),
+    name='rebuild_order_recommendations',
+)
+def rebuild_order_recommendations_task():
+    """Rebuild recommendations of all artists every night.
+
+    Recommendations are refreshed incrementally during the day, rebuilding
+    fixes changes missed by signals, e.g. bulk updates.
+    """
+    return rebuild_recommendations()
@@ -0,0 +1,108 @@
+from django.test import TestCase
+
+from apps.core.models import OutboxMessage
+from apps.core.outbox import relay_outbox
+from apps.masterpieces.factories import MasterpieceFactory
+from apps.offers.factories import OfferFactory
+from apps.orders.factories import OrderFactory
+from apps.orders.matching import (
+    OrderMatcher,
+    get_artists_vectors,
+    rebuild_recommendations
+)
+from apps.orders.models import OrderRecommendation
+from apps.tags.factories import TagFactory
+from apps.users.factories import ArtistFactory
+
+
+class OrderMatchingTest(TestCase):
+    """Tests for matching of orders and artists by tags."""
+
+    def setUp(self):
+        """Create artists and open orders with tags."""
+        self.portrait, self.oil, self.sculpture = (
+            TagFactory(title=title)
+            for title in ('portrait', 'oil', 'sculpture')
+        )
+        self.painter = ArtistFactory()
+        MasterpieceFactory(artist=self.painter).tags.add(
+            self.portrait, self.oil
+        )
+        self.sculptor = ArtistFactory()
+        MasterpieceFactory(artist=self.sculptor).tags.add(self.sculpture)
+        self.oil_portrait = OrderFactory()
+        self.oil_portrait.tags.add(self.portrait, self.oil)
+        self.portrait_order = OrderFactory()
+        self.portrait_order.tags.add(self.portrait)
+        self.statue = OrderFactory()
+        self.statue.tags.add(self.sculpture)
+        OrderFactory()
+        OutboxMessage.objects.all().delete()
+
+    def get_stored(self, artist):
+        """Return ids of stored recommended orders of the artist."""
+        return list(OrderRecommendation.objects.filter(
+            artist=artist
+        ).values_list('order', flat=True))
+
+    def test_cosine(self):
+        """Orders should be scored by cosine similarity of tags."""
+        top = OrderMatcher(metric='cosine').top(get_artists_vectors(), 10)
+        self.assertEqual(
+            [order_id for order_id, _ in top[self.painter.pk]],
+            [self.oil_portrait.pk, self.portrait_order.pk],
+        )
+        self.assertAlmostEqual(top[self.painter.pk][0][1], 1)
+        self.assertAlmostEqual(top[self.painter.pk][1][1], 0.5 ** 0.5)
+        self.assertEqual(top[self.sculptor.pk], [(self.statue.pk, 1)])
+
+    def test_jaccard(self):
+        """Orders should be scored by Jaccard similarity of tags sets."""
+        top = OrderMatcher(metric='jaccard').top(get_artists_vectors(), 1)
+        self.assertEqual(top[self.painter.pk], [(self.oil_portrait.pk, 1)])
+        top = OrderMatcher(
+            [self.portrait_order.pk], metric='jaccard'
+        ).top(get_artists_vectors(), 10)
+        self.assertEqual(top[self.painter.pk], [(self.portrait_order.pk, .5)])
+        self.assertEqual(top[self.sculptor.pk], [])
+
+    def test_sparse_tags_ids(self):
+        """Width of vectors should be count of used tags, not the max id."""
+        rare = TagFactory(pk=2_000_000_000)
+        self.statue.tags.add(rare)
+        MasterpieceFactory(artist=self.sculptor).tags.add(rare)
+        matcher = OrderMatcher(metric='jaccard')
+        vectors = get_artists_vectors()
+        self.assertEqual(
+            matcher.get_weights([vectors[self.sculptor.pk]]).shape, (1, 4)
+        )
+        self.assertEqual(
+            matcher.top(vectors, 1)[self.sculptor.pk], [(self.statue.pk, 1)]
+        )
+
+    def test_rebuild(self):
+        """Only matched orders should be stored for every artist."""
+        self.assertEqual(rebuild_recommendations(), 3)
+        self.assertEqual(
+            self.get_stored(self.painter),
+            [self.oil_portrait.pk, self.portrait_order.pk],
+        )
+        self.assertEqual(self.get_stored(self.sculptor), [self.statue.pk])
+
+    def test_incremental_refresh(self):
+        """Changes of tags and accepted offers should refresh stored top."""
+        rebuild_recommendations()
+        new_statue = OrderFactory()
+        new_statue.tags.add(self.sculpture)
+        MasterpieceFactory(artist=self.sculptor).tags.add(self.portrait)
+        OfferFactory(order=self.oil_portrait, artist=self.sculptor).accept()
+        self.assertEqual(OutboxMessage.objects.count(), 3)
+
+        self.assertEqual(relay_outbox(), {'dispatched': 3, 'failed': 0})
+
+        self.assertEqual(self.get_stored(self.painter), [
+            self.portrait_order.pk,
+        ])
+        self.assertEqual(self.get_stored(self.sculptor), [
+            self.portrait_order.pk, new_statue.pk, self.statue.pk,
+        ])
@@ -1,5 +1,9 @@
+from itertools import product
+
 from django.test import TestCase
 
+from apps.masterpieces.models import Masterpiece
+from apps.offers.factories import OfferFactory
 from apps.orders.factories import OrderFactory
 from apps.orders.models import Order
 from apps.users.factories import UserFactory
@@ -25,3 +29,78 @@ class OrderModelTest(TestCase):
         User.objects.get().delete()
         with self.assertRaises(Order.DoesNotExist):
             Order.objects.get()
+
+
+class OrderStatusTest(TestCase):
+    """Tests for stored order status."""
+
+    def setUp(self):
+        """Create open order with an offer."""
+        self.offer = OfferFactory()
+        self.order = self.offer.order
+
+    def assertStatus(self, status):
+        """Check stored status and status recalculated by queryset."""
+        self.assertEqual(Order.objects.get().status, status)
+        Order.objects.update(status=Order.Status.OPEN)
+        Order.objects.update_status()
+        self.assertEqual(Order.objects.get().status, status)
+
+    def test_lifecycle(self):
+        """Status should follow offer and masterpiece changes."""
+        self.assertStatus(Order.Status.OPEN)
+
+        self.offer.accept()
+        self.assertStatus(Order.Status.IN_PROGRESS)
+
+        masterpiece = Masterpiece.objects.create(
+            artist=self.offer.artist, order=self.order, title='Title'
+        )
+        self.assertStatus(Order.Status.READY)
+
+        masterpiece.decline_message = 'Rework it'
+        masterpiece.save()
+        self.assertStatus(Order.Status.ON_REWORK)
+
+        masterpiece.save()
+        self.assertStatus(Order.Status.READY)
+
+        masterpiece.customer_rate = 5
+        masterpiece.save()
+        self.assertStatus(Order.Status.FINISHED)
+
+    def test_masterpiece_deleted(self):
+        """Order should be in progress again if masterpiece was deleted."""
+        self.offer.accept()
+        Masterpiece.objects.create(
+            artist=self.offer.artist, order=self.order, title='Title'
+        ).delete()
+        self.assertStatus(Order.Status.IN_PROGRESS)
+
+    def test_same_rules(self):
+        """Queryset should store the status calculated by the model."""
+        masterpieces = (
+            None,
+            {},
+            {'decline_message': ''},
+            {'decline_message': 'Rework it'},
+            {'customer_rate': 4},
+            {'customer_rate': 4, 'decline_message': 'Rework it'},
+        )
+        for accepted, fields in product((False, True), masterpieces):
+            with self.subTest(accepted=accepted, masterpiece=fields):
+                offer = OfferFactory()
+                order = offer.order
+                if fields is not None:
+                    masterpiece = Masterpiece.objects.create(
+                        artist=offer.artist, order=order, title='Title'
+                    )
+                    Masterpiece.objects.filter(pk=masterpiece.pk).update(
+                        **fields
+                    )
+                Order.objects.filter(pk=order.pk).update(
+                    offer=offer if accepted else None
+                )
+                Order.objects.filter(pk=order.pk).update_status()
+                order = Order.objects.get(pk=order.pk)
+                self.assertEqual(order.status, order.get_status())
@@ -0,0 +1,49 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from apps.orders.factories import OrderFactory
+from apps.orders.models import Order
+from apps.tags.factories import TagFactory
+
+
+class OrderSearchTest(TestCase):
+    """Tests for orders search."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create orders with different texts."""
+        cls.by_title = OrderFactory(
+            title='Dragon portrait', description='Oil on canvas.'
+        )
+        cls.by_description = OrderFactory(
+            title='Poster', description='Poster with a dragon.'
+        )
+        cls.by_tag = OrderFactory(title='Logo', description='Simple logo.')
+        cls.by_tag.tags.add(TagFactory(title='dragon'))
+        OrderFactory(title='Landscape', description='Mountains.')
+        return super().setUpTestData()
+
+    def test_search(self):
+        """Orders should be found by title, description and tags."""
+        self.assertEqual(
+            set(Order.objects.search_by('dragon')),
+            {self.by_title, self.by_description, self.by_tag},
+        )
+
+    def test_search_after_update(self):
+        """Updated order should be found by new title."""
+        self.by_description.title = 'Unicorn poster'
+        self.by_description.save()
+        self.assertEqual(
+            list(Order.objects.search_by('unicorn')), [self.by_description]
+        )
+
+    @skipUnless(connection.vendor == 'postgresql', 'Requires PostgreSQL')
+    def test_rank(self):
+        """Title match should be ranked over tags and description."""
+        self.assertEqual(
+            list(Order.objects.search_by('dragon')),
+            [self.by_title, self.by_tag, self.by_description],
+        )
@@ -0,0 +1,189 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from apps.core.geo import is_postgis, make_point
+from apps.masterpieces.factories import MasterpieceFactory
+from apps.offers.factories import OfferFactory
+from apps.orders.counters import flush_order_views, get_views_buffer
+from apps.orders.factories import OrderFactory
+from apps.orders.models import Order, OrderRecommendation
+from apps.users.factories import ArtistFactory, CustomerFactory
+
+client = Client()
+
+# lists are rendered from the database by every request
+DUMMY_CACHES = {
+    **settings.CACHES,
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+@override_settings(ORDER_VIEWS_BUFFER_URL=None)
+class OrderViewsCounterTest(TestCase):
+    """Tests for buffered order views counter."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create test order."""
+        cls.artist = ArtistFactory()
+        cls.order = OrderFactory()
+        return super().setUpTestData()
+
+    def setUp(self):
+        """Clear views left by other tests."""
+        get_views_buffer().drain()
+
+    def test_detail_view_does_not_save_order(self):
+        """Order row should not be updated on every view."""
+        client.force_login(self.artist)
+        updated_at = Order.objects.get().updated_at
+        for _ in range(3):
+            response = client.get(f'/orders/{self.order.id}/')
+            self.assertEqual(200, response.status_code)
+
+        order = Order.objects.get()
+        self.assertEqual(order.views, 0)
+        self.assertEqual(order.total_views, 3)
+        self.assertEqual(order.updated_at, updated_at)
+
+    def test_flush(self):
+        """Buffered views should be added to the stored views count."""
+        Order.objects.update(views=5)
+        self.order.add_view()
+        self.order.add_view()
+        self.assertEqual(flush_order_views(), 1)
+
+        order = Order.objects.get()
+        self.assertEqual(order.views, 7)
+        self.assertEqual(order.total_views, 7)
+        self.assertEqual(flush_order_views(), 0)
+
+
+@override_settings(ORDER_VIEWS_BUFFER_URL=None, CACHES=DUMMY_CACHES)
+class OrderOfferCountsTest(TestCase):
+    """Tests for available offers counts on customers` orders pages."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create customers` orders with offers."""
+        cls.customer = CustomerFactory()
+        cls.orders = OrderFactory.create_batch(5, created_by=cls.customer)
+        for order in cls.orders:
+            OfferFactory.create_batch(2, order=order)
+            OfferFactory(order=order, declined_at=timezone.now())
+        return super().setUpTestData()
+
+    def test_list_queries_count(self):
+        """Orders list should not count offers of every order separately."""
+        client.force_login(self.customer)
+        response = client.get('/orders/')
+        self.assertEqual(200, response.status_code)
+        for order in response.context['orders']:
+            self.assertEqual(order.available_offers_count, 2)
+
+        OrderFactory.create_batch(5, created_by=self.customer)
+        # user, orders and tags, session is kept in cache
+        with self.assertNumQueries(3):
+            response = client.get('/orders/')
+        self.assertEqual(len(response.context['orders']), 10)
+
+    def test_detail(self):
+        """Order detail should show count of available offers."""
+        client.force_login(self.customer)
+        response = client.get(f'/orders/{self.orders[0].id}/')
+        self.assertEqual(response.context['order'].available_offers_count, 2)
+        self.assertContains(response, 'View offers <span')
+
+
+@override_settings(CACHES=DUMMY_CACHES)
+class OrderStatusFilterTest(TestCase):
+    """Tests for filtering orders list by status."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create open and finished orders."""
+        cls.customer = CustomerFactory()
+        cls.open_order = OrderFactory(created_by=cls.customer)
+        cls.masterpiece = MasterpieceFactory(
+            order__created_by=cls.customer, customer_rate=4
+        )
+        return super().setUpTestData()
+
+    def test_filter(self):
+        """Only orders with requested status should be listed."""
+        client.force_login(self.customer)
+        response = client.get('/orders/', {'status': 'FINISHED'})
+        self.assertEqual(
+            list(response.context['orders']), [self.masterpiece.order]
+        )
+        response = client.get('/orders/', {'status': 'OPEN'})
+        self.assertEqual(list(response.context['orders']), [self.open_order])
+        response = client.get('/orders/', {'status': 'UNKNOWN'})
+        self.assertEqual(len(response.context['orders']), 2)
+
+
+@skipUnless(is_postgis(), 'Spatial queries require PostGIS.')
+@override_settings(CACHES=DUMMY_CACHES)
+class OrderLocationFilterTest(TestCase):
+    """Tests for filtering orders by location of customers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create orders of near and far customers."""
+        cls.artist = ArtistFactory(location=make_point(55.75, 37.62))
+        cls.near_order = OrderFactory(
+            created_by=CustomerFactory(location=make_point(55.8, 37.6))
+        )
+        OrderFactory(
+            created_by=CustomerFactory(location=make_point(59.94, 30.31))
+        )
+        OrderFactory()
+        return super().setUpTestData()
+
+    def test_radius(self):
+        """Only orders of customers within radius should be listed."""
+        client.force_login(self.artist)
+        response = client.get('/orders/', {'radius': '25'})
+        self.assertEqual(list(response.context['orders']), [self.near_order])
+        response = client.get('/orders/')
+        self.assertEqual(len(response.context['orders']), 3)
+
+
+@override_settings(ORDER_VIEWS_BUFFER_URL=None, CACHES=DUMMY_CACHES)
+class OrderRecommendationsTest(TestCase):
+    """Tests for orders recommended to artists."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create artist with recommended open and closed orders."""
+        cls.artist = ArtistFactory()
+        cls.best_order, cls.order = OrderFactory.create_batch(2)
+        closed_order = OfferFactory(artist=cls.artist).order
+        closed_order.status = Order.Status.FINISHED
+        closed_order.save()
+        OrderRecommendation.objects.bulk_create([
+            OrderRecommendation(artist=cls.artist, order=order, score=score)
+            for order, score in (
+                (cls.order, .5), (cls.best_order, .9), (closed_order, 1),
+            )
+        ])
+        return super().setUpTestData()
+
+    def test_recommended(self):
+        """Artist should see open recommended orders by score."""
+        client.force_login(self.artist)
+        response = client.get('/orders/')
+        self.assertEqual(
+            list(response.context['recommended_orders']),
+            [self.best_order, self.order],
+        )
+        self.assertContains(response, 'Recommended for you')
+
+        response = client.get('/orders/', {'status': 'OPEN'})
+        self.assertNotIn('recommended_orders', response.context)
+        client.force_login(CustomerFactory())
+        response = client.get('/orders/')
+        self.assertNotIn('recommended_orders', response.context)
@@ -15,6 +15,11 @@ urlpatterns = (
         orders_views.OrderDetailView.as_view(),
         name='order-detail'
     ),
+    path(
+        '<int:pk>/files.zip',
+        orders_views.OrderFilesView.as_view(),
+        name='order-files'
+    ),
     path(
         '<int:pk>/update/',
         orders_views.OrderUpdateView.as_view(),
@@ -1,12 +1,22 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.db.models import F
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views import generic
 
+from apps.files.attachments import attach_files
+from apps.files.views import FilesArchiveView
 from apps.orders.models import Order
 
-from ..core.views import BaseView, ListSearchView
+from ..core.views import (
+    BaseView,
+    CachedListMixin,
+    ListSearchView,
+    LocationFilterMixin,
+)
+from ..offers.models import Offer
+from ..tags.models import Tag
 from ..users.models import User
 from .forms import OrderForm
 
@@ -16,25 +26,46 @@ __all__ = (
     'OrderUpdateView',
     'OrderDeleteView',
     'OrderCreationView',
+    'OrderFilesView',
 )
 
 from ..users.strings import ARTIST_ROLE
 
 
-class OrderList(LoginRequiredMixin, ListSearchView):
-    """View for list all available orders."""
+class OrderList(LoginRequiredMixin, CachedListMixin, LocationFilterMixin,
+                ListSearchView):
+    """View for list all available orders.
+
+    Orders can be filtered by status with ``?status=`` and by location of
+    customers with ``?radius=``. Artists see orders recommended for them
+    above the first page. Lists are cached for every role, customers` own
+    orders are cached for every customer. Users are not part of list keys:
+    saves of any user would drop all lists, changed emails are rendered when
+    cached list expires, cards depend on generations of their users.
+    """
 
     paginate_by = 10
+    recommended_count = 5
+    cursor_ordering = ('-completed_at', '-id')
+    cursor_count = False
     template_name = 'orders/list.html'
+    list_template_name = 'orders/list_items.html'
     context_object_name = 'orders'
+    cache_models = (Order, Offer, Tag)
     queryset = Order.objects.order_by(
         F('completed_at').desc(nulls_last=False)
-    ).select_related('masterpiece').prefetch_related('tags')
+    ).select_related('masterpiece').with_cached_relations('tags')
 
     def get_queryset(self):
         """Return visible orders according to users` role."""
         queryset = super().get_queryset()
         user = self.request.user
+        if user.role == User.ROLES.CUSTOMER:
+            queryset = queryset.with_offer_counts()
+        status = self.get_status()
+        if status:
+            queryset = queryset.filter(status=status)
+
         if 'customer_pk' in self.kwargs:
             self.customer = get_object_or_404(
                 User, id=self.kwargs['customer_pk'], role=User.ROLES.CUSTOMER
@@ -47,12 +78,14 @@ class OrderList(LoginRequiredMixin, ListSearchView):
             artist = get_object_or_404(
                 User, id=self.kwargs['artist_pk'], role=User.ROLES.ARTIST
             )
-            return queryset.all_accepted_for_artist(artist).select_related(
-                'created_by'
-            )
+            return queryset.all_accepted_for_artist(
+                artist
+            ).select_related('offer').with_cached_relations('created_by')
 
         if user.role == User.ROLES.ARTIST:
-            return queryset.all_available().select_related('created_by')
+            return queryset.all_available().with_cached_relations(
+                'created_by'
+            )
         if user.role == User.ROLES.CUSTOMER:
             return queryset.all_visible_for_customer(user).select_related(
                 'offer',
@@ -60,11 +93,41 @@ class OrderList(LoginRequiredMixin, ListSearchView):
             )
         return queryset
 
+    def get_cache_scope(self):
+        """Return role, customer for own orders and point of radius."""
+        user = self.request.user
+        scope = (user.role,)
+        if user.role == User.ROLES.CUSTOMER and not self.kwargs:
+            scope += (user.pk,)
+        point = self.get_point()
+        if self.get_radius() is not None and point is not None:
+            scope += (point.coords,)
+        return scope
+
+    def get_status(self):
+        """Return requested status or None if it is not valid."""
+        status = self.request.GET.get('status')
+        if status in Order.Status.values:
+            return status
+
+    def get_recommended_orders(self):
+        """Return open orders recommended for the artist."""
+        return Order.objects.all_available().filter(
+            recommendations__artist=self.request.user
+        ).order_by('-recommendations__score', '-id').select_related(
+            'created_by'
+        )[:self.recommended_count]
+
     def get_context_data(self, **kwargs):
-        """Add a customer to context."""
+        """Add a customer, orders statuses and recommendations to context."""
         context = super().get_context_data(**kwargs)
         if 'customer_pk' in self.kwargs:
             context['customer'] = self.customer
+        if (self.request.user.role == User.ROLES.ARTIST and
+                not self.kwargs and not self.request.GET):
+            context['recommended_orders'] = self.get_recommended_orders()
+        context['statuses'] = Order.Status.choices
+        context['status'] = self.get_status()
         return context
 
 
@@ -79,15 +142,24 @@ class OrderCreationView(LoginRequiredMixin, generic.TemplateView):
         return render(request, self.template_name, {'form': form})
 
     def post(self, request, *args, **kwargs):
-        form = self.form_class(request.POST)
+        form = self.form_class(request.POST, request.FILES)
         form.instance.created_by = request.user
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                order = form.save()
+                attach_files(order, request.FILES.getlist('files'))
             return redirect('orders:order-detail', pk=form.instance.pk)
 
         return render(request, self.template_name, {'form': form})
 
 
+class OrderFilesView(FilesArchiveView):
+    """View to download all files of order as ZIP."""
+
+    queryset = Order.objects.all()
+    archive_prefix = 'order'
+
+
 class OrderDeleteView(BaseView, generic.DeleteView):
     """View to delete an order."""
 
@@ -113,11 +185,12 @@ class OrderDetailView(BaseView, generic.DetailView):
     """View to see the full order information."""
 
     template_name = 'orders/detail.html'
-    queryset = Order.objects.select_related('created_by')
+    queryset = Order.objects.select_related('created_by').prefetch_related(
+        'files__thumbnails',
+    ).with_offer_counts().with_cached_relations('tags')
     context_object_name = 'order'
 
     def get_object(self):
         order = super().get_object()
-        order.views += 1
-        order.save()
+        order.add_view()
         return order
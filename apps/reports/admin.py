@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from apps.core.admin import UserTrigramSearchAdminMixin
 from apps.reports.models import MasterpieceReport, OrderReport, UserReport
 
 __all__ = (
@@ -10,12 +11,13 @@ __all__ = (
 
 
 @admin.register(UserReport)
-class UserReportAdmin(admin.ModelAdmin):
+class UserReportAdmin(UserTrigramSearchAdminMixin, admin.ModelAdmin):
     """User report admin.
 
     Admin class definitions for ``UserReport`` model.
     """
 
+    user_search_relations = ('created_by', 'user')
     search_fields = (
         'created_by__email',
         'user__email',
@@ -39,12 +41,13 @@ class UserReportAdmin(admin.ModelAdmin):
 
 
 @admin.register(OrderReport)
-class OrderReportAdmin(admin.ModelAdmin):
+class OrderReportAdmin(UserTrigramSearchAdminMixin, admin.ModelAdmin):
     """Order report admin.
 
     Admin class definitions for ``OrderReport`` model.
     """
 
+    user_search_relations = ('created_by',)
     search_fields = (
         'created_by__email',
         'order__id',
@@ -69,12 +72,13 @@ class OrderReportAdmin(admin.ModelAdmin):
 
 
 @admin.register(MasterpieceReport)
-class MasterpieceReportAdmin(admin.ModelAdmin):
+class MasterpieceReportAdmin(UserTrigramSearchAdminMixin, admin.ModelAdmin):
     """Masterpiece report admin.
 
     Admin class definitions for ``MasterpieceReport`` model.
     """
 
+    user_search_relations = ('created_by', 'masterpiece__artist')
     search_fields = (
         'created_by__email',
         'masterpiece__title',
@@ -0,0 +1,25 @@
+# Generated by Django 3.0.8 on 2020-09-24 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_auto_20200814_1007'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='masterpiecereport',
+            index=models.Index(fields=['-created_at'], name='masterpiece_report_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderreport',
+            index=models.Index(fields=['-created_at'], name='order_report_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userreport',
+            index=models.Index(fields=['-created_at'], name='user_report_created_idx'),
+        ),
+    ]
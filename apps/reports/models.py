@@ -55,6 +55,11 @@ class UserReport(Report):
         ordering = ('-created_at',)
         verbose_name = _('User report')
         verbose_name_plural = _('User reports')
+        indexes = (
+            models.Index(
+                fields=('-created_at',), name='user_report_created_idx'
+            ),
+        )
 
 
 class OrderReport(Report):
@@ -75,6 +80,11 @@ class OrderReport(Report):
         ordering = ('-created_at',)
         verbose_name = _('Order report')
         verbose_name_plural = _('Order reports')
+        indexes = (
+            models.Index(
+                fields=('-created_at',), name='order_report_created_idx'
+            ),
+        )
 
 
 class MasterpieceReport(Report):
@@ -95,3 +105,8 @@ class MasterpieceReport(Report):
         ordering = ('-created_at',)
         verbose_name = _('Masterpiece report')
         verbose_name_plural = _('Masterpiece reports')
+        indexes = (
+            models.Index(
+                fields=('-created_at',), name='masterpiece_report_created_idx'
+            ),
+        )
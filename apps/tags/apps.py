@@ -1,8 +1,14 @@
 from django.apps import AppConfig
 
+from apps.core.cache import connect_generations
+
 
 class TagsConfig(AppConfig):
     """Configuration for tags app."""
 
     name = 'apps.tags'
     verbose_name = 'Tags'
+
+    def ready(self):
+        """Connect signals."""
+        connect_generations(self.get_model('Tag'))
@@ -3,6 +3,9 @@ from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from django.utils.translation import ugettext_lazy as _
 from django_object_actions import DjangoObjectActions
 
+from apps.core.admin import UserTrigramSearchAdminMixin
+from apps.core.cache import bump_generation
+
 from .models import User
 
 __all__ = (
@@ -14,17 +17,21 @@ def deactivate(modeladmin, request, queryset):
     """Deactivate all users except superuser."""
     qs = queryset.exclude(is_superuser=True)
     qs.update(is_active=False)
+    bump_generation(User, *qs.values_list('pk', flat=True))
     messages.success(request, f'Deactivated {qs.count()} user(s)')
 
 
 @admin.register(User)
-class UserAdmin(DjangoObjectActions, DjangoUserAdmin):
+class UserAdmin(
+    UserTrigramSearchAdminMixin, DjangoObjectActions, DjangoUserAdmin
+):
     """User admin.
 
     Admin class definitions for ``User`` model.
 
     """
 
+    user_search_relations = ('pk',)
     search_fields = (
         'first_name',
         'last_name',
@@ -65,6 +72,7 @@ class UserAdmin(DjangoObjectActions, DjangoUserAdmin):
                 'last_name',
                 'role',
                 'phone_number',
+                'location',
             )
         }),
         (_('Permissions'), {
@@ -1,8 +1,19 @@
 from django.apps import AppConfig
 
+from apps.core.cache import connect_generations
+
 
 class UsersAppConfig(AppConfig):
     """Configuration for Users app."""
 
     name = 'apps.users'
     verbose_name = 'Users'
+
+    def ready(self):
+        """Connect signals."""
+        connect_generations(
+            self.get_model('User'), ignore_fields=('last_login',)
+        )
+        connect_generations(
+            self.get_model('ArtistStats'), parents=('artist',)
+        )
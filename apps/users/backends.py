@@ -0,0 +1,22 @@
+from django.contrib.auth.backends import ModelBackend
+
+from apps.core.cache import get_objects_cache
+
+from .models import User
+
+__all__ = (
+    'CachedModelBackend',
+)
+
+
+class CachedModelBackend(ModelBackend):
+    """Authentication backend taking session users from two-tier cache.
+
+    Cached users are invalidated by generations of users, so changed
+    password or deactivated user is reloaded by the next request.
+    """
+
+    def get_user(self, user_id):
+        """Return active user by id or None."""
+        user = get_objects_cache(User).get_many([user_id]).get(user_id)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,271 @@
+import heapq
+import logging
+import time
+import uuid
+from collections import defaultdict
+from itertools import islice
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from apps.masterpieces.models import Masterpiece
+from apps.orders.matching import get_recommendations
+from apps.orders.models import Order
+from apps.users.models import User
+
+__all__ = (
+    'DigestMetrics',
+    'TopOrders',
+    'cache_top_orders',
+    'get_artists_tags',
+    'get_top_orders',
+    'iter_artists_chunks',
+    'send_digest_chunk',
+    'send_top_orders_digest',
+)
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SUBJECT = 'Top orders today!'
+DIGEST_TEMPLATE = 'users/emails/top_orders.txt'
+DRY_RUN_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+TOP_ORDERS_KEY = 'top_orders:{}'
+
+
+class DigestMetrics:
+    """Counters and throughput of digest sending."""
+
+    def __init__(self):
+        self.chunks = 0
+        self.artists = 0
+        self.messages = 0
+        self.started_at = time.monotonic()
+
+    def add(self, other):
+        """Add counters of another metrics."""
+        self.chunks += other.chunks
+        self.artists += other.artists
+        self.messages += other.messages
+
+    @property
+    def seconds(self) -> float:
+        """Return seconds passed since start."""
+        return time.monotonic() - self.started_at
+
+    @property
+    def messages_per_second(self) -> float:
+        """Return count of messages sent per second."""
+        return self.messages / max(self.seconds, 1e-9)
+
+    def as_dict(self) -> dict:
+        """Return metrics as a serializable dict."""
+        return {
+            'chunks': self.chunks,
+            'artists': self.artists,
+            'messages': self.messages,
+            'seconds': round(self.seconds, 3),
+            'messages_per_second': round(self.messages_per_second, 1),
+        }
+
+    def __str__(self):
+        return (
+            f'{self.messages} messages to {self.artists} artists in '
+            f'{self.chunks} chunks, {self.seconds:.2f}s, '
+            f'{self.messages_per_second:.1f} messages/s'
+        )
+
+
+class TopOrders:
+    """Open orders index to pick the best orders for an artist.
+
+    Orders are ranked by count of tags shared with the artist and then by
+    views. Only ``per_tag`` most viewed orders of every tag and ``count``
+    most viewed orders overall are kept, so picking is bounded by count of
+    the artist's tags.
+    """
+
+    def __init__(self, count: int, per_tag: int = None):
+        self.count = count
+        per_tag = per_tag or count * 10
+        self.orders = {}
+        self.order_tags = defaultdict(set)
+        open_orders = Order.objects.all_available()
+        for order_id, title, views in open_orders.order_by().values_list(
+            'id', 'title', 'views'
+        ).iterator():
+            self.orders[order_id] = (title, views)
+        tags = Order.tags.through.objects.filter(
+            order__in=open_orders.order_by()
+        ).values_list('order_id', 'tag_id')
+        by_tag = defaultdict(list)
+        for order_id, tag_id in tags.iterator():
+            self.order_tags[order_id].add(tag_id)
+            by_tag[tag_id].append(order_id)
+        self.by_tag = {
+            tag_id: heapq.nlargest(per_tag, orders_ids, key=self._views)
+            for tag_id, orders_ids in by_tag.items()
+        }
+        self.most_viewed = heapq.nlargest(count, self.orders, key=self._views)
+        self._urls = {}
+
+    def _views(self, order_id):
+        return self.orders[order_id][1]
+
+    def get_url(self, order_id: int) -> str:
+        """Return full url of the order."""
+        if order_id not in self._urls:
+            self._urls[order_id] = urljoin(
+                settings.DJANGO_SITE_BASE_HOST,
+                reverse('orders:order-detail', kwargs={'pk': order_id}),
+            )
+        return self._urls[order_id]
+
+    def for_artist(self, tags: set, recommended=()) -> list:
+        """Return top orders for artist as ``(id, title)`` pairs.
+
+        Open ``recommended`` orders go first, the rest is filled with orders
+        ranked by shared tags.
+        """
+        top = [
+            order_id for order_id in recommended if order_id in self.orders
+        ][:self.count]
+        candidates = set(self.most_viewed)
+        for tag_id in tags:
+            candidates.update(self.by_tag.get(tag_id, ()))
+        candidates.difference_update(top)
+        top += heapq.nlargest(
+            self.count - len(top), candidates, key=lambda order_id: (
+                len(self.order_tags[order_id] & tags), self._views(order_id)
+            )
+        )
+        return [(order_id, self.orders[order_id][0]) for order_id in top]
+
+
+def cache_top_orders() -> str:
+    """Build top orders snapshot once for all chunks of the digest.
+
+    Return cache key of the snapshot passed to chunk tasks.
+    """
+    key = TOP_ORDERS_KEY.format(uuid.uuid4().hex)
+    cache.set(
+        key,
+        TopOrders(settings.TOP_ORDERS_DIGEST_COUNT),
+        settings.TOP_ORDERS_DIGEST_CACHE_TIMEOUT,
+    )
+    return key
+
+
+def get_top_orders(key: str = None) -> TopOrders:
+    """Return cached top orders snapshot.
+
+    Snapshot is built again if there is no key or it was evicted.
+    """
+    top_orders = cache.get(key) if key else None
+    if top_orders is None:
+        top_orders = TopOrders(settings.TOP_ORDERS_DIGEST_COUNT)
+    return top_orders
+
+
+def get_artists_tags(artists_ids) -> dict:
+    """Return tags of artists` masterpieces and accepted orders."""
+    tags = defaultdict(set)
+    masterpieces_tags = Masterpiece.tags.through.objects.filter(
+        masterpiece__artist__in=artists_ids
+    ).values_list('masterpiece__artist', 'tag')
+    orders_tags = Order.tags.through.objects.filter(
+        order__offer__artist__in=artists_ids
+    ).values_list('order__offer__artist', 'tag')
+    for artist_id, tag_id in (*masterpieces_tags, *orders_tags):
+        tags[artist_id].add(tag_id)
+    return tags
+
+
+def iter_artists_chunks(chunk_size: int = None):
+    """Stream ids of active artists in lists of ``chunk_size``."""
+    chunk_size = chunk_size or settings.TOP_ORDERS_DIGEST_CHUNK_SIZE
+    artists_ids = User.objects.all().get_artists().filter(
+        is_active=True
+    ).order_by('pk').values_list('pk', flat=True).iterator(
+        chunk_size=chunk_size
+    )
+    while True:
+        chunk = list(islice(artists_ids, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_messages(artists_ids, top_orders: TopOrders):
+    """Return personal digest message for every artist."""
+    artists = User.objects.filter(pk__in=artists_ids).only(
+        'email', 'first_name', 'last_name'
+    )
+    artists_tags = get_artists_tags(artists_ids)
+    recommendations = get_recommendations(artists_ids, top_orders.count)
+    messages = []
+    for artist in artists:
+        orders = [
+            {'title': title, 'url': top_orders.get_url(pk)}
+            for pk, title in top_orders.for_artist(
+                artists_tags[artist.pk], recommendations[artist.pk]
+            )
+        ]
+        if not orders:
+            continue
+        messages.append(EmailMessage(
+            DIGEST_SUBJECT,
+            render_to_string(DIGEST_TEMPLATE, {
+                'artist': artist, 'orders': orders,
+            }),
+            settings.EMAIL_HOST_USER,
+            [artist.email],
+        ))
+    return messages
+
+
+def send_digest_chunk(artists_ids, connection=None, top_orders=None):
+    """Send digest to the artists over one connection.
+
+    Return metrics of the chunk.
+    """
+    metrics = DigestMetrics()
+    if top_orders is None:
+        top_orders = get_top_orders()
+    messages = build_messages(artists_ids, top_orders)
+    connection = connection or get_connection()
+    metrics.chunks = 1
+    metrics.artists = len(artists_ids)
+    metrics.messages = connection.send_messages(messages) or 0
+    logger.info('Top orders digest chunk: %s', metrics)
+    return metrics
+
+
+def send_top_orders_digest(chunk_size: int = None, dry_run: bool = False,
+                           file_path: str = None):
+    """Send digest to all artists in this process.
+
+    Every chunk is sent over the same connection. In dry run messages are
+    written to files in ``file_path`` instead of sending.
+    Return metrics of the whole digest.
+    """
+    if dry_run:
+        connection = get_connection(
+            DRY_RUN_BACKEND,
+            file_path=file_path or settings.TOP_ORDERS_DIGEST_DRY_RUN_PATH,
+        )
+    else:
+        connection = get_connection()
+
+    metrics = DigestMetrics()
+    top_orders = TopOrders(settings.TOP_ORDERS_DIGEST_COUNT)
+    with connection:
+        for artists_ids in iter_artists_chunks(chunk_size):
+            metrics.add(send_digest_chunk(
+                artists_ids, connection=connection, top_orders=top_orders
+            ))
+    logger.info('Top orders digest: %s', metrics)
+    return metrics
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.models import ArtistStats
+
+
+class Command(BaseCommand):
+    """Rebuild artists` stats from masterpieces and offers.
+
+    With ``--check`` only report drift between stored and actual stats and
+    fail if there is any.
+    """
+
+    help = 'Rebuild artists stats and report drift of stored counters.'
+
+    def add_arguments(self, parser):
+        """Add ``--check`` option."""
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only verify stored stats, do not change them.',
+        )
+
+    def handle(self, *args, check=False, **options):
+        """Report drift and rebuild stats."""
+        if check:
+            drift = ArtistStats.objects.get_drift()
+        else:
+            drift = ArtistStats.objects.rebuild()
+
+        for artist_id, changes in sorted(drift.items()):
+            details = ', '.join(
+                f'{field} {stored} -> {actual}'
+                for field, (stored, actual) in changes.items()
+            )
+            self.stdout.write(f'Artist {artist_id}: {details}')
+
+        if check and drift:
+            raise CommandError(f'Stats of {len(drift)} artist(s) drifted.')
+        action = 'Found' if check else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{action} drift in stats of {len(drift)} artist(s).'
+        ))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from apps.orders.counters import flush_order_views
+from apps.users.digest import send_top_orders_digest
+
+
+class Command(BaseCommand):
+    """Send top orders digest to all artists in this process.
+
+    With ``--dry-run`` messages are written to files, which is used to
+    measure digest throughput.
+    """
+
+    help = 'Send top orders digest to artists and report throughput.'
+
+    def add_arguments(self, parser):
+        """Add digest options."""
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Write messages to files instead of sending.',
+        )
+        parser.add_argument(
+            '--file-path',
+            help='Directory for messages written in dry run.',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            help='Count of artists loaded and sent at once.',
+        )
+
+    def handle(self, *args, dry_run=False, file_path=None, chunk_size=None,
+               **options):
+        """Send digest and print metrics."""
+        flush_order_views()
+        metrics = send_top_orders_digest(
+            chunk_size=chunk_size, dry_run=dry_run, file_path=file_path
+        )
+        self.stdout.write(self.style.SUCCESS(str(metrics)))
@@ -1,11 +1,41 @@
+from decimal import ROUND_HALF_UP, Decimal
+
 from django.contrib.auth.models import BaseUserManager
-from django.db.models import Q, QuerySet
+from django.contrib.gis.measure import D
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    Manager,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+    When
+)
+from django.db.models.functions import (
+    Cast,
+    Coalesce,
+    Greatest,
+    NullIf,
+    Upper
+)
 from django.utils.translation import ugettext_lazy as _
 
+from apps.core.cache import bump_generation
+from apps.core.geo import KNNDistance
+from apps.core.search import exact_rank, is_postgresql
 from apps.users.strings import ARTIST_ROLE, CUSTOMER_ROLE
 
 __all__ = (
     'UserManager',
+    'ArtistStatsQuerySet',
+    'ArtistStatsManager',
 )
 
 
@@ -87,13 +117,108 @@ class UserManager(BaseUserManager):
 class UserQuerySet(QuerySet):
     """Custom queryset with a custom filters."""
 
+    trigram_search_fields = ('first_name', 'last_name', 'email')
+
     def search_by(self, value: str):
         """Return queryset filtered by search value."""
+        if is_postgresql(self.db):
+            return self.trigram_search(value)
         return self.filter(
             Q(first_name__icontains=value)
             | Q(last_name__icontains=value)
             | Q(email__icontains=value)
-        ).distinct()
+        )
+
+    def trigram_search(self, value: str):
+        """Return users similar to search value annotated by search_rank.
+
+        Names and emails with typos are found by trigram similarity,
+        beginnings of them are found by prefix and ranked first. Parts of
+        words are found by substring like ``search_by`` on other databases.
+        Requires PostgreSQL with ``pg_trgm`` extension, fields are compared
+        in upper case to use trigram indexes on ``UPPER(field)``.
+        """
+        value = value.strip()
+        uppers = {
+            f'{field}_upper': Upper(field)
+            for field in self.trigram_search_fields
+        }
+        similar = Q()
+        prefix = Q()
+        contains = Q()
+        for name in uppers:
+            similar |= Q(**{f'{name}__trigram_similar': value})
+            prefix |= Q(**{f'{name}__startswith': value.upper()})
+            contains |= Q(**{f'{name}__contains': value.upper()})
+
+        similarity = Greatest(*(
+            TrigramSimilarity(upper, value) for upper in uppers.values()
+        ))
+        prefix_bonus = Case(
+            When(prefix, then=Value(1.0)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+        ordering = self.query.order_by or self.model._meta.ordering
+        return self.annotate(**uppers).filter(
+            similar | prefix | contains
+        ).annotate(
+            search_rank=exact_rank(similarity + prefix_bonus)
+        ).order_by('-search_rank', *ordering)
+
+    def with_artist_stats(self):
+        """Join stored artists` stats.
+
+        Stats are used by ``User.rating`` and
+        ``User.completed_orders_count`` instead of queries per artist.
+        """
+        return self.select_related('stats')
+
+    def with_rating(self, min_rating=0):
+        """Return artists with rating not lower than ``min_rating``.
+
+        Stored rating is annotated as ``stats_rating``, ordering by it and
+        artist id uses ``artist_stats_rating_idx`` index.
+        """
+        return self.filter(stats__rating__gte=min_rating).annotate(
+            stats_rating=F('stats__rating')
+        )
+
+    def with_tags(self, titles):
+        """Return artists whose masterpieces have any of tags ``titles``.
+
+        Count of matched tags is annotated as ``matched_tags``, it is
+        counted by subquery per artist.
+        """
+        masterpiece_tags = self.model._meta.apps.get_model(
+            'masterpieces', 'Masterpiece'
+        ).tags.through
+        matched_tags = masterpiece_tags.objects.filter(
+            masterpiece__artist=OuterRef('pk'), tag__title__in=titles
+        ).order_by().values('masterpiece__artist').annotate(
+            count=Count('tag', distinct=True)
+        ).values('count')
+        return self.annotate(
+            matched_tags=Subquery(matched_tags)
+        ).filter(matched_tags__gt=0)
+
+    def within(self, point, radius: float):
+        """Return users located not farther than ``radius`` km from point.
+
+        ``ST_DWithin`` uses spatial index of ``location``.
+        """
+        return self.filter(location__dwithin=(point, D(km=radius)))
+
+    def nearest(self, point):
+        """Return located users annotated by ``distance`` in meters.
+
+        Ordering by ``distance`` is KNN search by spatial index of
+        ``location``, so nearest users are found without sorting all of
+        them.
+        """
+        return self.filter(location__isnull=False).annotate(
+            distance=KNNDistance('location', point)
+        ).order_by('distance', 'pk')
 
     def get_artists(self):
         """Return all users with role artist."""
@@ -102,3 +227,136 @@ class UserQuerySet(QuerySet):
     def get_customers(self):
         """Return all users with role customer."""
         return self.filter(role=CUSTOMER_ROLE)
+
+
+class ArtistStatsQuerySet(QuerySet):
+    """Custom queryset for artist stats counters."""
+
+    counters = (
+        'rating_sum',
+        'rating_count',
+        'completed_orders',
+        'active_orders',
+        'accepted_offers',
+        'fee_sum',
+    )
+
+    def increment(self, artist_id: int, **deltas):
+        """Add deltas to artist counters with one ``UPDATE``.
+
+        Counters are changed by the database, so concurrent increments are
+        not lost. Stored rating is recalculated when rating counters change.
+        Missing stats row is created. Cache generation of stats is bumped.
+        """
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        values = {
+            field: F(field) + delta for field, delta in deltas.items()
+        }
+        if 'rating_sum' in deltas or 'rating_count' in deltas:
+            rating_sum = F('rating_sum') + deltas.get('rating_sum', 0)
+            rating_count = F('rating_count') + deltas.get('rating_count', 0)
+            values['rating'] = Coalesce(
+                Cast(rating_sum, FloatField()) / NullIf(rating_count, 0),
+                0,
+            )
+        if not self.filter(artist_id=artist_id).update(**values):
+            self.bulk_create(
+                [self.model(artist_id=artist_id)], ignore_conflicts=True
+            )
+            self.filter(artist_id=artist_id).update(**values)
+        bump_generation(self.model, artist_id, using=self.db)
+
+    def calculate(self) -> dict:
+        """Return actual counters of all artists.
+
+        Counters are calculated from masterpieces and accepted offers with
+        a grouped query per table.
+        """
+        apps = self.model._meta.apps
+        user_model = apps.get_model('users', 'User')
+        masterpiece_model = apps.get_model('masterpieces', 'Masterpiece')
+        offer_model = apps.get_model('offers', 'Offer')
+
+        stats = {
+            artist_id: dict.fromkeys(self.counters, 0)
+            for artist_id in user_model.objects.filter(
+                role=ARTIST_ROLE
+            ).values_list('pk', flat=True)
+        }
+        masterpieces = masterpiece_model.objects.order_by().values(
+            'artist'
+        ).annotate(
+            rating_sum=Coalesce(Sum('customer_rate'), 0),
+            rating_count=Count('customer_rate'),
+            completed_orders=Count('pk', filter=Q(order__isnull=False)),
+        )
+        offers = offer_model.objects.filter(
+            accepted_at__isnull=False, declined_at__isnull=True
+        ).order_by().values('artist').annotate(
+            accepted_offers=Count('pk'),
+            active_orders=Count(
+                'pk', filter=Q(accepted_order__completed_at__isnull=True)
+            ),
+            fee_sum=Sum('fee'),
+        )
+        for row in (*masterpieces, *offers):
+            counters = stats.setdefault(
+                row.pop('artist'), dict.fromkeys(self.counters, 0)
+            )
+            counters.update(row)
+
+        for counters in stats.values():
+            counters['rating'] = Decimal(0)
+            if counters['rating_count']:
+                counters['rating'] = (
+                    Decimal(counters['rating_sum']) / counters['rating_count']
+                ).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        return stats
+
+    def get_drift(self, actual: dict = None) -> dict:
+        """Return differences between stored and actual counters.
+
+        Result is ``{artist_id: {field: (stored, actual)}}``, artists without
+        stored stats have None as stored values.
+        """
+        if actual is None:
+            actual = self.calculate()
+        fields = (*self.counters, 'rating')
+        stored = {
+            row['artist']: row for row in self.values('artist', *fields)
+        }
+        drift = {}
+        for artist_id, counters in actual.items():
+            row = stored.get(artist_id, {})
+            changes = {
+                field: (row.get(field), value)
+                for field, value in counters.items()
+                if row.get(field) != value
+            }
+            if changes:
+                drift[artist_id] = changes
+        return drift
+
+    def rebuild(self) -> dict:
+        """Replace drifted stored counters with actual ones.
+
+        Stored stats are locked while counters are calculated, so concurrent
+        increments wait for rebuild. Return the fixed drift.
+        """
+        with transaction.atomic():
+            list(self.select_for_update().values_list('pk', flat=True))
+            actual = self.calculate()
+            drift = self.get_drift(actual)
+            for artist_id in drift:
+                self.update_or_create(
+                    artist_id=artist_id, defaults=actual[artist_id]
+                )
+        return drift
+
+
+class ArtistStatsManager(Manager.from_queryset(ArtistStatsQuerySet)):
+    """Artist stats manager available in migrations."""
+
+    use_in_migrations = True
@@ -0,0 +1,26 @@
+# Generated by Django 3.0.8 on 2020-09-02 11:24
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from apps.core.operations import PostgreSQLRunSQL
+
+TRIGRAM_INDEXED_FIELDS = ('first_name', 'last_name', 'email')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+    ] + [
+        PostgreSQLRunSQL(
+            f'CREATE INDEX users_{field}_trgm_idx ON users '
+            f'USING gin (UPPER({field}::text) gin_trgm_ops);',
+            f'DROP INDEX users_{field}_trgm_idx;',
+        )
+        for field in TRIGRAM_INDEXED_FIELDS
+    ]
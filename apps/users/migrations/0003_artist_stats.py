@@ -0,0 +1,50 @@
+# Generated by Django 3.0.8 on 2020-09-03 10:12
+
+import apps.users.managers
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_artist_stats(apps, schema_editor):
+    """Calculate stats of existing artists."""
+    ArtistStats = apps.get_model('users', 'ArtistStats')
+    ArtistStats.objects.using(schema_editor.connection.alias).rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_trigram_indexes'),
+        ('masterpieces', '0003_search_vector'),
+        ('offers', '0002_auto_20200814_1007'),
+        ('orders', '0004_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArtistStats',
+            fields=[
+                ('artist', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='users.User', verbose_name='Artist')),
+                ('rating_sum', models.IntegerField(default=0, verbose_name='Rating sum')),
+                ('rating_count', models.IntegerField(default=0, verbose_name='Rating count')),
+                ('rating', models.DecimalField(decimal_places=2, default=0, max_digits=3, verbose_name='Rating')),
+                ('completed_orders', models.IntegerField(default=0, verbose_name='Completed orders')),
+                ('active_orders', models.IntegerField(default=0, verbose_name='Active orders')),
+                ('accepted_offers', models.IntegerField(default=0, verbose_name='Accepted offers')),
+                ('fee_sum', models.DecimalField(decimal_places=0, default=0, max_digits=14, verbose_name='Fee sum')),
+            ],
+            options={
+                'verbose_name': 'Artist stats',
+                'verbose_name_plural': 'Artists stats',
+                'db_table': 'artist_stats',
+            },
+            managers=[
+                ('objects', apps.users.managers.ArtistStatsManager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='artiststats',
+            index=models.Index(fields=['-rating', 'artist'], name='artist_stats_rating_idx'),
+        ),
+        migrations.RunPython(fill_artist_stats, migrations.RunPython.noop),
+    ]
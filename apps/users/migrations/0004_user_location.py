@@ -0,0 +1,19 @@
+# Generated by Django 3.0.8 on 2020-09-09 12:40
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_artist_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='location',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, geography=True, help_text='Where artist works or customer needs a masterpiece.', null=True, srid=4326, verbose_name='Location'),
+        ),
+    ]
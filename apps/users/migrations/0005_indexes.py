@@ -0,0 +1,17 @@
+# Generated by Django 3.0.8 on 2020-09-24 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_user_location'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'email'], name='users_role_idx'),
+        ),
+    ]
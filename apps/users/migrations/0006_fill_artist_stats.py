@@ -0,0 +1,23 @@
+# Generated by Django 3.0.8 on 2020-09-25 10:20
+
+from django.db import migrations
+
+
+def fill_artist_stats(apps, schema_editor):
+    """Replace missing and drifted stats of artists with actual ones."""
+    ArtistStats = apps.get_model('users', 'ArtistStats')
+    ArtistStats.objects.using(schema_editor.connection.alias).rebuild()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_indexes'),
+        ('masterpieces', '0004_indexes'),
+        ('offers', '0004_indexes'),
+        ('orders', '0007_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_artist_stats, migrations.RunPython.noop),
+    ]
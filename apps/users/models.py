@@ -1,23 +1,26 @@
+from decimal import Decimal
 from statistics import mean
 from urllib.parse import urljoin
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from django.contrib.gis.db.models import PointField
 from django.db import models
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 from phonenumber_field.modelfields import PhoneNumberField
 
-from apps.masterpieces.models import Masterpiece
-from apps.users.managers import UserManager
+from apps.core.models import DirtyFieldsMixin
+from apps.users.managers import ArtistStatsManager, UserManager
 from apps.users.strings import ARTIST_ROLE, CUSTOMER_ROLE
 
 __all__ = (
     'User',
+    'ArtistStats',
 )
 
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(DirtyFieldsMixin, AbstractBaseUser, PermissionsMixin):
     """Custom user model.
 
     Attributes:
@@ -29,6 +32,7 @@ class User(AbstractBaseUser, PermissionsMixin):
         date_joined (datetime): Date when the account was created.
         role (str): Role of user (artist or customer).
         phone_number (str): Phone number.
+        location (Point): Geographic location for physical commissions.
 
     Nested attributes:
         is_superuser (bool): The user can super access to admin UI.
@@ -81,6 +85,13 @@ class User(AbstractBaseUser, PermissionsMixin):
         help_text=_('Users phone number. '
                     'It has to be a phone number with country code.'),
     )
+    location = PointField(
+        geography=True,
+        null=True,
+        blank=True,
+        verbose_name=_('Location'),
+        help_text=_('Where artist works or customer needs a masterpiece.'),
+    )
     objects = UserManager()
 
     class Meta:
@@ -88,6 +99,9 @@ class User(AbstractBaseUser, PermissionsMixin):
         ordering = ('email',)
         verbose_name = _('User')
         verbose_name_plural = _('Users')
+        indexes = (
+            models.Index(fields=('role', 'email'), name='users_role_idx'),
+        )
 
     def __str__(self):
         return self.email
@@ -96,10 +110,18 @@ class User(AbstractBaseUser, PermissionsMixin):
         """Save user method.
 
         Save role field in uppercase.
+        Create empty stats for new artist or user who became an artist.
         """
         if self.role:
             self.role = self.role.upper()
+        became_artist = (
+            self.role == ARTIST_ROLE and 'role' in self.changed_fields
+        )
         super().save(*args, **kwargs)
+        if became_artist:
+            ArtistStats.objects.bulk_create(
+                [ArtistStats(artist_id=self.pk)], ignore_conflicts=True
+            )
 
     def get_full_name(self):
         """Return last name and first name of user."""
@@ -130,11 +152,23 @@ class User(AbstractBaseUser, PermissionsMixin):
             reverse('admin:users_user_change', args=(self.id,)),
         )
 
+    def _get_loaded_stats(self):
+        """Return stats if they were loaded with ``with_artist_stats``."""
+        if not User.stats.is_cached(self):
+            return None
+        try:
+            return self.stats
+        except ArtistStats.DoesNotExist:
+            return None
+
     @property
     def rating(self):
         """Return the user's rating for all orders completed by him."""
-        feedbacks = Masterpiece.objects.filter(
-            artist=self, customer_rate__isnull=False
+        stats = self._get_loaded_stats()
+        if stats is not None:
+            return stats.average_rating
+        feedbacks = self.masterpieces.filter(
+            customer_rate__isnull=False
         ).values_list('customer_rate', flat=True)
         if feedbacks:
             return round(mean(feedbacks), 2)
@@ -142,4 +176,92 @@ class User(AbstractBaseUser, PermissionsMixin):
     @property
     def completed_orders_count(self):
         """Return count of completed by user orders."""
+        stats = self._get_loaded_stats()
+        if stats is not None:
+            return stats.completed_orders
         return self.masterpieces.filter(order__isnull=False).count()
+
+
+class ArtistStats(models.Model):
+    """Artist stats model.
+
+    Counters are updated incrementally by masterpieces and offers changes,
+    ``rebuild_artist_stats`` command recalculates them from scratch.
+
+    Attributes:
+        artist (User): Artist of stats.
+        rating_sum (int): Sum of customer rates of artists` masterpieces.
+        rating_count (int): Count of rated masterpieces.
+        rating (decimal): Average rate, 0 if there are no rates yet.
+        completed_orders (int): Count of masterpieces created on orders.
+        active_orders (int): Count of accepted not completed orders.
+        accepted_offers (int): Count of accepted offers.
+        fee_sum (decimal): Sum of accepted offers fees.
+    """
+
+    artist = models.OneToOneField(
+        'users.User',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name=_('Artist'),
+    )
+    rating_sum = models.IntegerField(
+        default=0,
+        verbose_name=_('Rating sum'),
+    )
+    rating_count = models.IntegerField(
+        default=0,
+        verbose_name=_('Rating count'),
+    )
+    rating = models.DecimalField(
+        default=0,
+        max_digits=3,
+        decimal_places=2,
+        verbose_name=_('Rating'),
+    )
+    completed_orders = models.IntegerField(
+        default=0,
+        verbose_name=_('Completed orders'),
+    )
+    active_orders = models.IntegerField(
+        default=0,
+        verbose_name=_('Active orders'),
+    )
+    accepted_offers = models.IntegerField(
+        default=0,
+        verbose_name=_('Accepted offers'),
+    )
+    fee_sum = models.DecimalField(
+        default=0,
+        max_digits=14,
+        decimal_places=0,
+        verbose_name=_('Fee sum'),
+    )
+
+    objects = ArtistStatsManager()
+
+    class Meta:
+        db_table = 'artist_stats'
+        verbose_name = _('Artist stats')
+        verbose_name_plural = _('Artists stats')
+        indexes = (
+            models.Index(
+                fields=('-rating', 'artist'), name='artist_stats_rating_idx'
+            ),
+        )
+
+    def __str__(self):
+        return str(self.artist_id)
+
+    @property
+    def average_rating(self):
+        """Return average customer rate or None if there are no rates."""
+        if self.rating_count:
+            return round(self.rating_sum / self.rating_count, 2)
+
+    @property
+    def average_fee(self):
+        """Return average fee of accepted offers."""
+        if self.accepted_offers:
+            return round(Decimal(self.fee_sum) / self.accepted_offers, 2)
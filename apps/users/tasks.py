@@ -1,29 +1,36 @@
+from celery.decorators import periodic_task, task
 from celery.task.schedules import crontab
-from celery.decorators import periodic_task
-from django.core.mail import send_mail
-from .models import User
-from .strings import ARTIST_ROLE
-from ..orders.models import Order
+
+from ..core.outbox import enqueue_tasks
+from ..orders.counters import flush_order_views
+from .digest import (
+    cache_top_orders,
+    get_top_orders,
+    iter_artists_chunks,
+    send_digest_chunk,
+)
 
 
 @periodic_task(run_every=(crontab(minute=0, hour=9)), name="send_top_orders")
 def send_top_orders():
-    """Send top of orders for artists every day"""
+    """Send personal top of orders for artists every day.
+
+    Artists are split into chunks, every chunk is sent by a separate task
+    dispatched through the outbox. Top orders are built once and cached
+    for all chunks.
+    """
+    flush_order_views()
+    top_orders_key = cache_top_orders()
+    chunks = enqueue_tasks('send_top_orders_chunk', (
+        (artists_ids, top_orders_key)
+        for artists_ids in iter_artists_chunks()
+    ))
+    return len(chunks)
 
-    orders_count = 10
-    artists_mails = [d['email'] for d in
-                     User.objects.filter(role=ARTIST_ROLE).values('email')]
-    top_open_orders = Order.objects.filter(offer__isnull=True).order_by(
-        '-views')[:orders_count]
-    orders_titles = [d['title'] for d in
-                     top_open_orders.values('title')]
 
-    subject = 'Top orders today!'
-    titles_str = '\n'.join(orders_titles)
-    message = f'This orders are waiting for you:\n\n{titles_str}'
-    return send_mail(
-        subject,
-        message,
-        'art-orders@mail.ru',
-        artists_mails,
-    )
+@task(name='send_top_orders_chunk')
+def send_top_orders_chunk(artists_ids, top_orders_key=None):
+    """Send top of orders to the chunk of artists over one connection."""
+    return send_digest_chunk(
+        artists_ids, top_orders=get_top_orders(top_orders_key)
+    ).as_dict()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+
+from django.core import mail
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import OutboxMessage
+from apps.masterpieces.factories import MasterpieceFactory
+from apps.orders.factories import OrderFactory
+from apps.orders.models import Order, OrderRecommendation
+from apps.tags.factories import TagFactory
+from apps.users.digest import TopOrders, send_top_orders_digest
+from apps.users.factories import ArtistFactory
+from apps.users.models import User
+from apps.users.tasks import send_top_orders, send_top_orders_chunk
+
+
+@override_settings(TOP_ORDERS_DIGEST_COUNT=2)
+class TopOrdersDigestTest(TestCase):
+    """Tests for personal top orders digest."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create artist with tagged masterpiece and open orders."""
+        cls.tag = TagFactory(title='portrait')
+        cls.artist = ArtistFactory()
+        MasterpieceFactory(artist=cls.artist).tags.add(cls.tag)
+        cls.other_artist = ArtistFactory()
+        cls.tagged_order = OrderFactory(title='Tagged order')
+        cls.tagged_order.tags.add(cls.tag)
+        for views, title in ((50, 'Popular order'), (10, 'Boring order')):
+            OrderFactory(title=title)
+            Order.objects.filter(title=title).update(views=views)
+        return super().setUpTestData()
+
+    def test_top_orders(self):
+        """Orders with artist tags should be first, then most viewed."""
+        top_orders = TopOrders(count=2)
+        self.assertEqual(
+            [title for _, title in top_orders.for_artist({self.tag.pk})],
+            ['Tagged order', 'Popular order'],
+        )
+        self.assertEqual(
+            [title for _, title in top_orders.for_artist(set())],
+            ['Popular order', 'Boring order'],
+        )
+
+    def test_recommended_first(self):
+        """Recommended orders should be first in the digest."""
+        boring_order = Order.objects.get(title='Boring order')
+        OrderRecommendation.objects.create(
+            artist=self.other_artist, order=boring_order, score=1
+        )
+        send_top_orders_digest()
+        message = next(
+            message for message in mail.outbox
+            if message.to == [self.other_artist.email]
+        )
+        self.assertLess(
+            message.body.index('Boring order'),
+            message.body.index('Popular order'),
+        )
+
+    def test_send(self):
+        """Every artist should get a personal message."""
+        with self.assertNumQueries(7):
+            metrics = send_top_orders_digest(chunk_size=100)
+
+        artists = User.objects.all().get_artists()
+        self.assertEqual(metrics.messages, artists.count())
+        self.assertEqual(len(mail.outbox), artists.count())
+        messages = {message.to[0]: message.body for message in mail.outbox}
+        self.assertIn('Tagged order', messages[self.artist.email])
+        self.assertNotIn('Tagged order', messages[self.other_artist.email])
+        self.assertIn(f'/orders/{self.tagged_order.pk}/',
+                      messages[self.artist.email])
+
+    def test_dry_run(self):
+        """Dry run should write messages to files."""
+        with tempfile.TemporaryDirectory() as file_path:
+            metrics = send_top_orders_digest(
+                chunk_size=1, dry_run=True, file_path=file_path
+            )
+            self.assertEqual(len(mail.outbox), 0)
+            self.assertEqual(metrics.chunks, metrics.artists)
+            self.assertTrue(os.listdir(file_path))
+
+    @override_settings(
+        ORDER_VIEWS_BUFFER_URL=None, TOP_ORDERS_DIGEST_CHUNK_SIZE=1
+    )
+    def test_chunks_share_top_orders(self):
+        """Open orders should be loaded once for all chunk tasks."""
+        artists_count = User.objects.all().get_artists().count()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(send_top_orders(), artists_count)
+            for message in OutboxMessage.objects.filter(
+                name='send_top_orders_chunk'
+            ):
+                args, kwargs = message.get_arguments()
+                send_top_orders_chunk(*args, **kwargs)
+
+        orders_query = 'SELECT "orders"."id", "orders"."title"'
+        self.assertEqual(len([
+            query for query in queries.captured_queries
+            if orders_query in query['sql']
+        ]), 1)
+        self.assertEqual(len(mail.outbox), artists_count)
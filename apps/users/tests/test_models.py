@@ -1,8 +1,18 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
 from django.db import IntegrityError
 from django.test import TestCase
 
+from apps.masterpieces.factories import MasterpieceFactory
+from apps.masterpieces.models import Masterpiece
+from apps.offers.factories import OfferFactory
+from apps.offers.models import Offer
+from apps.orders.models import Order
 from apps.users.factories import ArtistFactory, CustomerFactory, UserFactory
-from apps.users.models import User
+from apps.users.models import ArtistStats, User
 
 
 class UserModelTest(TestCase):
@@ -43,3 +53,108 @@ class UserModelTest(TestCase):
         """Artist should have correct role in uppercase."""
         user = ArtistFactory()
         self.assertEqual(user.role, User.ROLES.ARTIST)
+
+
+class ArtistStatsTest(TestCase):
+    """Tests for incrementally updated artist stats."""
+
+    def setUp(self):
+        """Create artist with an offer on order."""
+        self.artist = ArtistFactory()
+        self.offer = OfferFactory(artist=self.artist, fee=100)
+
+    def get_stats(self):
+        """Return stored stats of test artist."""
+        return ArtistStats.objects.get(artist=self.artist)
+
+    def test_created_with_artist(self):
+        """New artist should have empty stats."""
+        stats = self.get_stats()
+        self.assertEqual(stats.accepted_offers, 0)
+        self.assertEqual(stats.rating, 0)
+        self.assertIsNone(stats.average_rating)
+
+    def test_created_with_role(self):
+        """Customer who became an artist should get empty stats."""
+        customer = CustomerFactory()
+        customer.role = User.ROLES.ARTIST
+        customer.save()
+        self.assertTrue(ArtistStats.objects.filter(artist=customer).exists())
+        self.assertIn(
+            customer, User.objects.all().with_rating(0)
+        )
+
+    def test_offer_accepted(self):
+        """Accepted offer should be counted as active order."""
+        self.offer.accept()
+        stats = self.get_stats()
+        self.assertEqual(stats.accepted_offers, 1)
+        self.assertEqual(stats.active_orders, 1)
+        self.assertEqual(stats.average_fee, 100)
+
+        self.offer.decline()
+        stats = self.get_stats()
+        self.assertEqual(stats.accepted_offers, 0)
+        self.assertEqual(stats.active_orders, 0)
+        self.assertEqual(stats.fee_sum, 0)
+        order = Order.objects.get(pk=self.offer.order_id)
+        self.assertIsNone(order.offer)
+        self.assertEqual(order.status, Order.Status.OPEN)
+
+    def test_decline_delivered(self):
+        """Accepted offer of order with masterpiece should not be declined."""
+        self.offer.accept()
+        Masterpiece.objects.create(
+            artist=self.artist, order=self.offer.order, title='Title'
+        )
+        with self.assertRaises(ValidationError):
+            Offer.objects.get(pk=self.offer.pk).decline()
+
+        order = Order.objects.get(pk=self.offer.order_id)
+        self.assertEqual(order.offer_id, self.offer.pk)
+        self.assertEqual(order.status, Order.Status.READY)
+        self.assertIsNone(Offer.objects.get(pk=self.offer.pk).declined_at)
+        stats = self.get_stats()
+        self.assertEqual(stats.accepted_offers, 1)
+        self.assertEqual(stats.completed_orders, 1)
+
+    def test_masterpiece_rated(self):
+        """Rated masterpiece should complete order and change rating."""
+        self.offer.accept()
+        masterpiece = Masterpiece.objects.create(
+            artist=self.artist, order=self.offer.order, title='Title'
+        )
+        stats = self.get_stats()
+        self.assertEqual(stats.completed_orders, 1)
+        self.assertEqual(stats.rating_count, 0)
+
+        masterpiece.customer_rate = 4
+        masterpiece.save()
+        stats = self.get_stats()
+        self.assertEqual(stats.active_orders, 0)
+        self.assertEqual(stats.rating_count, 1)
+        self.assertEqual(stats.rating, 4)
+
+        masterpiece.delete()
+        stats = self.get_stats()
+        self.assertEqual(stats.completed_orders, 0)
+        self.assertEqual(stats.rating_count, 0)
+        self.assertEqual(stats.rating, 0)
+
+    def test_rebuild(self):
+        """Command should find and fix drifted stats."""
+        self.offer.accept()
+        MasterpieceFactory(artist=self.artist, customer_rate=5)
+        MasterpieceFactory(artist=self.artist, customer_rate=4)
+        ArtistStats.objects.all().delete()
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_artist_stats', '--check', stdout=StringIO())
+        call_command('rebuild_artist_stats', stdout=StringIO())
+        call_command('rebuild_artist_stats', '--check', stdout=StringIO())
+
+        stats = self.get_stats()
+        self.assertEqual(stats.rating, Decimal('4.5'))
+        self.assertEqual(stats.completed_orders, 2)
+        self.assertEqual(stats.accepted_offers, 1)
+        self.assertEqual(stats.active_orders, 1)
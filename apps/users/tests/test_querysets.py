@@ -0,0 +1,52 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+from apps.users.factories import ArtistFactory
+from apps.users.models import User
+
+
+class UserSearchTest(TestCase):
+    """Tests for users search."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create artists with similar names."""
+        cls.johnson = ArtistFactory(
+            first_name='Robert', last_name='Johnson', email='rj@mail.com'
+        )
+        cls.johnston = ArtistFactory(
+            first_name='Anna', last_name='Johnston', email='aj@mail.com'
+        )
+        cls.smith = ArtistFactory(
+            first_name='Will', last_name='Smith', email='ws@mail.com'
+        )
+        return super().setUpTestData()
+
+    def test_search(self):
+        """Users should be found by part of name."""
+        self.assertEqual(
+            set(User.objects.all().search_by('Johns')),
+            {self.johnson, self.johnston},
+        )
+
+    @skipUnless(connection.vendor == 'postgresql', 'Requires PostgreSQL')
+    def test_typo(self):
+        """Users should be found by name with typo, closest first."""
+        found = list(User.objects.all().trigram_search('jonhson'))
+        self.assertEqual(found[0], self.johnson)
+        self.assertNotIn(self.smith, found)
+
+    def test_substring(self):
+        """Users should be found by part of word in the middle."""
+        self.assertEqual(
+            list(User.objects.all().search_by('hnst')), [self.johnston]
+        )
+
+    @skipUnless(connection.vendor == 'postgresql', 'Requires PostgreSQL')
+    def test_prefix(self):
+        """Users should be found by beginning of email."""
+        self.assertEqual(
+            list(User.objects.all().trigram_search('ws@')), [self.smith]
+        )
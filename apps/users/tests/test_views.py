@@ -0,0 +1,154 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.test import Client, TestCase, override_settings
+
+from apps.core.geo import is_postgis, make_point
+from apps.masterpieces.factories import MasterpieceFactory
+from apps.tags.factories import TagFactory
+from apps.users.factories import ArtistFactory, CustomerFactory
+
+client = Client()
+
+# lists are rendered from the database by every request
+DUMMY_CACHES = {
+    **settings.CACHES,
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'},
+}
+
+
+@override_settings(CACHES=DUMMY_CACHES)
+class ArtistsListTest(TestCase):
+    """Tests for artists list view."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create artists with rated masterpieces."""
+        cls.artist = ArtistFactory()
+        MasterpieceFactory(artist=cls.artist, customer_rate=5)
+        MasterpieceFactory(artist=cls.artist, customer_rate=4)
+        MasterpieceFactory(artist=cls.artist, order=None)
+        for _ in range(5):
+            MasterpieceFactory(customer_rate=3)
+        return super().setUpTestData()
+
+    def test_queries_count(self):
+        """Artists page should not make queries per artist."""
+        with self.assertNumQueries(2):
+            response = client.get('/users/artists/')
+        self.assertEqual(200, response.status_code)
+
+    def test_stats(self):
+        """Annotated stats should be equal to calculated by properties."""
+        artist = next(
+            artist for artist in client.get('/users/artists/').context[
+                'artists'
+            ] if artist == self.artist
+        )
+        self.assertEqual(artist.rating, self.artist.rating)
+        self.assertEqual(artist.rating, 4.5)
+        self.assertEqual(
+            artist.completed_orders_count, self.artist.completed_orders_count
+        )
+        self.assertEqual(artist.completed_orders_count, 2)
+
+    def test_ordering_by_rating(self):
+        """Artists should be ordered and filtered by stored rating."""
+        response = client.get(
+            '/users/artists/', {'ordering': 'rating', 'min_rating': '3.5'}
+        )
+        self.assertEqual(list(response.context['artists']), [self.artist])
+
+        ratings = [
+            artist.stats_rating for artist in client.get(
+                '/users/artists/', {'ordering': 'rating'}
+            ).context['artists']
+        ]
+        self.assertEqual(ratings[0], 4.5)
+        self.assertEqual(ratings, sorted(ratings, reverse=True))
+
+    def test_tags(self):
+        """Artists should be ordered by matched tags and then by rating."""
+        portrait, landscape = TagFactory(title='portrait'), TagFactory(
+            title='landscape'
+        )
+        self.artist.masterpieces.first().tags.add(portrait)
+        low_rated = MasterpieceFactory(customer_rate=2)
+        low_rated.tags.add(portrait, landscape)
+        rated = MasterpieceFactory(customer_rate=3)
+        rated.tags.add(landscape)
+        unrated = MasterpieceFactory()
+        unrated.tags.add(landscape)
+
+        response = client.get(
+            '/users/artists/', {'tag': ['Portrait', 'landscape']}
+        )
+        self.assertEqual(list(response.context['artists']), [
+            low_rated.artist, self.artist, rated.artist, unrated.artist,
+        ])
+        response = client.get(
+            '/users/artists/', {'tag': 'landscape', 'min_rating': '2.5'}
+        )
+        self.assertEqual(list(response.context['artists']), [rated.artist])
+
+    def test_invalid_location(self):
+        """Not valid location parameters should be ignored."""
+        response = client.get('/users/artists/', {
+            'ordering': 'distance', 'lat': 'nan', 'lng': '37.6',
+            'radius': 'inf',
+        })
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            list(response.context['artists']),
+            list(client.get('/users/artists/').context['artists']),
+        )
+
+
+@skipUnless(is_postgis(), 'Spatial queries require PostGIS.')
+@override_settings(CACHES=DUMMY_CACHES)
+class ArtistsLocationTest(TestCase):
+    """Tests for searching of nearest artists."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create artists at different distances from the center."""
+        cls.center = {'lat': '55.75', 'lng': '37.62'}
+        cls.near = ArtistFactory(location=make_point(55.76, 37.62))
+        cls.middle = ArtistFactory(location=make_point(55.9, 37.62))
+        cls.far = ArtistFactory(location=make_point(59.94, 30.31))
+        ArtistFactory()
+        MasterpieceFactory(artist=cls.middle, customer_rate=5)
+        MasterpieceFactory(artist=cls.near, customer_rate=2)
+        return super().setUpTestData()
+
+    def test_ordering_by_distance(self):
+        """Located artists should be ordered from the nearest."""
+        response = client.get(
+            '/users/artists/', {'ordering': 'distance', **self.center}
+        )
+        artists = list(response.context['artists'])
+        self.assertEqual(artists, [self.near, self.middle, self.far])
+        self.assertAlmostEqual(artists[0].distance, 1113, delta=5)
+
+    def test_radius(self):
+        """Artists should be filtered by radius and rating together."""
+        params = {'radius': '50', **self.center}
+        response = client.get('/users/artists/', params)
+        self.assertEqual(
+            set(response.context['artists']), {self.near, self.middle}
+        )
+        response = client.get(
+            '/users/artists/', {'min_rating': '3', **params}
+        )
+        self.assertEqual(list(response.context['artists']), [self.middle])
+
+    def test_users_location(self):
+        """Location of user should be used without coordinates."""
+        client.force_login(
+            CustomerFactory(location=make_point(55.75, 37.62))
+        )
+        response = client.get(
+            '/users/artists/', {'ordering': 'distance', 'radius': '5'}
+        )
+        client.logout()
+        self.assertEqual(list(response.context['artists']), [self.near])
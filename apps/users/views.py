@@ -1,12 +1,19 @@
+from decimal import Decimal, InvalidOperation
+
 from django.contrib.auth import login
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
 from django.views.generic import DetailView, FormView, UpdateView
 from django.views.generic.base import View
 
-from ..core.views import ListSearchView
+from ..core.views import (
+    CachedListMixin,
+    ListSearchView,
+    LocationFilterMixin,
+)
+from ..masterpieces.models import Masterpiece
 from .forms import UserForm
-from .models import User
+from .models import ArtistStats, User
 
 __all__ = (
     'AccountsRegisterView',
@@ -36,15 +43,85 @@ class AccountsRegisterView(FormView):
         return super().form_valid(form)
 
 
-class ArtistsList(ListSearchView):
-    """View for list all artists."""
+class ArtistsList(CachedListMixin, LocationFilterMixin, ListSearchView):
+    """View for list all artists.
+
+    Artists can be ordered by rating with ``?ordering=rating`` and filtered
+    with ``?min_rating=``. Artists filtered by tags of masterpieces with
+    ``?tag=`` are ordered by count of matched tags and then by rating.
+    Located artists can be ordered from the nearest
+    with ``?ordering=distance`` and filtered by ``?radius=``. Lists are
+    cached once for all users located at the same point.
+    """
 
     paginate_by = 10
+    cursor_ordering = ('email',)
+    rating_cursor_ordering = ('-stats_rating', 'id')
+    tags_cursor_ordering = ('-matched_tags', '-stats_rating', 'id')
+    distance_cursor_ordering = ('distance', 'id')
     template_name = 'users/artists_list.html'
+    list_template_name = 'users/artists_list_items.html'
     context_object_name = 'artists'
-    queryset = User.objects.all().get_artists().prefetch_related(
-        'masterpieces',
-    )
+    cache_models = (User, ArtistStats, Masterpiece)
+    queryset = User.objects.all().get_artists().with_artist_stats()
+
+    def get_cache_scope(self):
+        """Return point if artists are filtered or ordered by it."""
+        point = self.get_point()
+        if point is not None and (
+                self.get_radius() is not None or
+                self.is_ordered_by_distance()):
+            return (point.coords,)
+        return ()
+
+    def is_ordered_by_rating(self):
+        """Return True if artists are ordered by rating."""
+        return self.request.GET.get('ordering') == 'rating'
+
+    def is_ordered_by_distance(self):
+        """Return True if artists are ordered by distance to the point."""
+        return (
+            self.request.GET.get('ordering') == 'distance' and
+            self.get_point() is not None
+        )
+
+    def get_min_rating(self):
+        """Return minimal rating from query or None if it is not valid."""
+        try:
+            min_rating = Decimal(self.request.GET['min_rating'])
+        except (KeyError, InvalidOperation):
+            return None
+        return min_rating if min_rating.is_finite() else None
+
+    def get_tags(self) -> list:
+        """Return titles of requested tags."""
+        return [
+            title.strip().lower() for title in self.request.GET.getlist('tag')
+            if title.strip()
+        ]
+
+    def get_queryset(self):
+        """Filter artists by minimal rating and tags, order by distance."""
+        queryset = super().get_queryset()
+        min_rating = self.get_min_rating()
+        tags = self.get_tags()
+        if min_rating is not None or self.is_ordered_by_rating() or tags:
+            queryset = queryset.with_rating(min_rating or 0)
+        if tags:
+            queryset = queryset.with_tags(tags)
+        if self.is_ordered_by_distance():
+            queryset = queryset.nearest(self.get_point())
+        return queryset
+
+    def get_cursor_ordering(self):
+        """Return distance, tags or rating ordering if it is requested."""
+        if self.is_ordered_by_distance():
+            return self.distance_cursor_ordering
+        if self.get_tags():
+            return self.tags_cursor_ordering
+        if self.is_ordered_by_rating():
+            return self.rating_cursor_ordering
+        return super().get_cursor_ordering()
 
 
 class UserProfileBaseView(LoginRequiredMixin, View):
@@ -69,7 +146,7 @@ class UserUpdateView(UserProfileBaseView, UpdateView):
     """View to update users` profile."""
 
     model = User
-    fields = ['last_name', 'first_name', 'phone_number', ]
+    fields = ['last_name', 'first_name', 'phone_number', 'location', ]
     template_name_suffix = '_update_form'
 
     def get_success_url(self):
@@ -35,6 +35,8 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
+    'django.contrib.gis',
     'debug_toolbar',
 
     'django_object_actions',
@@ -56,7 +58,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'debug_toolbar.middleware.DebugToolbarMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'apps.core.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -175,6 +177,9 @@ STATICFILES_DIRS = [
 ]
 
 AUTH_USER_MODEL = 'users.User'
+AUTHENTICATION_BACKENDS = ['apps.users.backends.CachedModelBackend']
+SESSION_ENGINE = 'apps.core.sessions'
+SESSION_CACHE_ALIAS = 'sessions'
 
 LOGOUT_REDIRECT_URL = '/'
 LOGIN_REDIRECT_URL = '/'
@@ -193,3 +198,69 @@ CELERY_ACCEPT_CONTENT = ['application/json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 # CELERY_TIMEZONE = 'Russia/Ekaterinburg'
+
+# Redis for buffered orders views, `None` keeps views in process memory
+ORDER_VIEWS_BUFFER_URL = 'redis://localhost:6379/1'
+
+# Redis for cached pages, `None` keeps them in process memory
+CACHE_URL = 'redis://localhost:6379/2'
+# Redis for sessions, `None` keeps them in process memory
+SESSION_CACHE_URL = 'redis://localhost:6379/3'
+CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': CACHE_URL,
+        # pages are rendered from the database if redis is not available
+        'OPTIONS': {'IGNORE_EXCEPTIONS': True},
+    } if CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'sessions': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': SESSION_CACHE_URL,
+    } if SESSION_CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sessions',
+    },
+}
+# Seconds cached list pages are kept, they are invalidated by generations
+PAGE_CACHE_TIMEOUT = 60 * 10
+# Count of cached objects kept in memory of every process
+LOCAL_CACHE_SIZE = 1000
+
+# Daily top orders digest for artists
+TOP_ORDERS_DIGEST_COUNT = 10
+TOP_ORDERS_DIGEST_CHUNK_SIZE = 500
+TOP_ORDERS_DIGEST_DRY_RUN_PATH = os.path.join(BASE_DIR, 'sent_emails')
+# Seconds top orders snapshot is kept for digest chunks sent by tasks
+TOP_ORDERS_DIGEST_CACHE_TIMEOUT = 60 * 60 * 6
+
+# Count of customers notified about new offers at once
+OFFER_NOTIFICATIONS_BATCH_SIZE = 100
+
+# Count of outbox messages locked and dispatched at once
+OUTBOX_BATCH_SIZE = 100
+# Failed outbox messages are retried until this count of attempts
+OUTBOX_MAX_ATTEMPTS = 5
+# Seconds outbox message is leased to a relay, it is dispatched again after
+OUTBOX_LEASE_SECONDS = 60 * 5
+
+# Count of open orders kept as recommendations for every artist
+ORDER_RECOMMENDATIONS_COUNT = 50
+# Similarity of orders and artists tags: 'cosine' or 'jaccard'
+ORDER_MATCHING_METRIC = 'cosine'
+
+# Thumbnails of uploaded images: size name and its longest side in pixels
+FILE_THUMBNAIL_SIZES = {'small': 160, 'medium': 480, 'large': 1200}
+FILE_THUMBNAIL_FORMATS = ('webp', 'jpeg')
+FILE_THUMBNAIL_QUALITY = 80
+# Count of processes rendering thumbnails, `None` is count of CPUs
+FILE_THUMBNAIL_PROCESSES = None
+
+# Front proxy sending protected media: `None` sends files by Django,
+# 'nginx' uses X-Accel-Redirect and 'apache' uses X-Sendfile
+MEDIA_SENDFILE_BACKEND = None
+# Internal nginx location with alias to MEDIA_ROOT
+MEDIA_ACCEL_REDIRECT_URL = '/protected-media/'
+# Seconds media is cached by browsers
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24
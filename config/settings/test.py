@@ -0,0 +1,10 @@
+from .local import *
+
+# caches and sessions are kept in memory of the test process
+CACHES = {
+    alias: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': alias,
+    }
+    for alias in ('default', 'sessions')
+}
@@ -26,13 +26,14 @@ urlpatterns = [
     path('users/', include(('apps.users.urls', 'users'))),
     path('masterpieces/', include(('apps.masterpieces.urls', 'masterpieces'))),
     path('offers/', include(('apps.offers.urls', 'offers'))),
+    # uploaded files are served only to users who can see them
+    path(
+        settings.MEDIA_URL.lstrip('/'), include(('apps.files.urls', 'files'))
+    ),
 ]
 
-# for serving uploaded files on dev environment with django
+# for serving static files on dev environment with django
 if settings.DEBUG:
-    urlpatterns += static(
-        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
-    )
     urlpatterns += static(
         settings.STATIC_URL, document_root=settings.STATIC_ROOT
     )
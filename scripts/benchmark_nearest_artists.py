@@ -0,0 +1,105 @@
+import random
+import statistics
+import time
+
+from django.db import connection
+
+from apps.core.geo import is_postgis, make_point
+from apps.users.models import User
+
+ARTISTS_COUNT = 1_000_000
+QUERIES_COUNT = 100
+NEAREST_COUNT = 10
+RADIUS_KM = 25
+MIN_RATING = 3
+EMAIL_DOMAIN = 'nearest-benchmark.test'
+
+INSERT_ARTISTS_SQL = """
+    INSERT INTO users (
+        password, is_superuser, first_name, last_name, email, is_active,
+        is_staff, date_joined, role, location
+    )
+    SELECT '!', FALSE, 'Artist', n::text, 'artist' || n || '@' || %(domain)s,
+           TRUE, FALSE, NOW(), 'ARTIST',
+           ST_SetSRID(ST_MakePoint(
+               random() * 360 - 180, degrees(asin(random() * 2 - 1))
+           ), 4326)::geography
+    FROM generate_series(1, %(count)s) AS n
+"""
+INSERT_STATS_SQL = """
+    INSERT INTO artist_stats (
+        artist_id, rating_sum, rating_count, rating, completed_orders,
+        active_orders, accepted_offers, fee_sum
+    )
+    SELECT id, 0, 0, round((random() * 5)::numeric, 2), 0, 0, 0, 0
+    FROM users WHERE email LIKE %(pattern)s
+    ON CONFLICT DO NOTHING
+"""
+DELETE_ARTISTS_SQL = """
+    DELETE FROM artist_stats USING users
+    WHERE artist_stats.artist_id = users.id AND users.email LIKE %(pattern)s;
+    DELETE FROM users WHERE email LIKE %(pattern)s;
+"""
+
+
+def run(*args):
+    """Measure latency of nearest artists search on synthetic artists.
+
+    Usage: ``manage.py runscript benchmark_nearest_artists
+    --script-args [count] [keep]``. Artists are spread uniformly over the
+    globe and deleted after measuring unless ``keep`` is passed.
+    """
+    if not is_postgis():
+        print('Benchmark requires PostGIS database.')
+        return
+    count = int(args[0]) if args and args[0].isdigit() else ARTISTS_COUNT
+    pattern = f'%@{EMAIL_DOMAIN}'
+
+    if not User.objects.filter(email__endswith=EMAIL_DOMAIN).exists():
+        add_artists(count, pattern)
+    try:
+        points = [
+            make_point(random.uniform(-60, 70), random.uniform(-180, 180))
+            for _ in range(QUERIES_COUNT)
+        ]
+        artists = User.objects.all().get_artists()
+        benchmark('nearest', points, lambda point: artists.nearest(point))
+        benchmark('within radius', points, lambda point: artists.within(
+            point, RADIUS_KM
+        ).nearest(point))
+        benchmark('within radius by rating', points, lambda point: (
+            artists.with_rating(MIN_RATING).within(point, RADIUS_KM)
+            .nearest(point)
+        ))
+        print(artists.nearest(points[0])[:NEAREST_COUNT].explain())
+    finally:
+        if 'keep' not in args:
+            with connection.cursor() as cursor:
+                cursor.execute(DELETE_ARTISTS_SQL, {'pattern': pattern})
+
+
+def add_artists(count: int, pattern: str):
+    """Insert synthetic artists with stats and analyze the table."""
+    started_at = time.monotonic()
+    with connection.cursor() as cursor:
+        cursor.execute(INSERT_ARTISTS_SQL, {
+            'domain': EMAIL_DOMAIN, 'count': count,
+        })
+        cursor.execute(INSERT_STATS_SQL, {'pattern': pattern})
+        cursor.execute('ANALYZE users')
+        cursor.execute('ANALYZE artist_stats')
+    print(f'{count} artists added in {time.monotonic() - started_at:.1f}s')
+
+
+def benchmark(name: str, points, get_queryset):
+    """Print median and 95th percentile latency of the first page."""
+    timings = []
+    for point in points:
+        started_at = time.perf_counter()
+        list(get_queryset(point)[:NEAREST_COUNT])
+        timings.append((time.perf_counter() - started_at) * 1000)
+    timings.sort()
+    print(
+        f'{name}: median {statistics.median(timings):.2f}ms, '
+        f'p95 {timings[int(len(timings) * 0.95) - 1]:.2f}ms'
+    )
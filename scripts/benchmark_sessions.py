@@ -0,0 +1,57 @@
+import statistics
+import time
+
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.users.factories import CustomerFactory
+
+REQUESTS_COUNT = 200
+ENGINES = (
+    ('database', 'django.contrib.sessions.backends.db'),
+    ('redis', 'apps.core.sessions'),
+)
+
+
+def run(*args):
+    """Compare latency of requests with sessions in the database and redis.
+
+    Usage: ``manage.py runscript benchmark_sessions --script-args [count]``.
+    A temporary customer requests the home page with every session engine,
+    mean and 95th percentile latency and queries per request are printed.
+    """
+    count = int(args[0]) if args else REQUESTS_COUNT
+    customer = CustomerFactory()
+    try:
+        for name, engine in ENGINES:
+            # debug toolbar would take most of the time
+            with override_settings(
+                SESSION_ENGINE=engine,
+                DEBUG=False,
+                ALLOWED_HOSTS=['testserver'],
+            ):
+                benchmark(name, customer, count)
+    finally:
+        customer.delete()
+
+
+def benchmark(name: str, user, count: int):
+    """Print latency of requests of logged in user."""
+    client = Client()
+    client.force_login(user)
+    client.get('/')
+
+    timings = []
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(count):
+            started_at = time.perf_counter()
+            client.get('/')
+            timings.append((time.perf_counter() - started_at) * 1000)
+    client.logout()
+
+    print(
+        f'{name}: mean {statistics.mean(timings):.2f} ms, '
+        f'p95 {statistics.quantiles(timings, n=20)[-1]:.2f} ms, '
+        f'{len(queries) / count:.1f} queries per request'
+    )
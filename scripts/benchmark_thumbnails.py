@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from PIL import Image
+
+from apps.files.thumbnails import render_thumbnails
+
+IMAGES_COUNT = 50
+IMAGE_SIZE = (3000, 2000)
+
+
+def run(*args):
+    """Measure speed of thumbnails rendering in images per second.
+
+    Usage: ``manage.py runscript benchmark_thumbnails
+    --script-args [count]``. Synthetic JPEG images are rendered by one
+    process and by the pool of all CPUs.
+    """
+    count = int(args[0]) if args and args[0].isdigit() else IMAGES_COUNT
+    directory = tempfile.mkdtemp()
+    try:
+        paths = add_images(directory, count)
+        for processes in sorted({1, os.cpu_count()}):
+            benchmark(paths, processes)
+    finally:
+        shutil.rmtree(directory)
+
+
+def add_images(directory: str, count: int) -> list:
+    """Save synthetic photo-like images and return their paths."""
+    noise = Image.effect_noise(IMAGE_SIZE, 40)
+    gradient = Image.linear_gradient('L').resize(IMAGE_SIZE)
+    paths = []
+    for number in range(count):
+        image = Image.merge('RGB', (
+            gradient, noise, gradient.rotate(number * 7 % 360)
+        ))
+        path = os.path.join(directory, f'{number}.jpg')
+        image.save(path, 'JPEG', quality=90)
+        paths.append(path)
+    return paths
+
+
+def benchmark(paths, processes: int):
+    """Print count of images rendered per second."""
+    render = partial(
+        render_thumbnails,
+        sizes=settings.FILE_THUMBNAIL_SIZES,
+        formats=settings.FILE_THUMBNAIL_FORMATS,
+        quality=settings.FILE_THUMBNAIL_QUALITY,
+    )
+    started_at = time.perf_counter()
+    with ProcessPoolExecutor(processes) as pool:
+        list(pool.map(render, paths))
+    elapsed = time.perf_counter() - started_at
+    print(
+        f'{processes} process(es): {len(paths) / elapsed:.1f} images/s, '
+        f'{elapsed:.1f}s for {len(paths)} images'
+    )
@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import time
+
+from apps.files.archives import ArchiveEntry, iter_zip
+
+ARCHIVE_GB = 4
+FILES_COUNT = 8
+MB = 1024 * 1024
+
+
+def run(*args):
+    """Measure memory and speed of streaming ZIP archive.
+
+    Usage: ``manage.py runscript benchmark_zip_stream --script-args [gb]``.
+    Sparse files take no disk space, half of them are stored as images,
+    another half are deflated. The largest RSS while streaming is printed.
+    """
+    size_gb = float(args[0]) if args else ARCHIVE_GB
+    directory = tempfile.mkdtemp()
+    try:
+        entries = add_files(directory, int(size_gb * 1024 * MB))
+        benchmark(entries)
+    finally:
+        shutil.rmtree(directory)
+
+
+def add_files(directory: str, total_size: int) -> list:
+    """Create sparse files of total size and return their entries."""
+    entries = []
+    for number in range(FILES_COUNT):
+        extension = 'jpg' if number % 2 else 'psd'
+        path = os.path.join(directory, f'{number}.{extension}')
+        with open(path, 'wb') as file:
+            file.truncate(total_size // FILES_COUNT)
+        entries.append(ArchiveEntry(os.path.basename(path), path))
+    return entries
+
+
+def benchmark(entries):
+    """Print RSS after every streamed file and total throughput."""
+    started_at = time.perf_counter()
+    print(f'RSS before: {get_rss_mb():.1f} MB')
+    streamed = 0
+    max_rss = 0
+    for chunk in iter_zip(entries):
+        streamed += len(chunk)
+        max_rss = max(max_rss, get_rss_mb())
+    elapsed = time.perf_counter() - started_at
+    print(
+        f'{streamed / MB:.0f} MB streamed in {elapsed:.1f}s '
+        f'({streamed / MB / elapsed:.0f} MB/s), max RSS {max_rss:.1f} MB'
+    )
+
+
+def get_rss_mb() -> float:
+    """Return resident memory of the process in megabytes."""
+    with open('/proc/self/statm') as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf('SC_PAGE_SIZE') / MB